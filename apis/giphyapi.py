@@ -1,19 +1,68 @@
+import asyncio
+import collections
+from typing import Deque, Dict, Iterable, Optional
+
 import aiohttp
 
 
 class GiphyAPI(object):
     """
     API Class for interacting with Giphy API
+
+    The class holds one long-lived session, so requests reuse pooled connections rather than opening a new one each
+    time. For tags we know we'll want (see `prefetch`) a few GIF URLs are kept in a buffer that's refilled in the
+    background, so `random_gif` can usually return without making a request at all.
     """
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        api_path: str = "https://api.giphy.com/v1/",
+        prefetch_size: int = 3,
+        timeout: float = 10,
+        logger=None
+    ):
         """
         Constructor this class. Needs a GIPHY API Token
         :param token:
+        :param api_path: the base URL of the API
+        :param prefetch_size: the number of GIFs to keep buffered for each prefetched tag
+        :param timeout: the total timeout for each request, in seconds
+        :param logger: logger for any failed background requests
         """
         self.token = token
-        self.api_path = "https://api.giphy.com/v1/"
+        self.api_path = api_path
+        self.prefetch_size = prefetch_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.logger = logger
 
-    async def random_gif(self, tag: str = None) -> str:
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._buffers: Dict[Optional[str], Deque[str]] = collections.defaultdict(collections.deque)
+        self._refills: Dict[Optional[str], asyncio.Task] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared session - created the first time it's needed as it has to be created within the event loop
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+                timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Stops any background refills and closes the session
+        """
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch_gif(self, tag: Optional[str]) -> str:
         url = self.api_path + "gifs/random"
 
         params = {"api_key": self.token}
@@ -21,7 +70,42 @@ class GiphyAPI(object):
         if tag:
             params["tag"] = tag
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                ret = await response.json()
+        async with self.session.get(url, params=params) as response:
+            ret = await response.json()
         return ret["data"]["images"]["original_still"]["url"]
+
+    async def _refill(self, tag: Optional[str]) -> None:
+        buffer = self._buffers[tag]
+        try:
+            while len(buffer) < self.prefetch_size:
+                buffer.append(await self._fetch_gif(tag))
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, TypeError) as e:
+            # we'll just make the request when the GIF is asked for instead
+            if self.logger is not None:
+                self.logger.warning(f"Couldn't prefetch GIFs for {tag}: {e!r}")
+        finally:
+            self._refills.pop(tag, None)
+
+    def _start_refill(self, tag: Optional[str]) -> None:
+        if tag not in self._refills and len(self._buffers[tag]) < self.prefetch_size:
+            self._refills[tag] = asyncio.create_task(self._refill(tag))
+
+    def prefetch(self, tags: Iterable[Optional[str]]) -> None:
+        """
+        Starts filling the buffers for the given tags in the background. Needs to be called from within the event loop.
+        :param tags: the tags we'll want GIFs for
+        :return: None
+        """
+        for tag in tags:
+            self._start_refill(tag)
+
+    async def random_gif(self, tag: str = None) -> str:
+        """
+        Gets a random GIF for the tag - from the buffer if there's one in there
+        :param tag: the tag
+        :return: the URL of the GIF
+        """
+        buffer = self._buffers[tag]
+        gif = buffer.popleft() if buffer else await self._fetch_gif(tag)
+        self._start_refill(tag)
+        return gif
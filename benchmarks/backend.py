@@ -0,0 +1,70 @@
+"""
+Database backends for the benchmarks.
+
+The benchmarks never touch the production database. Every collection class the code under test creates is
+"rebound" to the same-named collection in a throwaway benchmark database, either on a local mongod or in memory.
+
+The in-memory backend needs `mongomock` which is not one of the bot's requirements:
+    pip install mongomock
+"""
+
+from pymongo.database import Database
+
+from mongo import interface
+from mongo.baseclass import BaseClass
+
+
+BENCHMARK_DATABASE = "bsebotbenchmark"
+
+BACKENDS = ("mongod", "memory")
+
+
+def get_database(backend: str, ip: str = "127.0.0.1", name: str = BENCHMARK_DATABASE) -> Database:
+    """
+    Gets an empty benchmark database for the given backend
+
+    :param backend: either "mongod" for a local mongod or "memory" for an in-memory mongomock database
+    :param ip: IP of the mongod instance, only used for the "mongod" backend
+    :param name: the name of the database
+    :return: the Database object
+    """
+    if backend == "mongod":
+        client = interface.get_client(ip)
+    elif backend == "memory":
+        try:
+            import mongomock
+        except ImportError:
+            raise RuntimeError("The 'memory' backend needs mongomock - install it with `pip install mongomock`")
+        client = mongomock.MongoClient()
+    else:
+        raise ValueError(f"Unknown backend '{backend}' - must be one of {BACKENDS}")
+
+    if name in interface.get_database_names(client):
+        client.drop_database(name)
+    return interface.get_database(client, name)
+
+
+def rebind(obj, database: Database, _seen: set = None):
+    """
+    Points every collection class reachable from obj at the same-named collection in the given database
+
+    Walks the attributes of obj (and the attributes of any of our own objects it holds) so that nested
+    collection classes, like the UserPoints inside UserBets, are rebound too.
+
+    :param obj: the object to rebind
+    :param database: the benchmark database
+    :return: obj
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return obj
+    _seen.add(id(obj))
+
+    if isinstance(obj, BaseClass) and obj.vault is not None:
+        obj._vault = interface.get_collection(database, obj.vault.name)
+
+    for attr in vars(obj).values():
+        if hasattr(attr, "__dict__") and type(attr).__module__.split(".")[0] in ("discordbot", "mongo"):
+            rebind(attr, database, _seen)
+    return obj
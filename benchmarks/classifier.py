@@ -0,0 +1,117 @@
+"""
+Microbenchmark for the message classifier over a corpus of stored messages.
+
+Classifies every message in the corpus with discordbot.messageclassifier and with the ad-hoc checks OnMessage used
+to do inline (regexes compiled on the fly, one `re.match` per thank-you term), checks that they agree and reports
+the throughput of each.
+
+The corpus is either the messages stored in the bot's userinteractions collection (read only) or the messages from
+a SyntheticGuild.
+
+Usage:
+    python -m benchmarks.classifier [--source synthetic|mongod] [--limit 100000] [--repeat 5]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import SyntheticGuild, SyntheticScale
+from discordbot.messageclassifier import classify_message, is_bot_thanks, is_thank_you
+from discordbot.wordle.parser import WORDLE_RESULT_REGEX
+from mongo.bsepoints import UserInteractions
+
+
+_THANK_YOU_TERMS = ["thank you", "thanks", "ty", "cutie", "i love you"]
+_BOT_THANKS = ["thank you bot", "thank you bsebot", "thanks bot", "thanks bsebot", "ty bot", "ty bsebot"]
+
+
+def _legacy_classify(content: str) -> tuple:
+    """The checks OnMessage used to do inline, for comparison"""
+    message_type = []
+    if "https://" in content or "http://" in content:
+        if ".gif" in content:
+            message_type.append("gif")
+        message_type.append("link")
+    message_type.append("message")
+    if re.match(WORDLE_RESULT_REGEX, content):
+        message_type.append("wordle")
+
+    emoji_ids = []
+    if emojis := re.findall(r"<:[a-zA-Z_0-9]*:\d*>", content):
+        for emoji in emojis:
+            emoji_ids.append(int(emoji.strip("<").strip(">").split(":")[-1]))
+
+    thanks = any([re.match(rf"\b{a}\b", content.lower()) for a in _THANK_YOU_TERMS])
+    bot_thanks = any([re.match(rf"\b{a}\b", content.lower()) for a in _BOT_THANKS])
+    return message_type, emoji_ids, thanks, bot_thanks
+
+
+def _classify(content: str) -> tuple:
+    classification = classify_message(content, 0)
+    return classification.message_type, classification.emoji_ids, is_thank_you(content), is_bot_thanks(content)
+
+
+def load_corpus(source: str, limit: int) -> List[str]:
+    """
+    Loads the message contents to classify
+    :param source: "mongod" for the stored messages or "synthetic" for generated ones
+    :param limit: max number of messages
+    :return: list of message contents
+    """
+    if source == "mongod":
+        messages = UserInteractions().query(
+            {"message_type": "message", "content": {"$type": "string"}},
+            limit=limit,
+            projection={"_id": False, "content": True},
+            as_gen=True
+        )
+        return [message["content"] for message in messages]
+
+    guild = SyntheticGuild(SyntheticScale(days=max(1, limit // SyntheticScale().messages_per_day + 1)))
+    corpus = [message["content"] for message in guild.messages if isinstance(message.get("content"), str)]
+    # make sure the less common paths get exercised too
+    corpus += ["thank you bot", "ty bsebot!", "thanks mate", "Wordle 1,000 3/6\n\n", "https://a.gif", "tyre"] * 100
+    return corpus[:limit]
+
+
+def _time(func: Callable, corpus: List[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in corpus:
+            func(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["synthetic", "mongod"], default="synthetic", help="where to get messages")
+    parser.add_argument("--limit", type=int, default=100000, help="max number of messages to classify")
+    parser.add_argument("--repeat", type=int, default=5, help="number of times to classify the corpus")
+    parsed = parser.parse_args()
+
+    corpus = load_corpus(parsed.source, parsed.limit)
+    if not corpus:
+        print("No messages to classify")
+        return 1
+
+    mismatches = [content for content in corpus if _legacy_classify(content) != _classify(content)]
+    if mismatches:
+        print(f"{len(mismatches)} messages were classified differently, e.g. {mismatches[0]!r}")
+        return 1
+
+    legacy = _time(_legacy_classify, corpus, parsed.repeat)
+    classifier = _time(_classify, corpus, parsed.repeat)
+    print(f"Classified {len(corpus)} messages")
+    print(f"  inline checks: {legacy:.3f}s ({len(corpus) / legacy:,.0f} messages/s)")
+    print(f"  classifier:    {classifier:.3f}s ({len(corpus) / classifier:,.0f} messages/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
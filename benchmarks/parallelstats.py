@@ -0,0 +1,102 @@
+"""
+Benchmarks the serial StatsJob against the ParallelStatsJob on a synthetic year of data.
+
+Also verifies that both paths produce identical Stat objects (ignoring the `timestamp` they were created at).
+Exits with a non-zero code if they don't.
+
+Usage:
+    python -m benchmarks.parallelstats [--days 365] [--workers 4] [--scale 1]
+"""
+
+import argparse
+import datetime
+import logging
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import SyntheticCacheFactory, SyntheticScale, get_guild
+from discordbot.stats.awardsbuilder import AwardsBuilder
+from discordbot.stats.parallelstats import ParallelStatsJob
+from discordbot.stats.statsclasses import StatsGatherer
+from discordbot.stats.statsdataclasses import Stat
+from discordbot.stats.statsjob import StatsJob
+
+
+def _comparable(result: Any) -> Any:
+    """Strips out the fields that are expected to differ between runs"""
+    if isinstance(result, tuple):
+        return tuple(_comparable(r) for r in result)
+    if isinstance(result, Stat):
+        return {k: v for k, v in vars(result).items() if k != "timestamp"}
+    return result
+
+
+def find_differences(serial: Dict[str, Any], parallel: Dict[str, Any]) -> List[str]:
+    """
+    Compares the results of the serial and the parallel jobs
+    :param serial: results of the serial job
+    :param parallel: results of the parallel job
+    :return: list of the method names whose results differ
+    """
+    differences = []
+    if list(serial) != list(parallel):
+        differences.append("<ordering>")
+    for method_name in serial:
+        if _comparable(serial[method_name]) != _comparable(parallel.get(method_name)):
+            differences.append(method_name)
+    return differences
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365, help="number of days of data to generate")
+    parser.add_argument("--scale", type=int, default=1, help="multiplier on the production volume")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed")
+    parsed = parser.parse_args()
+
+    logger = logging.getLogger("bsebot.benchmarks")
+    logging.basicConfig(level=logging.WARNING)
+
+    scale = SyntheticScale(days=parsed.days, seed=parsed.seed).scaled(parsed.scale)
+    factory = SyntheticCacheFactory(scale)
+
+    gen_start = time.perf_counter()
+    guild = get_guild(scale)
+    print(
+        f"Generated {len(guild.messages)} messages, {len(guild.vc_interactions)} VC sessions, "
+        f"{len(guild.bets)} bets for {len(guild.users)} users in {time.perf_counter() - gen_start:.2f}s"
+    )
+
+    args = (guild.guild_id, guild.start, guild.end)
+    steps = AwardsBuilder._stats_steps(args, guild.channel_ids) + AwardsBuilder._awards_steps(args)
+
+    gatherer = StatsGatherer(logger, True)
+    gatherer.cache = factory(True)
+
+    serial_start = time.perf_counter()
+    serial = StatsJob("serial", gatherer, steps, logger).compute()
+    serial_time = time.perf_counter() - serial_start
+    print(f"Serial:   {len(serial)} stats in {serial_time:.2f}s")
+
+    parallel_start = time.perf_counter()
+    parallel = ParallelStatsJob(
+        "parallel", gatherer, steps, logger, max_workers=parsed.workers, cache_factory=factory
+    ).compute()
+    parallel_time = time.perf_counter() - parallel_start
+    print(
+        f"Parallel: {len(parallel)} stats in {parallel_time:.2f}s "
+        f"(including data generation in each worker) - {serial_time / parallel_time:.2f}x"
+    )
+
+    if differences := find_differences(serial, parallel):
+        print(f"MISMATCH between serial and parallel results: {differences}")
+        return 1
+
+    print(f"Serial and parallel results are identical ({datetime.datetime.now():%H:%M:%S})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
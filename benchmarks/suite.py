@@ -0,0 +1,180 @@
+"""
+Times the heavy database paths of the bot against synthetic data at multiples of our production volume.
+
+For each scale factor a SyntheticGuild is generated (ending yesterday, so the daily eddies have data to work with),
+loaded into an empty benchmark database and the following are timed:
+    stats        - all the AwardsBuilder stats and awards over the generated range
+    eddies       - BSEddiesManager.give_out_eddies (not "real", so no points are changed)
+    board cold   - EmbedManager.get_leaderboard_embed for the whole guild, loading the boards from the DB
+    board update - the same after one user's points have changed, so only they're read back
+    board cached - the same with nothing changed, so the rendered text is reused
+    bet close    - BetManager.close_a_bet on an open bet with half the guild betting on it
+
+Usage:
+    python -m benchmarks.suite [--backend mongod|memory] [--factors 1 10 100] [--days 30] [--repeat 3]
+
+The "memory" backend needs mongomock (see benchmarks/backend.py). 100x with the memory backend is very slow.
+"""
+
+import argparse
+import datetime
+import logging
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from benchmarks.backend import BACKENDS, get_database, rebind
+from benchmarks.synthetic import SyntheticGuild, SyntheticScale
+from discordbot.betmanager import BetManager
+from discordbot.constants import BSE_BOT_ID
+from discordbot.embedmanager import EmbedManager
+from discordbot.stats.awardsbuilder import AwardsBuilder
+from discordbot.stats.statsclasses import StatsGatherer
+from discordbot.stats.statsjob import StatsJob
+from discordbot.tasks.eddiegains import BSEddiesManager
+from mongo import interface
+
+
+class _Guild:
+    """The bits of discord.Guild that get_leaderboard_embed uses"""
+    def __init__(self, guild: SyntheticGuild):
+        self.id = guild.guild_id
+        self._members = {uid: SimpleNamespace(id=uid, name=f"user{uid}") for uid in guild.user_ids}
+
+    def get_member(self, uid: int) -> SimpleNamespace:
+        return self._members.get(uid)
+
+
+def _time(func: Callable, repeat: int, setup: Callable = None) -> float:
+    """
+    Times func, returning the median of `repeat` runs
+    :param func: the function to time
+    :param repeat: number of times to run it
+    :param setup: optional function to call (untimed) before each run
+    :return: median time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_scale(
+    factor: int,
+    days: int,
+    backend: str,
+    repeat: int,
+    logger: logging.Logger,
+    seed: int = 1
+) -> Dict[str, float]:
+    """
+    Generates and loads the data for one scale factor and times everything against it
+    :param factor: the multiplier on our production volume
+    :param days: number of days of data to generate
+    :param backend: the database backend
+    :param repeat: number of times to run each benchmark
+    :param logger: logger
+    :param seed: RNG seed
+    :return: dict of benchmark name to median time in seconds
+    """
+    today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    scale = SyntheticScale(days=days, seed=seed).scaled(factor)
+    guild = SyntheticGuild(scale, start=today - datetime.timedelta(days=days))
+
+    database = get_database(backend)
+    load_start = time.perf_counter()
+    counts = guild.load_into(database)
+    print(
+        f"{factor}x: loaded {sum(counts.values())} documents ({counts['userinteractions']} interactions, "
+        f"{counts['userpoints']} users) in {time.perf_counter() - load_start:.2f}s"
+    )
+
+    timings = {}
+
+    gatherer = rebind(StatsGatherer(logger, False), database)
+    args = (guild.guild_id, guild.start, guild.end)
+    steps = AwardsBuilder._stats_steps(args, guild.channel_ids) + AwardsBuilder._awards_steps(args)
+
+    def _stats():
+        # a fresh cache each time so we're timing the queries and not the cache
+        gatherer.cache = rebind(type(gatherer.cache)(False), database)
+        StatsJob("benchmark", gatherer, steps, logger).compute()
+
+    timings["stats"] = _time(_stats, repeat)
+
+    eddies_manager = rebind(BSEddiesManager(SimpleNamespace(user=SimpleNamespace(id=BSE_BOT_ID)), logger), database)
+    timings["eddies"] = _time(lambda: eddies_manager.give_out_eddies(guild.guild_id, real=False), repeat)
+
+    rng = random.Random(seed)
+    embed_manager = rebind(EmbedManager(logger), database)
+    leaderboard_guild = _Guild(guild)
+    leaderboard = embed_manager.leaderboards.get(guild.guild_id)
+
+    def _leaderboard():
+        embed_manager.get_leaderboard_embed(leaderboard_guild, None, "benchmark")
+
+    timings["board cold"] = _time(_leaderboard, repeat, setup=lambda: leaderboard.mark_changed(None))
+    timings["board update"] = _time(
+        _leaderboard, repeat, setup=lambda: leaderboard.mark_changed(rng.choice(guild.user_ids))
+    )
+    _leaderboard()
+    timings["board cached"] = _time(_leaderboard, repeat)
+
+    bet_manager = rebind(BetManager(logger), database)
+    bets = interface.get_collection(database, "userbets")
+    bet_ids: List[str] = []
+
+    def _open_bet():
+        bet = dict(guild.bets[0], bet_id=f"bench{len(bet_ids)}", active=True, result=None, closed=None)
+        bet["betters"] = {
+            str(uid): {
+                "user_id": uid,
+                "emoji": rng.choice(bet["options"]),
+                "first_bet": today,
+                "last_bet": today,
+                "points": rng.randint(1, 50)
+            }
+            for uid in guild.user_ids[:max(1, len(guild.user_ids) // 2)]
+        }
+        interface.insert(bets, bet)
+        bet_ids.append(bet["bet_id"])
+
+    timings["bet close"] = _time(
+        lambda: bet_manager.close_a_bet(bet_ids[-1], guild.guild_id, "1️⃣"), repeat, setup=_open_bet
+    )
+
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=BACKENDS, default="mongod", help="database backend to use")
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10, 100], help="multipliers on our volume")
+    parser.add_argument("--days", type=int, default=30, help="number of days of data to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="number of times to run each benchmark")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed")
+    parsed = parser.parse_args()
+
+    logger = logging.getLogger("bsebot.benchmarks")
+    logging.basicConfig(level=logging.WARNING)
+
+    results: Dict[int, Dict[str, float]] = {}
+    for factor in parsed.factors:
+        results[factor] = run_scale(factor, parsed.days, parsed.backend, parsed.repeat, logger, parsed.seed)
+
+    names = list(results[parsed.factors[0]])
+    print(f"\n{'':<12}" + "".join(f"{f'{factor}x':>12}" for factor in parsed.factors))
+    for name in names:
+        print(f"{name:<12}" + "".join(f"{results[factor][name]:>11.3f}s" for factor in parsed.factors))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
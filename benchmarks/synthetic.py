@@ -0,0 +1,509 @@
+"""
+Reproducible synthetic guild data for benchmarking.
+
+SyntheticGuild generates documents in the same shape as the documents in our collections
+(userpoints, userinteractions, userbets, serveremojis, spoilerthreads, kingtenures and wordleresults)
+using a seeded RNG.
+The same scale and seed always produce the same documents.
+They can either be served from memory (SyntheticStatsDataCache) or loaded into a database (SyntheticGuild.load_into).
+"""
+
+import datetime
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, List
+
+from pymongo.database import Database
+
+from discordbot.bot_enums import ActivityTypes, TransactionTypes
+from discordbot.constants import JERK_OFF_CHAT
+from discordbot.stats.statsdatacache import StatsDataCache
+from discordbot.wordle.parser import parse_wordle_message
+from mongo import interface
+from mongo.datatypes import (
+    Activity, Bet, Emoji, KingTenure, Message, Thread, Transaction, User, VCInteraction, WordleResult
+)
+
+
+GUILD_ID = 1000000000000000001
+
+_WORDS = (
+    "the a to and of bet eddies king wordle game tonight anyone up for it lol what why when maybe "
+    "yeah nah mate that was class absolutely no chance fuck shit twat bollocks cheers see you later"
+).split(" ")
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """The knobs for how much data to generate. The defaults are roughly our production volume."""
+    users: int = 20
+    messages_per_day: int = 400
+    reactions_per_message: float = 0.25
+    replies_per_message: float = 0.1
+    vc_sessions_per_day: int = 8
+    bets_per_day: float = 1.5
+    days: int = 365
+    seed: int = 1
+
+    def scaled(self, factor: int) -> "SyntheticScale":
+        """
+        Returns a copy of this scale with the per-day volumes (and the user count) multiplied by factor
+        :param factor: the multiplier
+        :return: the new scale
+        """
+        return replace(
+            self,
+            users=self.users * factor,
+            messages_per_day=self.messages_per_day * factor,
+            vc_sessions_per_day=self.vc_sessions_per_day * factor,
+            bets_per_day=self.bets_per_day * factor,
+        )
+
+
+class SyntheticGuild:
+    """
+    Generates a guild's worth of documents for the given scale
+    """
+    def __init__(
+        self,
+        scale: SyntheticScale = SyntheticScale(),
+        start: datetime.datetime = datetime.datetime(2022, 1, 1),
+        guild_id: int = GUILD_ID
+    ):
+        self.scale = scale
+        self.start = start
+        self.end = start + datetime.timedelta(days=scale.days)
+        self.guild_id = guild_id
+
+        self._rng = random.Random(scale.seed)
+        self._next_id = guild_id
+
+        self.user_ids = [self._id() for _ in range(scale.users)]
+        self.channel_ids = [JERK_OFF_CHAT] + [self._id() for _ in range(7)]
+        self.thread_ids = [self._id() for _ in range(max(3, scale.days // 30))]
+        self.vc_ids = [self._id() for _ in range(3)]
+
+        self.emojis: List[Emoji] = []
+        self.threads: List[Thread] = []
+        self.messages: List[Message] = []
+        self.vc_interactions: List[VCInteraction] = []
+        self.bets: List[Bet] = []
+        self.users: List[User] = []
+
+        self._generate()
+
+    def _id(self) -> int:
+        self._next_id += self._rng.randint(1, 1000)
+        return self._next_id
+
+    def _time(self, day: int) -> datetime.datetime:
+        return self.start + datetime.timedelta(days=day, seconds=self._rng.randint(1, 86399))
+
+    def _generate(self) -> None:
+        rng = self._rng
+
+        for idx in range(max(5, self.scale.days // 20)):
+            self.emojis.append({
+                "eid": self._id(),
+                "guild_id": self.guild_id,
+                "name": f"emoji{idx}",
+                "created_by": rng.choice(self.user_ids),
+                "created": self._time(rng.randrange(self.scale.days)),
+            })
+
+        for thread_id in self.thread_ids:
+            self.threads.append({
+                "thread_id": thread_id,
+                "guild_id": self.guild_id,
+                "name": f"thread-{thread_id}",
+                "created": self._time(rng.randrange(self.scale.days)),
+                "owner": rng.choice(self.user_ids),
+                "active": True,
+            })
+
+        transactions: Dict[int, List[Transaction]] = {uid: [] for uid in self.user_ids}
+        activities: Dict[int, List[Activity]] = {uid: [] for uid in self.user_ids}
+        emoji_names = [e["name"] for e in self.emojis]
+        king = None
+
+        for day in range(self.scale.days):
+            for _ in range(self.scale.messages_per_day):
+                self.messages.append(self._message(day, emoji_names))
+
+            # everyone has a go at the wordle
+            for uid in self.user_ids:
+                if rng.random() < 0.6:
+                    guesses = rng.choice("23456X")
+                    message = self._message(day, emoji_names, uid)
+                    message["message_type"] = ["wordle"]
+                    message["content"] = f"Wordle {300 + day} {guesses}/6\n\n⬛🟨⬛⬛⬛"
+                    self.messages.append(message)
+
+                transactions[uid].append({
+                    "type": TransactionTypes.DAILY_SALARY,
+                    "amount": rng.randint(4, 20),
+                    "timestamp": self.start + datetime.timedelta(days=day, hours=7, minutes=30),
+                    "comment": "Daily salary",
+                })
+
+            for _ in range(self.scale.vc_sessions_per_day):
+                self.vc_interactions.append(self._vc_session(day))
+
+            for _ in range(int(self.scale.bets_per_day) + (rng.random() < self.scale.bets_per_day % 1)):
+                self.bets.append(self._bet(day, transactions))
+
+            # the crown changes hands every few days
+            if king is None or rng.random() < 0.3:
+                new_king = rng.choice(self.user_ids)
+                if new_king != king:
+                    timestamp = self._time(day)
+                    if king is not None:
+                        activities[king].append({
+                            "type": ActivityTypes.KING_LOSS,
+                            "timestamp": timestamp - datetime.timedelta(seconds=1),
+                            "comment": "Lost king"
+                        })
+                    activities[new_king].append(
+                        {"type": ActivityTypes.KING_GAIN, "timestamp": timestamp, "comment": "Gained king"}
+                    )
+                    king = new_king
+
+        for uid in self.user_ids:
+            points = sum(t["amount"] for t in transactions[uid]) + 10
+            self.users.append({
+                "uid": uid,
+                "guild_id": self.guild_id,
+                "points": max(points, 10),
+                "pending_points": 0,
+                "inactive": False,
+                "transaction_history": transactions[uid],
+                "activity_history": activities[uid],
+                "daily_eddies": rng.random() < 0.5,
+                "king": uid == king,
+                "high_score": max(points, 10),
+                "daily_minimum": 4,
+            })
+
+    def king_tenures(self) -> List[KingTenure]:
+        """
+        Builds the kingtenures documents from the KING_GAIN and KING_LOSS entries in the users' activity history
+        :return: list of tenures
+        """
+        tenures = []
+        for user in self.users:
+            gain = None
+            for act in user["activity_history"]:
+                if act["type"] == ActivityTypes.KING_GAIN:
+                    gain = act["timestamp"]
+                elif act["type"] == ActivityTypes.KING_LOSS and gain is not None:
+                    tenures.append(
+                        {"guild_id": self.guild_id, "uid": user["uid"], "start": gain, "end": act["timestamp"]}
+                    )
+                    gain = None
+            if gain is not None:
+                tenures.append({"guild_id": self.guild_id, "uid": user["uid"], "start": gain, "end": None})
+        return tenures
+
+    def wordle_results(self) -> List[WordleResult]:
+        """
+        Builds the wordleresults documents from the wordle messages
+        :return: list of results
+        """
+        results = []
+        for message in self.messages:
+            if "wordle" not in message["message_type"]:
+                continue
+            result = parse_wordle_message(message["content"])
+            results.append({
+                "guild_id": message["guild_id"],
+                "user_id": message["user_id"],
+                "message_id": message["message_id"],
+                "channel_id": message["channel_id"],
+                "wordle_num": result.wordle_num,
+                "timestamp": message["timestamp"],
+                "guesses": result.guesses,
+                "solved": result.solved,
+            })
+        return results
+
+    def load_into(self, database: Database, chunk_size: int = 10000) -> Dict[str, int]:
+        """
+        Inserts all the generated documents into their collections in the given database
+        The documents are copied so the in-memory ones don't get an `_id` added to them.
+
+        :param database: the database to load into - this should never be the production database
+        :param chunk_size: the max number of documents to insert at once
+        :return: dict of collection name to the number of documents inserted
+        """
+        collections = {
+            "userpoints": self.users,
+            "userinteractions": self.messages + self.vc_interactions,
+            "userbets": self.bets,
+            "serveremojis": self.emojis,
+            "spoilerthreads": self.threads,
+            "kingtenures": self.king_tenures(),
+            "wordleresults": self.wordle_results(),
+            "taxrate": [{"type": "tax", "value": 0.1}],
+        }
+
+        counts = {}
+        for name, documents in collections.items():
+            collection = interface.get_collection(database, name)
+            for idx in range(0, len(documents), chunk_size):
+                interface.insert(collection, [dict(d) for d in documents[idx:idx + chunk_size]])
+            counts[name] = len(documents)
+        return counts
+
+    def _content(self, emoji_names: List[str]) -> str:
+        rng = self._rng
+        words = rng.choices(_WORDS, k=rng.randint(1, 25))
+        if rng.random() < 0.05:
+            words.append(f"<:{rng.choice(emoji_names)}:{rng.randint(1, 10 ** 18)}>")
+        return " ".join(words)
+
+    def _message(self, day: int, emoji_names: List[str], uid: int = None) -> Message:
+        rng = self._rng
+        timestamp = self._time(day)
+        is_thread = rng.random() < 0.1
+        message = {
+            "message_id": self._id(),
+            "guild_id": self.guild_id,
+            "user_id": uid or rng.choice(self.user_ids),
+            "channel_id": rng.choice(self.thread_ids if is_thread else self.channel_ids),
+            "message_type": ["message"],
+            "content": self._content(emoji_names),
+            "timestamp": timestamp,
+            "is_thread": is_thread,
+            "is_vc": False,
+        }
+
+        if rng.random() < 0.03:
+            message["message_type"] = ["link"]
+            message["content"] = f"https://twitter.com/someone/status/{rng.randint(1, 10 ** 18)}"
+
+        if rng.random() < self.scale.reactions_per_message:
+            message["reactions"] = [
+                {
+                    "user_id": rng.choice(self.user_ids),
+                    "content": rng.choice(emoji_names + ["😂", "👍", "💀"]),
+                    "timestamp": timestamp + datetime.timedelta(seconds=rng.randint(1, 600)),
+                }
+                for _ in range(rng.randint(1, 4))
+            ]
+
+        if rng.random() < self.scale.replies_per_message:
+            message["replies"] = [
+                {
+                    "user_id": rng.choice(self.user_ids),
+                    "content": self._content(emoji_names),
+                    "timestamp": timestamp + datetime.timedelta(seconds=rng.randint(1, 600)),
+                    "message_id": self._id(),
+                }
+                for _ in range(rng.randint(1, 3))
+            ]
+
+        if rng.random() < 0.05:
+            message["edited"] = timestamp + datetime.timedelta(seconds=rng.randint(1, 600))
+            message["edit_count"] = rng.randint(1, 3)
+
+        return message
+
+    def _vc_session(self, day: int) -> VCInteraction:
+        rng = self._rng
+        timestamp = self._time(day)
+        time_in_vc = rng.randint(60, 4 * 60 * 60)
+        return {
+            "message_id": None,
+            "guild_id": self.guild_id,
+            "user_id": rng.choice(self.user_ids),
+            "channel_id": rng.choice(self.vc_ids),
+            "message_type": "vc_joined",
+            "content": None,
+            "timestamp": timestamp,
+            "is_thread": False,
+            "is_vc": True,
+            "active": False,
+            "muted": False,
+            "deafened": False,
+            "streaming": False,
+            "time_in_vc": time_in_vc,
+            "time_muted": rng.randint(0, time_in_vc // 4),
+            "time_deafened": 0,
+            "time_streaming": rng.choice([0, 0, rng.randint(0, time_in_vc)]),
+            "events": [],
+            "left": timestamp + datetime.timedelta(seconds=time_in_vc),
+        }
+
+    def _bet(self, day: int, transactions: Dict[int, List[Transaction]]) -> Bet:
+        rng = self._rng
+        created = self._time(day)
+        bet_id = f"{len(self.bets) + 1:04d}"
+        options = ["1️⃣", "2️⃣"]
+        result = rng.choice(options)
+
+        betters = {}
+        for uid in rng.sample(self.user_ids, k=min(len(self.user_ids), rng.randint(1, 6))):
+            emoji = rng.choice(options)
+            points = rng.randint(1, 50)
+            betters[str(uid)] = {
+                "user_id": uid,
+                "emoji": emoji,
+                "first_bet": created,
+                "last_bet": created,
+                "points": points,
+            }
+            transactions[uid].append({
+                "type": TransactionTypes.BET_PLACE,
+                "amount": -points,
+                "timestamp": created,
+                "comment": "Bet placed",
+                "bet_id": bet_id,
+            })
+            if emoji == result:
+                transactions[uid].append({
+                    "type": TransactionTypes.BET_WIN,
+                    "amount": points * 2,
+                    "timestamp": created + datetime.timedelta(hours=1),
+                    "comment": "Bet won",
+                    "bet_id": bet_id,
+                })
+
+        return {
+            "bet_id": bet_id,
+            "guild_id": self.guild_id,
+            "user": rng.choice(self.user_ids),
+            "title": f"Synthetic bet {bet_id}",
+            "options": options,
+            "created": created,
+            "timeout": created + datetime.timedelta(hours=1),
+            "active": False,
+            "betters": betters,
+            "result": result,
+            "option_dict": {"1️⃣": {"val": "Yes"}, "2️⃣": {"val": "No"}},
+            "channel_id": rng.choice(self.channel_ids),
+            "message_id": self._id(),
+            "private": False,
+            "closed": created + datetime.timedelta(hours=1),
+        }
+
+
+class _Documents:
+    """Minimal stand-in for the collection classes StatsDataCache exposes directly"""
+    def __init__(self, documents: list):
+        self._documents = documents
+
+    def get_all_emojis(self, guild_id: int) -> List[Emoji]:
+        return [d for d in self._documents if d["guild_id"] == guild_id]
+
+    def get_all_threads(self, guild_id: int) -> List[Thread]:
+        return [d for d in self._documents if d["guild_id"] == guild_id]
+
+
+class SyntheticStatsDataCache(StatsDataCache):
+    """
+    A StatsDataCache that serves the documents of a SyntheticGuild from memory instead of MongoDB
+    The filtering mirrors the queries StatsDataCache makes.
+    """
+    def __init__(self, guild: SyntheticGuild, annual: bool = False) -> None:
+        super().__init__(annual)
+        self.guild = guild
+        self.server_emojis = _Documents(guild.emojis)
+        self.threads = _Documents(guild.threads)
+
+    def get_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
+        return [m for m in self.guild.messages if m["guild_id"] == guild_id and start < m["timestamp"] < end]
+
+    def get_edited_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
+        return [
+            m for m in self.guild.messages
+            if m["guild_id"] == guild_id and m.get("edit_count", 0) >= 1 and start < m["edited"] < end
+        ]
+
+    def get_vc_interactions(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime
+    ) -> List[VCInteraction]:
+        return [
+            v for v in self.guild.vc_interactions if v["guild_id"] == guild_id and start < v["timestamp"] < end
+        ]
+
+    def get_bets(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Bet]:
+        return [b for b in self.guild.bets if b["guild_id"] == guild_id and start < b["created"] < end]
+
+    def get_users(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[User]:
+        return [u for u in self.guild.users if u["guild_id"] == guild_id]
+
+    def get_transactions(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Transaction]:
+        transactions = []
+        for user in self.get_users(guild_id, start, end):
+            for trans in user["transaction_history"]:
+                if start < trans["timestamp"] < end:
+                    transactions.append(dict(trans, uid=user["uid"]))
+        return transactions
+
+    def get_activities(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Activity]:
+        activities = []
+        for user in self.get_users(guild_id, start, end):
+            for act in user["activity_history"]:
+                if start < act["timestamp"] < end:
+                    activities.append(dict(act, uid=user["uid"]))
+        return activities
+
+    def get_king_tenures(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[KingTenure]:
+        return sorted(
+            [
+                t for t in self.guild.king_tenures()
+                if t["guild_id"] == guild_id and t["start"] < end and (t["end"] is None or t["end"] > start)
+            ],
+            key=lambda t: t["start"]
+        )
+
+    def get_wordle_results(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime
+    ) -> List[WordleResult]:
+        return [
+            r for r in self.guild.wordle_results() if r["guild_id"] == guild_id and start <= r["timestamp"] <= end
+        ]
+
+    def get_reactions(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
+        return [
+            m for m in self.guild.messages
+            if m["guild_id"] == guild_id and any(start < r["timestamp"] < end for r in m.get("reactions", []))
+        ]
+
+    def get_emojis(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Emoji]:
+        return self.server_emojis.get_all_emojis(guild_id)
+
+    def get_replies(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
+        return [
+            m for m in self.guild.messages
+            if m["guild_id"] == guild_id and any(start < r["timestamp"] < end for r in m.get("replies", []))
+        ]
+
+
+_GUILDS: Dict[SyntheticScale, SyntheticGuild] = {}
+
+
+def get_guild(scale: SyntheticScale) -> SyntheticGuild:
+    """
+    Returns the SyntheticGuild for the given scale, generating it the first time it's asked for in this process
+    :param scale: the scale
+    :return: the guild
+    """
+    if scale not in _GUILDS:
+        _GUILDS[scale] = SyntheticGuild(scale)
+    return _GUILDS[scale]
+
+
+class SyntheticCacheFactory:
+    """Picklable factory for creating SyntheticStatsDataCache objects in worker processes"""
+    def __init__(self, scale: SyntheticScale):
+        self.scale = scale
+
+    def __call__(self, annual: bool) -> SyntheticStatsDataCache:
+        return SyntheticStatsDataCache(get_guild(self.scale), annual)
@@ -0,0 +1,132 @@
+"""
+Runs the WordleSolver against every answer in the word list on simulated boards.
+
+Reports the guess distribution, the failure rate and the CPU time each solve took.
+Each answer gets its own seed so the (random) starting word is the same between runs.
+
+Usage:
+    python -m benchmarks.wordle [--limit 1000] [--workers 4] [--filter]
+    python -m benchmarks.wordle --browser crane
+
+--filter benchmarks the word index filtering fallback instead of the entropy engine.
+--browser solves the given answer on the static fixture page (benchmarks/fixtures/wordle.html) in a headless
+Chrome, to check the SeleniumWordleBoard against something that looks like the real page.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import os
+import pathlib
+import random
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+from discordbot.wordle.board import SeleniumWordleBoard, SimulatedWordleBoard
+from discordbot.wordle.entropy import load_patterns
+from discordbot.wordle.wordlesolver import WordleSolver
+
+
+def solve_answers(answers: List[Tuple[int, str]], use_engine: bool = True) -> List[Tuple[str, bool, int, float]]:
+    """
+    Solves the given answers - this is what gets executed in the worker processes
+    :param answers: list of (seed, answer) tuples
+    :param use_engine: whether to use the entropy engine or the word index filtering
+    :return: list of (answer, solved, guess count, CPU seconds) tuples
+    """
+    solver = WordleSolver(logging.getLogger("bsebot.benchmarks"))
+    if not use_engine:
+        solver.engine = None
+
+    results = []
+    for seed, answer in answers:
+        random.seed(seed)
+        board = SimulatedWordleBoard(answer)
+        start = time.process_time()
+        solve = asyncio.run(solver.solve_board(board))
+        results.append((answer, solve.solved, solve.guess_count, time.process_time() - start))
+    return results
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wordle.html")
+
+
+async def solve_in_browser(answer: str, wordle_number: int = 123) -> int:
+    """
+    Solves the answer on the fixture page in a headless browser
+    :param answer: the answer for the fixture to use
+    :param wordle_number: the wordle number for the fixture to show
+    :return: exit code
+    """
+    logger = logging.getLogger("bsebot.benchmarks")
+    url = f"{pathlib.Path(FIXTURE).as_uri()}?answer={answer}&number={wordle_number}"
+
+    start = time.perf_counter()
+    solver = WordleSolver(logger)
+    board = SeleniumWordleBoard(logger, url=url)
+    await board.open()
+    opened = time.perf_counter() - start
+    solve = await solver.solve_board(board)
+    elapsed = time.perf_counter() - start
+
+    print(solve.share_text)
+    print(f"Opened the page in {opened:.2f}s and solved in {elapsed:.2f}s")
+    if solve.wordle_num != wordle_number or (solve.solved and solve.actual_word != answer):
+        print(f"Board read back the wrong result: {solve}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=None, help="only solve this many answers")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--chunk", type=int, default=100, help="number of answers per task")
+    parser.add_argument("--filter", action="store_true", help="use the word index instead of the entropy engine")
+    parser.add_argument("--browser", metavar="ANSWER", help="solve ANSWER on the fixture page in a headless browser")
+    parsed = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if parsed.browser:
+        return asyncio.run(solve_in_browser(parsed.browser.lower()))
+
+    words = WordleSolver._get_words()
+    if parsed.filter is False:
+        # build the pattern matrix here if it's missing, rather than in every worker
+        load_patterns(words)
+
+    answers = list(enumerate(words))[:parsed.limit]
+    chunks = [answers[idx:idx + parsed.chunk] for idx in range(0, len(answers), parsed.chunk)]
+
+    results = []
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=parsed.workers) as executor:
+        for chunk_results in executor.map(solve_answers, chunks, [not parsed.filter] * len(chunks)):
+            results.extend(chunk_results)
+    elapsed = time.perf_counter() - start
+
+    distribution = collections.Counter(count if solved else "X" for _, solved, count, _ in results)
+    failures = [answer for answer, solved, _, _ in results if not solved]
+    cpu_times = sorted(cpu for *_, cpu in results)
+    solved_counts = [count for _, solved, count, _ in results if solved]
+
+    print(f"Solved {len(results) - len(failures)}/{len(results)} answers in {elapsed:.2f}s")
+    for guesses in [1, 2, 3, 4, 5, 6, "X"]:
+        print(f"  {guesses}: {distribution.get(guesses, 0)}")
+    print(f"Failure rate: {len(failures) / len(results):.2%}")
+    if solved_counts:
+        print(f"Mean guesses when solved: {statistics.mean(solved_counts):.3f}")
+    print(
+        f"CPU time per solve: mean {statistics.mean(cpu_times) * 1000:.2f}ms, "
+        f"median {statistics.median(cpu_times) * 1000:.2f}ms, max {cpu_times[-1] * 1000:.2f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,10 @@ class OnDirectMessage(BaseEvent):
         self.thanks = ["thank you", "thanks", "fanks", "fank you", " ty ", "thanks dad"]
         self.rude = ["fuck you", "fuck off", "faggot", "fuckyou"]
 
+        # the tags of the GIFs we reply with
+        self.thanks_gif_tag = "youre welcome"
+        self.rude_gif_tag = "shocked"
+
     async def dm_received(self, message: discord.Message) -> None:
         """
         Main method for handling when someone sends us a DM
@@ -26,8 +30,8 @@ class OnDirectMessage(BaseEvent):
         message_content = message.content
 
         if [a for a in self.thanks if a in message_content.lower()]:
-            gif = await self.giphyapi.random_gif("youre welcome")
+            gif = await self.giphyapi.random_gif(self.thanks_gif_tag)
             await message.author.send(content=gif)
         elif [a for a in self.rude if a in message_content.lower()]:
-            gif = await self.giphyapi.random_gif("shocked")
+            gif = await self.giphyapi.random_gif(self.rude_gif_tag)
             await message.author.send(content=gif)
@@ -22,8 +22,8 @@ class OnMemberJoin(BaseEvent):
         """
         user_id = member.id
 
-        if user := self.user_points.find_user(user_id, member.guild.id):
-            self.user_points.update({"_id": user["_id"]}, {"$set": {"inactive": False}})
+        if self.user_points.find_user(user_id, member.guild.id):
+            self.user_points.set_inactive(user_id, member.guild.id, False)
             self.logger.info(f"Activating BSEddies account for existing user - {user_id} - {member.display_name}")
             self.user_points.append_to_activity_history(
                 user_id,
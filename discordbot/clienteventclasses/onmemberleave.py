@@ -22,7 +22,7 @@ class OnMemberLeave(BaseEvent):
         """
         user_id = member.id
 
-        self.user_points.update({"uid": user_id, "guild_id": member.guild.id}, {"$set": {"inactive": True}})
+        self.user_points.set_inactive(user_id, member.guild.id, True)
         self.user_points.append_to_activity_history(
             user_id,
             member.guild.id,
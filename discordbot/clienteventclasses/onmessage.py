@@ -1,11 +1,12 @@
 import random
-import re
 from typing import Optional
 
 import discord
 
 from discordbot.baseeventclass import BaseEvent
-from discordbot.constants import WORDLE_REGEX
+from discordbot.messageclassifier import classify_message, is_bot_thanks, is_thank_you
+from discordbot.messageresolver import MessageResolver
+from mongo.bsedataclasses import WordleResults
 from mongo.bsepoints import UserInteractions
 
 
@@ -17,6 +18,8 @@ class OnMessage(BaseEvent):
     def __init__(self, client, guild_ids, logger):
         super().__init__(client, guild_ids, logger)
         self.user_interactions = UserInteractions()
+        self.wordle_results = WordleResults()
+        self.message_resolver = MessageResolver(client, logger, self.user_interactions)
 
     async def _handle_bot_reply(self, message: discord.Message) -> None:
         """Sends a basic reply message if a message meets the requirements
@@ -24,15 +27,6 @@ class OnMessage(BaseEvent):
         Args:
             message (discord.Message): the discord message object
         """
-        _thank_you_terms = [
-            "thank you", "thanks", "ty", "cutie", "i love you",
-        ]
-        _bot_thanks = [
-            "thank you bot", "thank you bsebot",
-            "thanks bot", "thanks bsebot",
-            "ty bot", "ty bsebot"
-        ]
-
         _possible_replies = [
             "You are most welcome.",
             "Your praise means everything to me.",
@@ -57,19 +51,16 @@ class OnMessage(BaseEvent):
         if message.mentions:
             mentions = [m.id for m in message.mentions if m.id == self.client.user.id]
             if mentions:
-                if any([re.match(rf"\b{a}\b", message.content.lower()) for a in _thank_you_terms]):
+                if is_thank_you(message.content):
                     # yes! send message
                     send_message = True
-        elif any([re.match(rf"\b{a}\b", message.content.lower()) for a in _bot_thanks]):
+        elif is_bot_thanks(message.content):
             send_message = True
-        elif message.reference:
-            _reply = message.reference.cached_message
-            if not _reply:
-                channel = await self.client.fetch_channel(message.reference.channel_id)
-                _reply = await channel.fetch_message(message.reference.message_id)
-            if _reply.author.id == self.client.user.id:
+        elif reference := message.reference:
+            _reply = await self.message_resolver.resolve(message.guild.id, reference.channel_id, reference.message_id)
+            if _reply and _reply.author_id == self.client.user.id:
                 # we sent this message!
-                if any([re.match(rf"\b{a}\b", message.content.lower()) for a in _thank_you_terms]):
+                if is_thank_you(message.content):
                     # yes! send message
                     send_message = True
         if not send_message:
@@ -118,19 +109,15 @@ class OnMessage(BaseEvent):
         ]:
             is_vc = True
 
+        if not message_type_only:
+            # so replies to this message don't need a lookup
+            self.message_resolver.remember(message)
+
         if reference := message.reference:
-            referenced_message = self.client.get_message(reference.message_id)
-            if not referenced_message:
-                if reference.channel_id != message.channel.id:
-                    ref_channel = await self.client.fetch_channel(reference.channel_id)
-                else:
-                    ref_channel = message.channel
-                try:
-                    referenced_message = await ref_channel.fetch_message(reference.message_id)
-                except (discord.NotFound, discord.errors.HTTPException):
-                    # reference was deleted
-                    referenced_message = None
-            if referenced_message and referenced_message.author.id != user_id:
+            referenced_message = await self.message_resolver.resolve(
+                guild_id, reference.channel_id or channel_id, reference.message_id
+            )
+            if referenced_message and referenced_message.author_id != user_id:
                 message_type.append("reply")
                 if not message_type_only:
                     self.user_interactions.add_reply_to_message(
@@ -160,58 +147,38 @@ class OnMessage(BaseEvent):
                             additional_keys={"og_mid": message.id}
                         )
 
-        if message.attachments:
-            message_type.append("attachment")
-
-        if role_mentions := message.role_mentions:
-            for _ in role_mentions:
-                message_type.append("role_mention")
+        classification = classify_message(
+            message_content,
+            user_id,
+            mention_ids=[mention.id for mention in message.mentions],
+            role_mention_count=len(message.role_mentions),
+            channel_mention_count=len(message.channel_mentions),
+            mention_everyone=message.mention_everyone,
+            has_attachments=bool(message.attachments),
+        )
+        message_type.extend(classification.message_type)
+        wordle_result = classification.wordle
 
-        if channel_mentions := message.channel_mentions:
-            for _ in channel_mentions:
-                message_type.append("channel_mention")
+        for emoji_id in classification.emoji_ids:
+            if emoji_obj := self.server_emojis.get_emoji(guild_id, emoji_id):
+                # used a custom emoji!
+                message_type.append("custom_emoji")
 
-        if mentions := message.mentions:
-            for mention in mentions:
-                if mention.id == user_id:
+                if user_id == emoji_obj["created_by"]:
                     continue
-                message_type.append("mention")
-
-        if message.mention_everyone:
-            message_type.append("everyone_mention")
-
-        if "https://" in message.content or "http://" in message_content:
-            if ".gif" in message.content:
-                message_type.append("gif")
-            message_type.append("link")
-
-        message_type.append("message")
-
-        if re.match(WORDLE_REGEX, message.content):
-            message_type.append("wordle")
-
-        if emojis := re.findall(r"<:[a-zA-Z_0-9]*:\d*>", message.content):
-            for emoji in emojis:
-                emoji_id = emoji.strip("<").strip(">").split(":")[-1]
-                if emoji_obj := self.server_emojis.get_emoji(guild_id, int(emoji_id)):
-                    # used a custom emoji!
-                    message_type.append("custom_emoji")
-
-                    if user_id == emoji_obj["created_by"]:
-                        continue
-                    if not message_type_only:
-                        self.user_interactions.add_entry(
-                            emoji_obj["eid"],
-                            guild_id,
-                            emoji_obj["created_by"],
-                            channel_id,
-                            ["emoji_used", ],
-                            message_content,
-                            message.created_at,
-                            is_thread=is_thread,
-                            is_vc=is_vc,
-                            additional_keys={"og_mid": message.id}
-                        )
+                if not message_type_only:
+                    self.user_interactions.add_entry(
+                        emoji_obj["eid"],
+                        guild_id,
+                        emoji_obj["created_by"],
+                        channel_id,
+                        ["emoji_used", ],
+                        message_content,
+                        message.created_at,
+                        is_thread=is_thread,
+                        is_vc=is_vc,
+                        additional_keys={"og_mid": message.id}
+                    )
 
         if message_type_only:
             return message_type
@@ -228,6 +195,11 @@ class OnMessage(BaseEvent):
             is_vc=is_vc
         )
 
+        if wordle_result:
+            self.wordle_results.record_result(
+                guild_id, user_id, message.id, channel_id, message.created_at, wordle_result
+            )
+
         try:
             if message.mentions or "thank" in message.content.lower() or "ty" in message.content.lower():
                 if not message.author.id == self.client.user.id:
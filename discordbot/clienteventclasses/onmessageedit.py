@@ -58,9 +58,10 @@ class OnMessageEdit(BaseEvent):
         db_message = self.user_interactions.get_message(guild_id, after.id)
 
         if not db_message:
-            # weird
-            message_type = await self.on_message.message_received(after)
-            db_message = self.user_interactions.get_message(guild_id, after.id)
+            # weird - we never recorded the original message so just record the edited one
+            await self.on_message.message_received(after)
+            self.logger.info(f"{after.id} was edited but wasn't in the DB - recorded it")
+            return
 
         message_type = await self.on_message.message_received(after, True)
 
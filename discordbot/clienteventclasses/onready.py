@@ -1,18 +1,40 @@
+import asyncio
 import datetime
 import os
 import subprocess
+import time
 from typing import Optional
 
 import discord
 
 from discordbot.baseeventclass import BaseEvent
-from discordbot.bot_enums import TransactionTypes, ActivityTypes
 from discordbot.constants import BSEDDIES_REVOLUTION_CHANNEL, THE_BOYS_ROLE, BSE_SERVER_ID, GENERAL_CHAT
 from discordbot.slashcommandeventclasses import BSEddiesPlaceBet, BSEddiesCloseBet
 from discordbot.views import LeaderBoardView, RevolutionView, BetView
-from mongo.bsedataclasses import CommitHash, SpoilerThreads
+from mongo.bsedataclasses import CommitHash, ScheduledJobs, SpoilerThreads, WordleResults
 from mongo.bseticketedevents import RevolutionEvent
-from mongo.bsepoints import UserInteractions, ServerEmojis
+from mongo.bsepoints import KingTenures, UserInteractions, ServerEmojis
+
+
+# max number of REST requests to make at once when syncing a guild on startup
+STARTUP_CONCURRENCY = 5
+
+
+class _StageTimer:
+    """
+    Keeps track of how long each stage of the OnReady sequence takes
+    """
+    def __init__(self):
+        self.timings = {}  # type: dict[str, float]
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = now - self._last
+        self._last = now
+
+    def __str__(self) -> str:
+        return ", ".join(f"{stage}: {elapsed:.2f}s" for stage, elapsed in self.timings.items())
 
 
 class OnReadyEvent(BaseEvent):
@@ -28,6 +50,10 @@ class OnReadyEvent(BaseEvent):
         self.place = BSEddiesPlaceBet(client, guild_ids, self.logger)
         self.spoilers = SpoilerThreads()
         self.hashes = CommitHash()
+        self.king_tenures = KingTenures()
+        self.wordle_results = WordleResults()
+        self.scheduled_jobs = ScheduledJobs()
+        self._background_tasks = set()  # type: set[asyncio.Task]
 
     async def on_ready(self) -> None:
         """
@@ -36,6 +62,9 @@ class OnReadyEvent(BaseEvent):
         """
         self.logger.info("Beginning OnReady sequence")
 
+        self.user_interactions.create_indexes()
+        self.user_points.create_indexes()
+
         self.logger.info("Syncing commands")
         await self.client.sync_commands(method="auto", guild_ids=self.guild_ids)
         self.logger.info("Synced commands")
@@ -44,132 +73,60 @@ class OnReadyEvent(BaseEvent):
             # ( message_id , channel_id )
         ]
 
+        # the one-off jobs that have already been done
+        last_runs = self.scheduled_jobs.get_last_runs()
+
         for guild_id in self.guild_ids:
             guild = self.client.get_guild(guild_id)  # type: discord.Guild
             self.logger.info(f"Checking guild: {guild.id} - {guild.name}")
-
-            self.logger.info("Checking guilds for new members")
-            for member in guild.members:  # type: discord.Member
-                if member.bot:
-                    continue
-
-                self.logger.info(f"Checking {member.id} - {member.name}")
-                user = self.user_points.find_user(member.id, guild.id)
-                if not user:
-
-                    the_boys_role = [role for role in member.roles if role == THE_BOYS_ROLE]
-
-                    self.user_points.create_user(member.id, guild.id, bool(the_boys_role))
-                    self.logger.info(
-                        f"Creating new user entry for {member.id} - {member.name} for {guild.id} - {guild.name}"
-                    )
-
-                    self.user_points.append_to_transaction_history(
-                        member.id,
-                        guild.id,
-                        {
-                            "type": TransactionTypes.USER_CREATE,
-                            "amount": 10,
-                            "timestamp": datetime.datetime.now(),
-                            "comment": "User created",
-                        }
-                    )
-                    continue
-
-                if not user.get("daily_eddies"):
-                    the_boys_role = [role for role in member.roles if role == THE_BOYS_ROLE]
-                    self.user_points.set_daily_eddies_toggle(member.id, guild.id, bool(the_boys_role))
-
-            self.logger.info("Checking for users that have left")
-            member_ids = [member.id for member in guild.members]
-            _users = self.user_points.get_all_users_for_guild(guild_id)
-            _users = [u for u in _users if not u.get("inactive")]
-            for user in _users:
-                if user["uid"] not in member_ids:
-
-                    self.user_points.update({"_id": user["_id"]}, {"$set": {"inactive": True}})
-                    self.user_points.append_to_activity_history(
-                        user["uid"],
-                        guild_id,
-                        {
-                            "type": ActivityTypes.SERVER_LEAVE,
-                            "timestamp": datetime.datetime.now()
-                        }
+            timer = _StageTimer()
+
+            self.logger.info("Reconciling guild members with the users in the DB")
+            members = {
+                member.id: bool([role for role in member.roles if role == THE_BOYS_ROLE])
+                for member in guild.members if not member.bot
+            }
+            bot_ids = {member.id for member in guild.members if member.bot}
+            counts = self.user_points.reconcile_guild_members(guild_id, members, bot_ids)
+            self.logger.info(
+                f"Checked {len(members)} members: created {counts['created']} users, set the daily eddies toggle "
+                f"for {counts['toggled']} and marked {counts['inactivated']} as having left"
+            )
+            timer.lap("members")
+
+            backfill = f"king_tenure_backfill_{guild_id}"
+            if backfill not in last_runs:
+                self.king_tenures.create_indexes()
+                # guilds with tenures were backfilled before we started recording it
+                if not self.king_tenures.has_tenures(guild_id):
+                    self.logger.info("Backfilling the KING tenures for this guild from the activity history")
+                    _users = self.user_points.get_all_users_for_guild(
+                        guild_id, projection={"uid": True, "activity_history": True}
                     )
+                    created = self.king_tenures.backfill_from_activity_history(guild_id, _users)
+                    self.logger.info(f"Backfilled {created} KING tenures")
+                self.scheduled_jobs.set_last_run(backfill, datetime.datetime.now())
+
+            if not self.wordle_results.has_results(guild_id):
+                self.logger.info("No wordle results for this guild - backfilling them from the wordle messages")
+                self.wordle_results.create_indexes()
+                _messages = self.user_interactions.get_all_wordle_messages_for_server(guild_id)
+                created = self.wordle_results.backfill_from_messages(guild_id, _messages)
+                self.logger.info(f"Backfilled {created} wordle results")
+            timer.lap("backfills")
 
             self.logger.info("Checking guild emojis")
-            await guild.fetch_emojis()
-            # sort out emojis
-            for emoji in guild.emojis:
-                emoji_obj = await guild.fetch_emoji(emoji.id)
-                emoji_db_obj = self.server_emojis.get_emoji(guild_id, emoji_obj.id)
-                if not emoji_db_obj:
-                    self.logger.info(f"{emoji_obj.name} doesn't exist in the DB yet - inserting")
-                    self.server_emojis.insert_emoji(
-                        emoji_obj.id,
-                        emoji_obj.name,
-                        emoji_obj.created_at,
-                        emoji_obj.user.id,
-                        guild_id
-                    )
-
-                    # give user eddies retroactively for reacting custom emojis
-                    self.user_interactions.add_entry(
-                        emoji_obj.id,
-                        guild_id,
-                        emoji_obj.user.id,
-                        guild_id,
-                        ["emoji_created", ],
-                        emoji_obj.name,
-                        datetime.datetime.now(),
-                        additional_keys={"emoji_id": emoji_obj.id, "created_at": emoji_obj.created_at}
-                    )
+            await self.sync_emojis(guild)
+            timer.lap("emojis")
 
             self.logger.info("Checking guild stickers")
-            await guild.fetch_stickers()
-            # sort out stickers
-            for sticker in guild.stickers:
-                stick_obj = await guild.fetch_sticker(sticker.id)
-                sticker_db_obj = self.server_stickers.get_sticker(guild_id, stick_obj.id)
-                if not sticker_db_obj:
-                    self.logger.info(f"{stick_obj.name} doesn't exist in the DB yet - inserting")
-                    self.server_stickers.insert_sticker(
-                        stick_obj.id,
-                        stick_obj.name,
-                        stick_obj.created_at,
-                        stick_obj.user.id,
-                        guild_id
-                    )
-
-                    # give user eddies retroactively for reacting custom emojis
-                    self.user_interactions.add_entry(
-                        stick_obj.id,
-                        guild_id,
-                        stick_obj.user.id,
-                        guild_id,
-                        ["sticker_created", ],
-                        stick_obj.name,
-                        datetime.datetime.now(),
-                        additional_keys={"sticker_id": stick_obj.id, "created_at": stick_obj.created_at}
-                    )
+            await self.sync_stickers(guild)
+            timer.lap("stickers")
 
             # join all threads
             self.logger.info("Joining threads")
-            for channel in guild.channels:
-                if type(channel) not in [discord.channel.TextChannel]:
-                    continue
-
-                if threads := channel.threads:
-                    for thread in threads:
-                        if thread.archived or thread.locked:
-                            continue
-
-                        await thread.fetch_members()
-
-                        if self.client.user.id not in [member.id for member in thread.members]:
-
-                            await thread.join()
-                            self.logger.info(f"Joined {thread.name}")
+            await self.join_threads(guild)
+            timer.lap("threads")
 
             # add thread to spoiler info
             self.logger.info("Checking spoiler threads")
@@ -190,6 +147,8 @@ class OnReadyEvent(BaseEvent):
                                 thread.owner_id
                             )
 
+            timer.lap("spoiler threads")
+
             self.logger.info("Initialising event views")
             if events := self.events.get_open_events(guild_id):
                 if len(events) > 1:
@@ -210,24 +169,24 @@ class OnReadyEvent(BaseEvent):
             bets = self.user_bets.get_all_active_bets(guild_id)
             other_bets = self.user_bets.get_all_inactive_pending_bets(guild_id)
             bets.extend(other_bets)
+            legacy_bets = []
             for bet in bets:
-                message_id = bet["message_id"]
-                channel_id = bet["channel_id"]
-                if not channel_id or not message_id:
+                if not bet["channel_id"] or not bet["message_id"]:
                     continue
 
-                try:
-                    channel = await guild.fetch_channel(channel_id)
-                except discord.errors.NotFound:
-                    # possible the channel no longer exists
-                    self.logger.debug(f"Issue with fetching channel: {channel_id=}, {bet=}")
-                    continue
+                view = BetView(bet, self.place, self.close)
+                self.client.add_view(view, message_id=bet["message_id"])
+                if not bet.get("persistent_view"):
+                    legacy_bets.append(bet)
 
-                message = channel.get_partial_message(message_id)
+            if legacy_bets:
+                # these messages were sent before the bet buttons had fixed custom IDs
+                self.logger.info(f"Updating the buttons on {len(legacy_bets)} bet messages in the background")
+                task = asyncio.create_task(self.update_bet_messages(guild, legacy_bets))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
 
-                embed = self.embed_manager.get_bet_embed(guild, bet["bet_id"], bet)
-                view = BetView(bet, self.place, self.close)
-                await message.edit(embed=embed, view=view)
+            timer.lap("views")
 
             self.logger.info("Deleting messages")
             try:
@@ -268,10 +227,159 @@ class OnReadyEvent(BaseEvent):
             except Exception as e:
                 self.logger.exception(f"Error with doing the git thing: {e}")
 
-            self.logger.info(f"Finishing checking {guild_id}")
+            timer.lap("git")
+            self.logger.info(f"Finishing checking {guild_id} - stage timings: {timer}")
 
         self.logger.info("Finished OnReady sequence")
 
+    async def _gather_bounded(self, coros: list) -> list:
+        """
+        Runs the coroutines concurrently with at most STARTUP_CONCURRENCY running at once
+        :param coros: the coroutines to run
+        :return: the results, in the same order as the coroutines
+        """
+        semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
+        return list(await asyncio.gather(*[_bounded(coro) for coro in coros]))
+
+    async def sync_emojis(self, guild: discord.Guild) -> None:
+        """
+        Inserts any of the guild's emojis that we don't know about yet.
+
+        The guild's emojis come from the gateway cache and are diffed against the emoji IDs in the DB,
+        so only the new emojis get fetched (we need to fetch them to find out who created them).
+        :param guild: the guild to sync
+        :return: None
+        """
+        known = self.server_emojis.get_emoji_ids(guild.id)
+        new_emojis = [emoji for emoji in guild.emojis if emoji.id not in known]
+        if not new_emojis:
+            return
+
+        fetched = await self._gather_bounded([guild.fetch_emoji(emoji.id) for emoji in new_emojis])
+        for emoji_obj in fetched:  # type: discord.Emoji
+            self.logger.info(f"{emoji_obj.name} doesn't exist in the DB yet - inserting")
+            self.server_emojis.insert_emoji(
+                emoji_obj.id,
+                emoji_obj.name,
+                emoji_obj.created_at,
+                emoji_obj.user.id,
+                guild.id
+            )
+
+            # give user eddies retroactively for reacting custom emojis
+            self.user_interactions.add_entry(
+                emoji_obj.id,
+                guild.id,
+                emoji_obj.user.id,
+                guild.id,
+                ["emoji_created", ],
+                emoji_obj.name,
+                datetime.datetime.now(),
+                additional_keys={"emoji_id": emoji_obj.id, "created_at": emoji_obj.created_at}
+            )
+
+    async def sync_stickers(self, guild: discord.Guild) -> None:
+        """
+        Inserts any of the guild's stickers that we don't know about yet.
+
+        Works the same way as sync_emojis.
+        :param guild: the guild to sync
+        :return: None
+        """
+        known = self.server_stickers.get_sticker_ids(guild.id)
+        new_stickers = [sticker for sticker in guild.stickers if sticker.id not in known]
+        if not new_stickers:
+            return
+
+        fetched = await self._gather_bounded([guild.fetch_sticker(sticker.id) for sticker in new_stickers])
+        for stick_obj in fetched:  # type: discord.GuildSticker
+            self.logger.info(f"{stick_obj.name} doesn't exist in the DB yet - inserting")
+            self.server_stickers.insert_sticker(
+                stick_obj.id,
+                stick_obj.name,
+                stick_obj.created_at,
+                stick_obj.user.id,
+                guild.id
+            )
+
+            # give user eddies retroactively for reacting custom emojis
+            self.user_interactions.add_entry(
+                stick_obj.id,
+                guild.id,
+                stick_obj.user.id,
+                guild.id,
+                ["sticker_created", ],
+                stick_obj.name,
+                datetime.datetime.now(),
+                additional_keys={"sticker_id": stick_obj.id, "created_at": stick_obj.created_at}
+            )
+
+    async def _join_thread(self, thread: discord.Thread) -> None:
+        await thread.fetch_members()
+        if self.client.user.id in [member.id for member in thread.members]:
+            return
+
+        await thread.join()
+        self.logger.info(f"Joined {thread.name}")
+
+    async def join_threads(self, guild: discord.Guild) -> None:
+        """
+        Joins all the active threads in the guild's text channels that we're not already in
+
+        Threads that the gateway cache already has our membership for are skipped. The rest have their members
+        fetched (concurrently) to double check before we join them.
+        :param guild: the guild
+        :return: None
+        """
+        threads = [
+            thread
+            for channel in guild.channels if type(channel) in [discord.channel.TextChannel]
+            for thread in channel.threads
+            if not thread.archived and not thread.locked and thread.me is None
+        ]
+        await self._gather_bounded([self._join_thread(thread) for thread in threads])
+
+    async def _update_bet_message(self, guild: discord.Guild, bet: dict) -> None:
+        channel = guild.get_channel_or_thread(bet["channel_id"])
+        try:
+            if channel is None:
+                channel = await guild.fetch_channel(bet["channel_id"])
+            message = channel.get_partial_message(bet["message_id"])
+
+            embed = self.embed_manager.get_bet_embed(guild, bet["bet_id"], bet)
+            view = BetView(bet, self.place, self.close)
+            if not bet["active"]:
+                # bet is closed for new bets
+                view.children[0].disabled = True
+            await message.edit(embed=embed, view=view)
+        except discord.errors.NotFound:
+            # possible the channel or message no longer exists
+            self.logger.debug(f"Issue with updating bet message: {bet['channel_id']=}, {bet['bet_id']=}")
+            return
+        except discord.errors.HTTPException as e:
+            self.logger.warning(f"Failed to update message for bet {bet['bet_id']}: {e}")
+            return
+
+        self.user_bets.update({"_id": bet["_id"]}, {"$set": {"persistent_view": True}})
+
+    async def update_bet_messages(self, guild: discord.Guild, bets: list) -> None:
+        """
+        Edits the bet messages so that they have the current BetView buttons.
+
+        Only needed for bet messages sent before the buttons had fixed custom IDs. Once a message has been updated
+        the bet is marked so that we don't edit it again.
+        :param guild: the guild
+        :param bets: the bets to update the messages of
+        :return: None
+        """
+        await self._gather_bounded([self._update_bet_message(guild, bet) for bet in bets])
+        self.logger.info(f"Finished updating {len(bets)} bet messages")
+
     def git_compare(self, guild_id: int) -> Optional[str]:
         """Returns
 
@@ -3,6 +3,7 @@ import datetime
 import discord
 
 from discordbot.baseeventclass import BaseEvent
+from discordbot.voicesessions import VoiceSessionTable
 from mongo.bsepoints import UserInteractions
 
 
@@ -14,6 +15,7 @@ class OnVoiceStateChange(BaseEvent):
     def __init__(self, client: discord.Bot, guild_ids, logger):
         super().__init__(client, guild_ids, logger)
         self.user_interactions = UserInteractions()
+        self.sessions = VoiceSessionTable(logger, self.user_interactions)
 
     async def on_voice_state_change(
         self,
@@ -44,6 +46,10 @@ class OnVoiceStateChange(BaseEvent):
             await self.left_vc(member, before)
             await self.joined_vc(member, after)
 
+        if before.channel != after.channel:
+            # the new session was started with the current statuses
+            return
+
         if (
             before.self_mute != after.self_mute or
             before.self_deaf != after.self_deaf or
@@ -61,18 +67,10 @@ class OnVoiceStateChange(BaseEvent):
         """
         self.logger.info(f"User {member.id}, {member.name} is joining {after.channel}")
 
-        self.user_interactions.add_voice_state_entry(
-            after.channel.guild.id,
-            member.id,
-            after.channel.id,
-            datetime.datetime.now(),
-            after.self_mute,
-            after.self_deaf,
-            after.self_stream
-        )
+        self.sessions.join((after.channel.guild.id, member.id, after.channel.id), after, datetime.datetime.now())
 
     async def left_vc(self, member: discord.Member, before: discord.VoiceState) -> None:
-        """Updates the DB entry when a user leaves
+        """Closes the DB entry when a user leaves
 
         Args:
             member (discord.Member): the member object
@@ -81,50 +79,9 @@ class OnVoiceStateChange(BaseEvent):
 
         self.logger.info(f"User {member.id}, {member.name} is leaving {before.channel}")
 
-        now = datetime.datetime.now()
-
-        vc_doc = self.user_interactions.find_active_voice_state(
-            before.channel.guild.id,
-            member.id,
-            before.channel.id,
-            now
-        )
-
-        if not vc_doc:
+        key = (before.channel.guild.id, member.id, before.channel.id)
+        if not self.sessions.leave(key, datetime.datetime.now()):
             self.logger.info(f"Couldn't find VC doc for {member}, {before}")
-            return
-
-        vc_doc["active"] = False
-        vc_doc["left"] = now
-        vc_doc["time_in_vc"] += (now - vc_doc["timestamp"]).total_seconds()
-
-        if before.self_mute:
-            vc_doc["time_muted"] += (now - vc_doc["muted_time"]).total_seconds()
-
-        if before.self_deaf:
-            vc_doc["time_deafened"] += (now - vc_doc["deafened_time"]).total_seconds()
-
-        if before.self_stream:
-            vc_doc["time_streaming"] += (now - vc_doc["streaming_time"]).total_seconds()
-
-        vc_doc["events"].append(
-            {"timestamp": now, "event": "left"}
-        )
-
-        self.user_interactions.update(
-            {"_id": vc_doc["_id"]},
-            {
-                "$set": {
-                    "active": vc_doc["active"],
-                    "left": vc_doc["left"],
-                    "time_in_vc": vc_doc["time_in_vc"],
-                    "time_muted": vc_doc["time_muted"],
-                    "time_deafened": vc_doc["time_deafened"],
-                    "time_streaming": vc_doc["time_streaming"],
-                    "events": vc_doc["events"]
-                }
-            }
-        )
 
     async def toggle_statuses(
         self,
@@ -134,85 +91,29 @@ class OnVoiceStateChange(BaseEvent):
     ):
         """Toggles the mute/deafened/streaming statuses for a VC interaction
 
+        This only changes the session in memory - the changes get written to the DB at the next checkpoint or
+        when the user leaves.
+
         Args:
             member (discord.Member): member object
             before (discord.VoiceState): voice state object
             after (discord.VoiceState): voice state object
         """
+        key = (after.channel.guild.id, member.id, after.channel.id)
+        for status in self.sessions.toggle(key, after, datetime.datetime.now()):
+            self.logger.info(f"Toggling {status} status for {member.id} in {after.channel.id}")
 
-        now = datetime.datetime.now()
-        vc_doc = self.user_interactions.find_active_voice_state(
-            before.channel.guild.id,
-            member.id,
-            before.channel.id,
-            now
-        )
-
-        if before.self_mute != after.self_mute:
-            self.logger.info(f"Toggling mute status for {member.id} in {after.channel.id}")
-
-            vc_doc["muted"] = after.self_mute
-
-            if not after.self_mute:
-                vc_doc["time_muted"] = (now - vc_doc["muted_time"]).total_seconds()
-                vc_doc["muted_time"] = None
-            elif after.self_mute:
-                vc_doc["muted_time"] = now
-
-            vc_doc["events"].append(
-                {"timestamp": now, "event": "muted" if after.self_mute else "unmuted"}
-            )
-
-        if before.self_deaf != after.self_deaf:
-
-            self.logger.info(f"Toggling deaf status for {member.id} in {after.channel.id}")
-
-            vc_doc["deafened"] = after.self_deaf
-
-            if not after.self_deaf:
-                vc_doc["time_deafened"] = (now - vc_doc["deafened_time"]).total_seconds()
-                vc_doc["deafened_time"] = None
-            elif after.self_deaf:
-                vc_doc["deafened_time"] = now
-
-            vc_doc["events"].append(
-                {"timestamp": now, "event": "deafened" if after.self_deaf else "undeafened"}
-            )
-
-        if before.self_stream != after.self_stream:
-
-            self.logger.info(f"Toggling stream status for {member.id} in {after.channel.id}")
-
-            vc_doc["streaming"] = after.self_stream
-
-            if not after.self_stream:
-                vc_doc["time_streaming"] = (now - vc_doc["streaming_time"]).total_seconds()
-                vc_doc["streaming_time"] = None
-            elif after.self_stream:
-                vc_doc["streaming_time"] = now
-
-            vc_doc["events"].append(
-                {"timestamp": now, "event": "streaming" if after.self_stream else "unstreaming"}
+    async def restore_sessions(self) -> None:
+        """
+        Rebuilds the voice sessions from the guilds' current voice states.
+        Called when we're ready, to pick up anything that happened while we weren't listening.
+        """
+        for guild_id in self.guild_ids:
+            guild = self.client.get_guild(guild_id)  # type: discord.Guild
+            if guild is None:
+                continue
+            counts = self.sessions.restore(guild)
+            self.logger.info(
+                f"Restored voice sessions for {guild_id}: resumed {counts['resumed']}, closed {counts['closed']} "
+                f"and started {counts['started']}"
             )
-
-            if "vc_streaming" not in vc_doc["message_type"]:
-                vc_doc["message_type"].append("vc_streaming")
-
-        self.user_interactions.update(
-            {"_id": vc_doc["_id"]},
-            {
-                "$set": {
-                    "muted": vc_doc["muted"],
-                    "time_muted": vc_doc["time_muted"],
-                    "muted_time": vc_doc["muted_time"],
-                    "deafened": vc_doc["deafened"],
-                    "time_deafened": vc_doc["time_deafened"],
-                    "deafened_time": vc_doc["deafened_time"],
-                    "streaming": vc_doc["streaming"],
-                    "time_streaming": vc_doc["time_streaming"],
-                    "streaming_time": vc_doc["streaming_time"],
-                    "events": vc_doc["events"],
-                    "message_type": vc_doc["message_type"],
-                }
-            }
-        )
@@ -7,6 +7,7 @@ import logging
 import discord
 from apis.giphyapi import GiphyAPI
 from mongo.bsepoints import UserBets, UserPoints
+from mongo.profiler import QueryProfiler
 
 # client events
 from discordbot.clienteventclasses import OnDirectMessage, OnEmojiCreate, OnMemberJoin, OnMemberLeave
@@ -15,11 +16,14 @@ from discordbot.clienteventclasses import OnThreadCreate, OnThreadUpdate, OnVoic
 
 from discordbot.constants import BSE_SERVER_ID
 from discordbot.embedmanager import EmbedManager
+from discordbot.metrics import MetricsServer, get_metrics
 from discordbot.modals import BSEddiesBetCreateModal
+from discordbot.scheduler import get_scheduler
 
 # slash commands
 from discordbot.slashcommandeventclasses import BSEddiesActive, BSEddiesAdminGive, BSEddiesAutoGenerate
 from discordbot.slashcommandeventclasses import BSEddiesCloseBet, BSEddiesGift, BSEddiesHighScore, BSEddiesLeaderboard
+from discordbot.slashcommandeventclasses import BSEddiesMetrics
 from discordbot.slashcommandeventclasses import BSEddiesPending, BSEddiesPlaceBet, BSEddiesPredict, BSEddiesTaxRate
 from discordbot.slashcommandeventclasses import BSEddiesTransactionHistory, BSEddiesView, BSEddiesStats
 
@@ -34,6 +38,7 @@ from discordbot.tasks.eddiekingtask import BSEddiesKingTask
 from discordbot.tasks.monthlyawards import MonthlyBSEddiesAwards
 from discordbot.tasks.revolutiontask import BSEddiesRevolutionTask
 from discordbot.tasks.threadmutetask import ThreadSpoilerTask
+from discordbot.tasks.voicecheckpoint import VoiceSessionCheckpoint
 from discordbot.tasks.wordlereminder import WordleReminder
 from discordbot.tasks.wordletask import WordleTask
 
@@ -51,7 +56,9 @@ class CommandManager(object):
         client: discord.Bot,
         guilds: list,
         logger: logging.Logger,
-        giphy_token: str = None
+        giphy_token: str = None,
+        metrics_port: int = None,
+        profile_threshold_ms: int = None
     ) -> None:
         """
         Constructor method. This does all the work in this class and no other methods need to be called.
@@ -78,6 +85,8 @@ class CommandManager(object):
         :param logger:  logger object for logging
         :param debug_mode: whether we're in debug mode or not
         :param giphy_token:
+        :param metrics_port: local port to serve the metrics on in the Prometheus format - not served if None
+        :param profile_threshold_ms: profiles the DB operations, logging ones slower than this - not profiled if None
         """
 
         self.client = client
@@ -85,9 +94,23 @@ class CommandManager(object):
         self.logger = logger
         self.giphy_token = giphy_token
 
+        # records how long the events, commands, tasks and DB calls take
+        self.metrics = get_metrics()
+        self.metrics_server = MetricsServer(self.metrics, self.logger, metrics_port) if metrics_port else None
+
         self.embeds = EmbedManager(self.logger)
 
-        self.giphyapi = GiphyAPI(self.giphy_token)
+        self.giphyapi = GiphyAPI(self.giphy_token, logger=self.logger)
+
+        # runs the tasks that happen at set times - the tasks register their jobs with it
+        self.scheduler = get_scheduler(client, self.logger)
+
+        # finds the slow DB operations and where they're coming from
+        self.profiler = None
+        if profile_threshold_ms is not None:
+            self.profiler = QueryProfiler(self.logger, threshold=profile_threshold_ms / 1000)
+            self.profiler.start()
+            self.scheduler.register("mongo_profile_report", "0 * * * *", self._log_mongo_profile, catch_up=False)
 
         # mongo interaction classes
         self.user_points = UserPoints()
@@ -124,13 +147,17 @@ class CommandManager(object):
         self.bseddies_autogenerate = BSEddiesAutoGenerate(client, guilds, self.logger)
         self.bseddies_tax_rate = BSEddiesTaxRate(client, guilds, self.logger)
         self.bseddies_stats = BSEddiesStats(client, guilds, self.logger)
+        self.bseddies_metrics = BSEddiesMetrics(client, guilds, self.logger)
 
         # tasks
         self.bet_closer_task = BetCloser(self.client, guilds, self.logger, self.bseddies_place, self.bseddies_close)
         self.bet_reminder_task = BetReminder(self.client, guilds, self.logger)
         self.eddie_gain_message_task = EddieGainMessager(self.client, guilds, self.logger)
         self.eddie_king_task = BSEddiesKingTask(self.client, guilds, self.logger)
-        self.revolution_task = BSEddiesRevolutionTask(self.client, guilds, self.logger, self.giphy_token)
+        self.revolution_task = BSEddiesRevolutionTask(self.client, guilds, self.logger, self.giphyapi)
+        self.voice_checkpoint_task = VoiceSessionCheckpoint(
+            self.client, guilds, self.logger, self.on_voice_state_change.sessions
+        )
 
         if BSE_SERVER_ID in self.guilds:
             self.thread_task = ThreadSpoilerTask(self.client, guilds, self.logger)
@@ -144,6 +171,7 @@ class CommandManager(object):
         # call the methods that register the events we're listening for
         self._register_client_events()
         self._register_slash_commands(guilds)
+        self._hook_client_close()
 
     # noinspection PyProtectedMember
     def __get_cached_messages_list(self) -> list:
@@ -155,15 +183,45 @@ class CommandManager(object):
         cached = [d.id for d in deque]
         return cached
 
+    def _hook_client_close(self) -> None:
+        """
+        Makes the client's close also close the connections we hold open - there's no event for the client closing
+        :return: None
+        """
+        client_close = self.client.close
+
+        async def close() -> None:
+            await self.giphyapi.close()
+            if self.metrics_server is not None:
+                await self.metrics_server.stop()
+            await client_close()
+
+        self.client.close = close
+
+    async def _log_mongo_profile(self) -> None:
+        """
+        Logs the DB operations that have taken the most time in the last hour
+        :return: None
+        """
+        self.profiler.log_report()
+
+    def _event(self, coro):
+        """
+        Registers a client event, recording how long it takes to handle
+        :param coro: the event coroutine
+        :return: the wrapped coroutine
+        """
+        return self.client.event(self.metrics.timed("event", coro.__name__)(coro))
+
     def _register_client_events(self) -> None:
         """
         This method registers all the 'client events'.
         Client Events are normal discord events that we can listen to.
         A full list of events can be found here: https://docs.pycord.dev/en/stable/api.html#event-reference
 
-        Each event must be it's own async method with a @self.client.event decorator so that it's actually
-        registered. None of these methods defined here will ever be called manually by anyone. The methods are called
-        by the CLIENT object and that will pass in all the required parameters.
+        Each event must be it's own async method with a @self._event decorator so that it's actually
+        registered (and timed). None of these methods defined here will ever be called manually by anyone.
+        The methods are called by the CLIENT object and that will pass in all the required parameters.
 
         Additionally, the method is called automatically from this class' constructor and shouldn't be called anywhere
         else.
@@ -171,15 +229,26 @@ class CommandManager(object):
         :return: None
         """
 
-        @self.client.event
+        # slash commands are timed from when they're invoked to when they complete
+        self.client.add_listener(self.metrics.command_started, "on_application_command")
+        self.client.add_listener(self.metrics.command_completed, "on_application_command_completion")
+        self.client.add_listener(self.metrics.command_errored, "on_application_command_error")
+
+        @self._event
         async def on_ready():
             """
             Event that handles when we're 'ready'
             :return:
             """
             await self.on_ready.on_ready()
-
-        @self.client.event
+            self.giphyapi.prefetch([self.direct_message.thanks_gif_tag, self.direct_message.rude_gif_tag])
+            await self.on_voice_state_change.restore_sessions()
+            self.scheduler.start()
+            self.metrics.start_lag_monitor()
+            if self.metrics_server is not None:
+                await self.metrics_server.start()
+
+        @self._event
         async def on_member_join(member: discord.Member):
             """
             Event that's called when a new member joins the guild.
@@ -188,7 +257,7 @@ class CommandManager(object):
             """
             self.on_member_join.on_join(member)
 
-        @self.client.event
+        @self._event
         async def on_member_remove(member: discord.Member):
             """
             Event that's called when a member leaves the guild.
@@ -197,7 +266,7 @@ class CommandManager(object):
             """
             self.on_member_leave.on_leave(member)
 
-        @self.client.event
+        @self._event
         async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
             """
             This event catches EVERY reaction event on every message in the server.
@@ -232,7 +301,7 @@ class CommandManager(object):
 
             await self.on_reaction_add.handle_reaction_event(message, guild, channel, payload.emoji.name, user)
 
-        @self.client.event
+        @self._event
         async def on_reaction_add(reaction: discord.Reaction, user: discord.User):
             """
             This event is triggered when anyone 'reacts' to a message in a guild that the bot is in - even it's own
@@ -252,7 +321,7 @@ class CommandManager(object):
                 user
             )
 
-        @self.client.event
+        @self._event
         async def on_thread_create(thread: discord.Thread):
             """
 
@@ -261,7 +330,7 @@ class CommandManager(object):
             """
             await self.on_thread_create.on_thread_create(thread)
 
-        @self.client.event
+        @self._event
         async def on_thread_update(before: discord.Thread, after: discord.Thread):
             """
 
@@ -272,7 +341,7 @@ class CommandManager(object):
 
             await self.on_thread_update.on_update(before, after)
 
-        @self.client.event
+        @self._event
         async def on_message(message: discord.Message):
             """
             This is the 'message' event. Whenever a message is sent in a guild that the bot is listening for -
@@ -290,7 +359,7 @@ class CommandManager(object):
 
             await self.on_message.message_received(message)
 
-        @self.client.event
+        @self._event
         async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent):
             """Raw event for message edit events.
 
@@ -307,7 +376,7 @@ class CommandManager(object):
             message = await channel.fetch_message(payload.message_id)
             await self.on_message_edit.message_edit(None, message)
 
-        @self.client.event
+        @self._event
         async def on_message_edit(before: discord.Message, after: discord.Message):
             """Listens to the on_message_edit event
 
@@ -317,7 +386,7 @@ class CommandManager(object):
             """
             await self.on_message_edit.message_edit(before, after)
 
-        @self.client.event
+        @self._event
         async def on_guild_emojis_update(
             guild: discord.Guild,
             before: discord.Sequence[discord.Emoji],
@@ -333,7 +402,7 @@ class CommandManager(object):
             """
             await self.on_emoji_create.on_emojis_update(guild.id, before, after)
 
-        @self.client.event
+        @self._event
         async def on_guild_stickers_update(
             guild: discord.Guild,
             before: discord.Sequence[discord.Sticker],
@@ -349,7 +418,7 @@ class CommandManager(object):
             """
             await self.on_sticker_create.on_stickers_update(guild.id, before, after)
 
-        @self.client.event
+        @self._event
         async def on_voice_state_update(
             member: discord.Member,
             before: discord.VoiceState,
@@ -547,3 +616,12 @@ class CommandManager(object):
                 ctx (discord.ApplicationContext): _description_
             """
             await self.bseddies_stats.replay(ctx, 2022)
+
+        @self.client.command(description="View the bot's performance metrics")
+        async def metrics(ctx: discord.ApplicationContext):
+            """
+            Slash command for viewing where the bot's spending its time - admin only
+            :param ctx:
+            :return:
+            """
+            await self.bseddies_metrics.metrics_summary(ctx)
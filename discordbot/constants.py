@@ -2,6 +2,8 @@
 This file is for static variables throughout the project.
 """
 
+import os
+
 SLOMAN_SERVER_ID = 291508460519161856
 BSE_SERVER_ID = 181098823228063764
 BSE_BOT_ID = 809505325505576971
@@ -161,4 +163,11 @@ AWS_GAME_SERVER_INSTANCE = "i-04bb3a992e54b1b6f"
 MONTHLY_AWARDS_PRIZE = 100
 ANNUAL_AWARDS_AWARD = 500
 
+# max number of seconds we allow the stats / awards computation to take
+MONTHLY_AWARDS_TIME_BUDGET = 15 * 60
+ANNUAL_AWARDS_TIME_BUDGET = 60 * 60
+# whether to spread the annual stats across a process pool - on by default wherever there's more than one core
+# on a single core the spawned workers only add overhead (`python -m benchmarks.parallelstats` is ~2x slower)
+ANNUAL_AWARDS_PARALLEL = (os.cpu_count() or 1) > 1
+
 WORDLE_REGEX = r"Wordle \d?\d\d\d [\dX]/\d\n\n"
@@ -0,0 +1,135 @@
+import asyncio
+import dataclasses
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import discord
+
+from discordbot.metrics import get_metrics
+
+
+_QUEUES: Dict[int, "DMQueue"] = {}
+
+
+@dataclasses.dataclass
+class QueuedDM:
+    guild_id: int
+    user_id: int
+    content: str
+    key: Tuple[int, str]
+    enqueued: float
+
+
+class DMQueue:
+    """
+    Shared outbound queue for direct messages
+
+    Commands and tasks enqueue their DMs and carry on straight away. A small pool of workers sends them in the
+    background, so at most `max_concurrency` DM requests are in flight at once. py-cord already waits out the
+    per-route rate limit buckets (and retries 429s) for us - bounding the concurrency just stops a big fan-out,
+    like closing a bet with lots of betters, from draining the buckets for everything else the bot does.
+
+    Members are resolved from the gateway cache and only fetched via the REST API if they're not there.
+    The same message to the same user is only queued once while it's still waiting to be sent.
+    What happens to each DM, and how long the sent ones waited, is recorded in the shared metrics registry.
+    """
+    def __init__(self, client: discord.Client, logger, max_concurrency: int = 3):
+        """
+        :param client: the discord client
+        :param logger: logger
+        :param max_concurrency: max number of DMs to be sending at once
+        """
+        self.client = client
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Set[Tuple[int, str]] = set()
+        self.metrics = get_metrics()
+
+    def _record(self, outcome: str) -> None:
+        self.metrics.inc("bsebot_dm_total", {"outcome": outcome})
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    def enqueue(self, guild_id: int, user_id: int, content: str, dedupe_key: str = None) -> bool:
+        """
+        Queues a DM to be sent to the given user. Needs to be called from within the event loop.
+
+        :param guild_id: the guild the user is in - used to look them up in the cache
+        :param user_id: the user to DM
+        :param content: the message to send
+        :param dedupe_key: key to dedupe on instead of the content
+        :return: whether the message was queued (False if it's a duplicate of one that's still queued)
+        """
+        key = (user_id, dedupe_key if dedupe_key is not None else content)
+        if key in self._pending:
+            self._record("deduped")
+            return False
+
+        if self._queue is None:
+            self._start()
+
+        self._pending.add(key)
+        self._queue.put_nowait(QueuedDM(guild_id, user_id, content, key, time.perf_counter()))
+        self._record("enqueued")
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            dm = await self._queue.get()
+            try:
+                await self._deliver(dm)
+            except Exception:
+                self._record("failed")
+                self.logger.exception(f"Unexpected error sending DM to {dm.user_id}")
+            finally:
+                self._pending.discard(dm.key)
+                self._queue.task_done()
+
+    async def _resolve(self, guild_id: int, user_id: int) -> Union[discord.Member, discord.User]:
+        guild = self.client.get_guild(guild_id)
+        if guild is not None and (member := guild.get_member(user_id)) is not None:
+            return member
+        if (user := self.client.get_user(user_id)) is not None:
+            return user
+        self._record("rest_lookup")
+        return await self.client.fetch_user(user_id)
+
+    async def _deliver(self, dm: QueuedDM) -> None:
+        try:
+            member = await self._resolve(dm.guild_id, dm.user_id)
+            if not member.dm_channel:
+                await member.create_dm()
+            await member.send(content=dm.content)
+        except discord.Forbidden:
+            # user doesn't accept DMs from us
+            self._record("forbidden")
+            self.logger.info(f"Couldn't DM {dm.user_id} - {dm.content}")
+            return
+        except discord.NotFound:
+            self._record("not_found")
+            self.logger.info(f"Couldn't find {dm.user_id} to DM them")
+            return
+        except discord.HTTPException as e:
+            self._record("failed")
+            self.logger.warning(f"Failed to DM {dm.user_id}: {e.status} {e.text}")
+            return
+
+        self._record("sent")
+        self.metrics.observe("bsebot_dm_latency_seconds", value=time.perf_counter() - dm.enqueued)
+
+
+def get_dm_queue(client: discord.Client, logger) -> DMQueue:
+    """
+    Gets the shared DM queue for the client, creating it the first time it's asked for
+    :param client: the discord client
+    :param logger: logger
+    :return: the DMQueue
+    """
+    if id(client) not in _QUEUES:
+        _QUEUES[id(client)] = DMQueue(client, logger)
+    return _QUEUES[id(client)]
@@ -3,12 +3,12 @@ from typing import Optional, Union
 
 import discord
 
-from mongo.bsepoints import UserPoints
+from discordbot.leaderboard import get_leaderboard_cache
 
 
 class EmbedManager(object):
     def __init__(self, logger):
-        self.user_points = UserPoints()
+        self.leaderboards = get_leaderboard_cache()
         self.logger = logger
 
     @staticmethod
@@ -54,6 +54,13 @@ class EmbedManager(object):
 
         return embed
 
+    def _get_board_message(self, guild: discord.Guild, key: str, number: Union[int, None], username: Optional[str]):
+        message = self.leaderboards.get(guild.id).render(guild, key, number)
+        message += (
+            f"\n\nLast refreshed at `{datetime.datetime.now().strftime('%d %b %y %H:%M:%S')}` by _{username}_."
+        )
+        return message
+
     def get_leaderboard_embed(self, guild: discord.Guild, number: Union[int, None], username: Optional[str]):
         """
         Return a str that will be the leaderboard table
@@ -61,33 +68,7 @@ class EmbedManager(object):
         :param number:
         :return:
         """
-        users = self.user_points.get_all_users_for_guild(guild.id)
-
-        users = sorted(users, key=lambda x: x["points"], reverse=True)
-
-        if number is None:
-            number = len(users)
-        else:
-            number = number if number < len(users) else len(users)
-
-        users = [user for user in users if user["points"] != 10 and not user.get("inactive")]
-
-        message = (
-            "**BSEddies Leaderboard**\n"
-        )
-
-        for user in users[:number]:
-            try:
-                name = guild.get_member(user["uid"]).name
-            except AttributeError:
-                continue
-            message += f"\n**{users.index(user) + 1})**  {name}  :  {user['points']}"
-
-        message += (
-            f"\n\nLast refreshed at `{datetime.datetime.now().strftime('%d %b %y %H:%M:%S')}` by _{username}_."
-        )
-
-        return message
+        return self._get_board_message(guild, "points", number, username)
 
     def get_highscore_embed(self, guild: discord.Guild, number: Union[int, None], username: Optional[str]):
         """
@@ -96,33 +77,7 @@ class EmbedManager(object):
         :param number:
         :return:
         """
-        users = self.user_points.get_all_users_for_guild(guild.id)
-
-        users = sorted(users, key=lambda x: x.get("high_score", 0), reverse=True)
-
-        if number is None:
-            number = len(users)
-        else:
-            number = number if number < len(users) else len(users)
-
-        users = [user for user in users if user["points"] != 10 and not user.get("inactive")]
-
-        message = (
-            "**BSEddies High Scores**\n"
-        )
-
-        for user in users[:number]:
-            try:
-                name = guild.get_member(user["uid"]).name
-            except AttributeError:
-                continue
-            message += f"\n**{users.index(user) + 1})**  {name}  :  {user.get('high_score', 0)}"
-
-        message += (
-            f"\n\nLast refreshed at `{datetime.datetime.now().strftime('%d %b %y %H:%M:%S')}` by _{username}_."
-        )
-
-        return message
+        return self._get_board_message(guild, "high_score", number, username)
 
     @staticmethod
     def get_revolution_message(king_user: discord.User, role: discord.Role, event: dict, guild: discord.Guild):
@@ -0,0 +1,88 @@
+import asyncio
+import dataclasses
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+
+from discordbot.metrics import get_metrics
+
+
+# the default number of guilds a task can be working on at once
+GUILD_CONCURRENCY = 3
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class GuildTimings:
+    runs: int = 0
+    failures: int = 0
+    last: float = 0.0
+    """How long the last run took, in seconds"""
+    max: float = 0.0
+    total: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.runs if self.runs else 0.0
+
+
+class GuildRunner:
+    """
+    Runs a task's work for each guild concurrently
+
+    At most `max_concurrency` guilds are processed at once, so one slow guild (or one that's waiting on the REST API)
+    doesn't hold up the others. An exception for one guild is logged and doesn't stop the rest.
+    How long each guild takes is recorded in `timings`.
+    """
+    def __init__(self, name: str, logger, max_concurrency: int = GUILD_CONCURRENCY):
+        """
+        :param name: the name of the task - used for logging
+        :param logger: logger
+        :param max_concurrency: max number of guilds to process at once
+        """
+        self.name = name
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+        self.timings: Dict[int, GuildTimings] = {}
+        self.metrics = get_metrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_guild(self, guild_id: int, func: Callable[[int], Awaitable[T]]) -> Optional[T]:
+        timings = self.timings.setdefault(guild_id, GuildTimings())
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                return await func(guild_id)
+            except Exception:
+                timings.failures += 1
+                self.metrics.inc("bsebot_task_guild_errors_total", {"task": self.name, "guild": guild_id})
+                self.logger.exception(f"{self.name} failed for {guild_id}")
+                return None
+            finally:
+                duration = time.perf_counter() - start
+                timings.runs += 1
+                timings.last = duration
+                timings.max = max(timings.max, duration)
+                timings.total += duration
+                self.metrics.observe("bsebot_task_guild_seconds", {"task": self.name, "guild": guild_id}, duration)
+
+    async def run(self, guild_ids: Iterable[int], func: Callable[[int], Awaitable[T]]) -> Dict[int, Optional[T]]:
+        """
+        Calls the function for each guild, with up to `max_concurrency` running at once
+        :param guild_ids: the guilds to run for
+        :param func: async function that takes a guild ID
+        :return: dict of guild ID to what the function returned - None if it raised an exception
+        """
+        guild_ids = list(guild_ids)
+        results = await asyncio.gather(*[self._run_guild(guild_id, func) for guild_id in guild_ids])
+        return dict(zip(guild_ids, results))
+
+    def summary(self) -> Dict[int, dict]:
+        """
+        Gets the timings for each guild
+        :return: dict of guild ID to the number of runs and failures and the last, max and mean duration
+        """
+        return {
+            guild_id: {**dataclasses.asdict(timings), "mean": timings.mean}
+            for guild_id, timings in self.timings.items()
+        }
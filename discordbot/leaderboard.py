@@ -0,0 +1,203 @@
+"""
+In-memory leaderboards for each guild
+
+The leaderboard and high score messages used to get every user in the guild from the DB and sort them every time
+they were shown - including every time someone clicked "Expand". Here each guild's users are loaded once, kept sorted
+and then kept current with UserPoints' points listener: a change only marks the user as stale and the next time the
+guild's leaderboard is needed just the stale users are read back from the DB.
+"""
+
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+
+import discord
+
+from mongo.bsepoints import UserPoints
+from mongo.datatypes import User
+
+
+# the fields each board is sorted on, mapped to the title of its message
+BOARDS = {
+    "points": "**BSEddies Leaderboard**",
+    "high_score": "**BSEddies High Scores**",
+}
+
+_LEADERBOARDS: Optional["LeaderboardCache"] = None
+
+
+class RankedScores:
+    """
+    A board of scores, kept sorted highest first so that a user's rank is a binary search
+    """
+    def __init__(self):
+        self._keys: List[Tuple[int, int]] = []
+        self._scores: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, user_id: int, score: Optional[int]) -> None:
+        """
+        Sets a user's score
+        :param user_id: the user ID
+        :param score: their score - or None to take them off the board
+        :return: None
+        """
+        if (old := self._scores.pop(user_id, None)) is not None:
+            del self._keys[bisect.bisect_left(self._keys, (-old, user_id))]
+        if score is not None:
+            self._scores[user_id] = score
+            bisect.insort(self._keys, (-score, user_id))
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """
+        Gets a user's position on the board
+        :param user_id: the user ID
+        :return: their position, starting from 1, or None if they're not on the board
+        """
+        if (score := self._scores.get(user_id)) is None:
+            return None
+        return bisect.bisect_left(self._keys, (-score, user_id)) + 1
+
+    def score(self, user_id: int) -> Optional[int]:
+        return self._scores.get(user_id)
+
+    def top(self, number: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Gets the top of the board
+        :param number: the number of users to get - all of them if None
+        :return: list of (user ID, score) tuples, highest first
+        """
+        keys = self._keys if number is None else self._keys[:number]
+        return [(user_id, -score) for score, user_id in keys]
+
+
+class GuildLeaderboard:
+    """
+    The boards for a single guild, along with the rendered text for them
+    """
+    def __init__(self, guild_id: int, user_points: UserPoints):
+        self.guild_id = guild_id
+        self.user_points = user_points
+        self.boards: Dict[str, RankedScores] = {key: RankedScores() for key in BOARDS}
+
+        self._loaded = False
+        self._stale: Set[int] = set()
+        self._rendered: Dict[Tuple[str, Optional[int]], str] = {}
+
+    def mark_changed(self, user_id: Optional[int]) -> None:
+        """
+        Marks a user as needing to be read back from the DB
+        :param user_id: the user ID - or None to reload the whole guild
+        :return: None
+        """
+        if user_id is None:
+            self._loaded = False
+        else:
+            self._stale.add(user_id)
+
+    def _set_user(self, user: User) -> None:
+        # users that haven't done anything yet and users that have left aren't on the boards
+        eligible = user["points"] != 10 and not user.get("inactive")
+        for key, board in self.boards.items():
+            board.set(user["uid"], user.get(key, 0) if eligible else None)
+
+    def refresh(self) -> None:
+        """
+        Brings the boards up to date - loads everyone the first time and just the stale users after that
+        :return: None
+        """
+        projection = {"uid": True, "points": True, "high_score": True, "inactive": True}
+        if not self._loaded:
+            self.boards = {key: RankedScores() for key in BOARDS}
+            self._stale.clear()
+            users = self.user_points.get_all_users_for_guild(self.guild_id, projection=projection)
+        elif self._stale:
+            stale, self._stale = self._stale, set()
+            users = self.user_points.query(
+                {"guild_id": self.guild_id, "uid": {"$in": list(stale)}}, projection=projection
+            )
+            for user_id in stale.difference(user["uid"] for user in users):
+                for board in self.boards.values():
+                    board.set(user_id, None)
+        else:
+            return
+
+        for user in users:
+            self._set_user(user)
+        self._loaded = True
+        self._rendered.clear()
+
+    def rank(self, user_id: int, key: str = "points") -> Optional[int]:
+        """
+        Gets a user's position on one of the boards
+        :param user_id: the user ID
+        :param key: the board - "points" or "high_score"
+        :return: their position, starting from 1, or None if they're not on the board
+        """
+        self.refresh()
+        return self.boards[key].rank(user_id)
+
+    def score(self, user_id: int, key: str = "points") -> Optional[int]:
+        self.refresh()
+        return self.boards[key].score(user_id)
+
+    def render(self, guild: discord.Guild, key: str, number: Optional[int]) -> str:
+        """
+        Gets the text for one of the boards. The text is cached until someone on the board changes.
+        :param guild: the guild - used for the users' names
+        :param key: the board - "points" or "high_score"
+        :param number: the number of users to show - all of them if None
+        :return: the board's text
+        """
+        self.refresh()
+        if (text := self._rendered.get((key, number))) is not None:
+            return text
+
+        text = BOARDS[key] + "\n"
+        for rank, (user_id, score) in enumerate(self.boards[key].top(number), start=1):
+            if not (member := guild.get_member(user_id)):
+                continue
+            text += f"\n**{rank})**  {member.name}  :  {score}"
+
+        self._rendered[(key, number)] = text
+        return text
+
+
+class LeaderboardCache:
+    """
+    The leaderboards for every guild. Use `get_leaderboard_cache` to get the shared instance.
+    """
+    def __init__(self, user_points: UserPoints = None):
+        """
+        :param user_points: UserPoints instance to use - creates one if not given
+        """
+        self.user_points = user_points if user_points is not None else UserPoints()
+        self.guilds: Dict[int, GuildLeaderboard] = {}
+        UserPoints.add_points_listener(self._points_changed)
+
+    def _points_changed(self, guild_id: int, user_id: Optional[int]) -> None:
+        # guilds we haven't loaded yet will get everything when they're first asked for
+        if leaderboard := self.guilds.get(guild_id):
+            leaderboard.mark_changed(user_id)
+
+    def get(self, guild_id: int) -> GuildLeaderboard:
+        """
+        Gets the leaderboard for the guild, creating it the first time it's asked for
+        :param guild_id: the guild ID
+        :return: the GuildLeaderboard
+        """
+        if guild_id not in self.guilds:
+            self.guilds[guild_id] = GuildLeaderboard(guild_id, self.user_points)
+        return self.guilds[guild_id]
+
+
+def get_leaderboard_cache() -> LeaderboardCache:
+    """
+    Gets the shared leaderboard cache, creating it the first time it's asked for
+    :return: the LeaderboardCache
+    """
+    global _LEADERBOARDS
+    if _LEADERBOARDS is None:
+        _LEADERBOARDS = LeaderboardCache()
+    return _LEADERBOARDS
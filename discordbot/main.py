@@ -69,6 +69,8 @@ if __name__ == "__main__":
     TOKEN = dotenv.get_key(".env", "DISCORD_TOKEN")
     DEBUG_MODE = dotenv.get_key(".env", "DEBUG_MODE")
     GIPHY_TOKEN = dotenv.get_key(".env", "GIPHY_API_KEY")
+    METRICS_PORT = dotenv.get_key(".env", "METRICS_PORT")
+    MONGO_PROFILE_THRESHOLD_MS = dotenv.get_key(".env", "MONGO_PROFILE_THRESHOLD_MS")
 
     if TOKEN is None:
         exit(-1)
@@ -105,7 +107,14 @@ if __name__ == "__main__":
         max_messages=5000
     )
 
-    com = CommandManager(cli, IDS, logger, giphy_token=GIPHY_TOKEN)
+    com = CommandManager(
+        cli,
+        IDS,
+        logger,
+        giphy_token=GIPHY_TOKEN,
+        metrics_port=int(METRICS_PORT) if METRICS_PORT else None,
+        profile_threshold_ms=int(MONGO_PROFILE_THRESHOLD_MS) if MONGO_PROFILE_THRESHOLD_MS else None
+    )
 
     user_bets = UserBets(IDS)
 
@@ -0,0 +1,108 @@
+"""
+Works out the "type" of a message from its fields
+
+Everything here is pure - it only looks at the fields it's given and doesn't touch discord or the DB - so the same
+classification is used for new messages, edited messages and anything that needs to reclassify stored messages.
+The things that need a lookup (replies, custom stickers and custom emojis) are left to the caller, which gets the
+custom emoji IDs from the classification to check.
+"""
+
+import dataclasses
+import re
+from typing import Iterable, List, Optional
+
+from discordbot.wordle.parser import ParsedWordle, parse_wordle_message
+
+
+CUSTOM_EMOJI_PATTERN = re.compile(r"<:[a-zA-Z_0-9]*:(\d*)>")
+
+THANK_YOU_TERMS = ["thank you", "thanks", "ty", "cutie", "i love you"]
+BOT_THANKS_TERMS = ["thank you bot", "thank you bsebot", "thanks bot", "thanks bsebot", "ty bot", "ty bsebot"]
+
+# the terms have to be at the start of the message
+_THANK_YOU_PATTERN = re.compile(rf"\b(?:{'|'.join(THANK_YOU_TERMS)})\b")
+_BOT_THANKS_PATTERN = re.compile(rf"\b(?:{'|'.join(BOT_THANKS_TERMS)})\b")
+
+
+@dataclasses.dataclass
+class MessageClassification:
+    message_type: List[str]
+    """The message types that don't need any lookups"""
+    emoji_ids: List[int]
+    """The IDs of the custom emojis used in the message - once for every time they're used"""
+    wordle: Optional[ParsedWordle]
+    """The wordle result if the message is one"""
+
+
+def is_thank_you(content: str) -> bool:
+    """Whether the message starts by thanking someone
+
+    Args:
+        content (str): the message content
+
+    Returns:
+        bool: whether it does
+    """
+    return _THANK_YOU_PATTERN.match(content.lower()) is not None
+
+
+def is_bot_thanks(content: str) -> bool:
+    """Whether the message starts by thanking the bot
+
+    Args:
+        content (str): the message content
+
+    Returns:
+        bool: whether it does
+    """
+    return _BOT_THANKS_PATTERN.match(content.lower()) is not None
+
+
+def classify_message(
+    content: str,
+    author_id: int,
+    mention_ids: Iterable[int] = (),
+    role_mention_count: int = 0,
+    channel_mention_count: int = 0,
+    mention_everyone: bool = False,
+    has_attachments: bool = False,
+) -> MessageClassification:
+    """Classifies a message
+
+    Args:
+        content (str): the message content
+        author_id (int): the ID of the user that sent the message
+        mention_ids (Iterable[int]): the IDs of the users mentioned in the message
+        role_mention_count (int): the number of roles mentioned in the message
+        channel_mention_count (int): the number of channels mentioned in the message
+        mention_everyone (bool): whether the message mentions everyone
+        has_attachments (bool): whether the message has any attachments
+
+    Returns:
+        MessageClassification: the message types, custom emoji IDs and wordle result
+    """
+    message_type = []
+
+    if has_attachments:
+        message_type.append("attachment")
+
+    message_type.extend(["role_mention"] * role_mention_count)
+    message_type.extend(["channel_mention"] * channel_mention_count)
+    message_type.extend(["mention" for mention_id in mention_ids if mention_id != author_id])
+
+    if mention_everyone:
+        message_type.append("everyone_mention")
+
+    if "https://" in content or "http://" in content:
+        if ".gif" in content:
+            message_type.append("gif")
+        message_type.append("link")
+
+    message_type.append("message")
+
+    if wordle := parse_wordle_message(content):
+        message_type.append("wordle")
+
+    emoji_ids = [int(emoji_id) for emoji_id in CUSTOM_EMOJI_PATTERN.findall(content) if emoji_id]
+
+    return MessageClassification(message_type, emoji_ids, wordle)
@@ -0,0 +1,100 @@
+import collections
+import dataclasses
+from typing import Optional
+
+import discord
+
+from mongo.bsepoints import UserInteractions
+
+
+@dataclasses.dataclass(frozen=True)
+class ResolvedMessage:
+    message_id: int
+    author_id: int
+    channel_id: int
+
+
+class MessageResolver:
+    """
+    Works out who sent a message, and in which channel, from just the message ID
+
+    Replies only give us the ID of the message being replied to and it's often not in the client's message cache.
+    Rather than fetching the message via the REST API, we try (in order):
+     - the client's message cache
+     - our own LRU of messages we've already resolved or seen
+     - the userinteractions collection, which has every message we've received
+     - the REST API
+    """
+    def __init__(
+        self,
+        client: discord.Client,
+        logger,
+        user_interactions: UserInteractions = None,
+        max_size: int = 10000
+    ):
+        """
+        :param client: the discord client
+        :param logger: logger
+        :param user_interactions: UserInteractions instance to use - creates one if not given
+        :param max_size: max number of messages to keep in the LRU
+        """
+        self.client = client
+        self.logger = logger
+        self.user_interactions = user_interactions if user_interactions is not None else UserInteractions()
+        self.max_size = max_size
+
+        self._cache = collections.OrderedDict()  # type: collections.OrderedDict[int, ResolvedMessage]
+        self.stats = collections.Counter()  # type: collections.Counter[str]
+
+    def remember(self, message: discord.Message) -> None:
+        """
+        Adds a message to the LRU so that replies to it can be resolved without a lookup
+        :param message: the message
+        """
+        self._store(ResolvedMessage(message.id, message.author.id, message.channel.id))
+
+    def _store(self, resolved: ResolvedMessage) -> None:
+        self._cache[resolved.message_id] = resolved
+        self._cache.move_to_end(resolved.message_id)
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def resolve(self, guild_id: int, channel_id: int, message_id: int) -> Optional[ResolvedMessage]:
+        """
+        Resolves a message ID to its author and channel
+        :param guild_id: the guild ID the message is in
+        :param channel_id: the channel ID the message is in (only needed for REST lookups)
+        :param message_id: the message ID
+        :return: the resolved message or None if it no longer exists
+        """
+        if (message := self.client.get_message(message_id)) is not None:
+            self.stats["client_cache"] += 1
+            resolved = ResolvedMessage(message.id, message.author.id, message.channel.id)
+            self._store(resolved)
+            return resolved
+
+        if (resolved := self._cache.get(message_id)) is not None:
+            self.stats["lru"] += 1
+            self._cache.move_to_end(message_id)
+            return resolved
+
+        if (doc := self.user_interactions.get_message_author(guild_id, message_id)) is not None:
+            self.stats["db"] += 1
+            resolved = ResolvedMessage(message_id, doc["user_id"], doc["channel_id"])
+            self._store(resolved)
+            return resolved
+
+        self.stats["rest"] += 1
+        try:
+            channel = self.client.get_channel(channel_id)
+            if channel is None:
+                channel = await self.client.fetch_channel(channel_id)
+            message = await channel.fetch_message(message_id)
+        except (discord.NotFound, discord.errors.HTTPException):
+            # message was deleted
+            self.logger.debug(f"Couldn't resolve message {message_id} in {channel_id}")
+            return None
+
+        resolved = ResolvedMessage(message.id, message.author.id, message.channel.id)
+        self._store(resolved)
+        return resolved
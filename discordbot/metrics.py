@@ -0,0 +1,293 @@
+"""
+Metrics for where the bot spends its time
+
+Everything is recorded in one MetricsRegistry (see `get_metrics`):
+    - mongo operations, via the observer hook in mongo.interface
+    - client events and slash commands registered by CommandManager
+    - scheduled jobs and the per-guild work of the background tasks
+    - DMs sent through the DM queue
+    - event loop lag
+
+The registry can be rendered in the Prometheus text format - `MetricsServer` serves it on a local port - and
+summarised for the admin `/metrics` command.
+"""
+
+import asyncio
+import bisect
+import collections
+import functools
+import math
+import threading
+import time
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from mongo import interface
+
+
+# upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# descriptions of the metrics for the Prometheus output
+METRICS_HELP = {
+    "bsebot_mongo_operation_seconds": ("histogram", "Time taken by mongo operations"),
+    "bsebot_mongo_documents_total": ("counter", "Documents returned or affected by mongo operations"),
+    "bsebot_event_seconds": ("histogram", "Time taken handling client events"),
+    "bsebot_event_errors_total": ("counter", "Client event handlers that raised an exception"),
+    "bsebot_command_seconds": ("histogram", "Time taken handling slash commands"),
+    "bsebot_command_errors_total": ("counter", "Slash commands that raised an exception"),
+    "bsebot_task_guild_seconds": ("histogram", "Time taken by a background task for a guild"),
+    "bsebot_task_guild_errors_total": ("counter", "Background task runs for a guild that raised an exception"),
+    "bsebot_scheduled_job_seconds": ("histogram", "Time taken by scheduled jobs"),
+    "bsebot_scheduled_job_errors_total": ("counter", "Scheduled jobs that raised an exception"),
+    "bsebot_event_loop_lag_seconds": ("histogram", "How late the event loop was waking up"),
+    "bsebot_dm_total": ("counter", "DMs by what happened to them - enqueued, deduped, sent, forbidden, failed, etc"),
+    "bsebot_dm_latency_seconds": ("histogram", "Time from a DM being queued to it being sent"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_METRICS: Optional["MetricsRegistry"] = None
+
+
+class Histogram:
+    """
+    A latency histogram with cumulative buckets, plus the most recent samples for working out percentiles
+    """
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, samples: int = 1024):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples: Deque[float] = collections.deque(maxlen=samples)
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.buckets):
+            self.counts[idx] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.buckets, self.samples.maxlen)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        histogram.samples.extend(self.samples)
+        return histogram
+
+    def percentile(self, pct: float) -> float:
+        """
+        Gets a percentile of the recent samples
+        :param pct: the percentile, 0-100
+        :return: the value
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class MetricsRegistry:
+    """
+    Holds all the counters and histograms
+
+    Metrics are recorded from the event loop and from worker threads (the mongo observer is called in whichever
+    thread made the call) so everything that touches the counters and histograms holds the lock.
+    """
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = collections.defaultdict(float)
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._command_starts: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._lag_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _labels(labels: Optional[dict]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+    def inc(self, name: str, labels: dict = None, value: float = 1) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self.counters[key] += value
+
+    def observe(self, name: str, labels: dict = None, value: float = 0.0) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def timed(self, kind: str, name: str) -> Callable:
+        """
+        Decorator that records how long an async function takes and whether it raised
+        :param kind: what the function is - "event", "command", etc
+        :param name: the name to record it under
+        :return: the decorator
+        """
+        def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    self.inc(f"bsebot_{kind}_errors_total", {"name": name})
+                    raise
+                finally:
+                    self.observe(f"bsebot_{kind}_seconds", {"name": name}, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def observe_operation(self, operation: interface.Operation) -> None:
+        """
+        Records a mongo operation - registered as an observer with mongo.interface
+        :param operation: the operation
+        :return: None
+        """
+        labels = {"collection": operation.collection.name, "operation": operation.operation}
+        self.observe("bsebot_mongo_operation_seconds", labels, operation.duration)
+        if operation.documents is not None:
+            self.inc("bsebot_mongo_documents_total", labels, operation.documents)
+
+    async def command_started(self, ctx) -> None:
+        self._command_starts[ctx.interaction.id] = time.perf_counter()
+
+    def _command_finished(self, ctx) -> None:
+        if (start := self._command_starts.pop(ctx.interaction.id, None)) is not None:
+            name = ctx.command.qualified_name if ctx.command else "unknown"
+            self.observe("bsebot_command_seconds", {"name": name}, time.perf_counter() - start)
+
+    async def command_completed(self, ctx) -> None:
+        self._command_finished(ctx)
+
+    async def command_errored(self, ctx, error: Exception) -> None:
+        self._command_finished(ctx)
+        name = ctx.command.qualified_name if ctx.command else "unknown"
+        self.inc("bsebot_command_errors_total", {"name": name})
+
+    async def _measure_lag(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.observe("bsebot_event_loop_lag_seconds", value=max(0.0, loop.time() - start - interval))
+
+    def start_lag_monitor(self, interval: float = 1.0) -> None:
+        """
+        Starts measuring the event loop lag, if it's not already being measured.
+        Needs to be called from within the event loop.
+        :param interval: how often to measure it, in seconds
+        :return: None
+        """
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.create_task(self._measure_lag(interval))
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        labels = labels + extra
+        if not labels:
+            return ""
+        escaped = [(key, value.replace("\\", "\\\\").replace('"', '\\"')) for key, value in labels]
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def render(self) -> str:
+        """
+        Renders all the metrics in the Prometheus text format
+        :return: the text
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = {key: histogram.copy() for key, histogram in self.histograms.items()}
+
+        lines: List[str] = []
+        names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+        for name in names:
+            metric_type, description = METRICS_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f"{name}{self._format_labels(labels)} {value:g}")
+
+            for (histogram_name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if histogram_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._format_labels(labels, (('le', f'{bound:g}'), ))} {cumulative}")
+                lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'), ))} {histogram.count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, name: str, top: int = 10) -> List[Tuple[str, Histogram]]:
+        """
+        Gets the histograms for a metric with the most total time
+        :param name: the metric name
+        :param top: max number to return
+        :return: list of (label string, copy of the histogram), most total time first
+        """
+        with self._lock:
+            histograms = [
+                (", ".join(value for _, value in labels) or "-", histogram.copy())
+                for (histogram_name, labels), histogram in self.histograms.items()
+                if histogram_name == name
+            ]
+        return sorted(histograms, key=lambda item: item[1].sum, reverse=True)[:top]
+
+
+class MetricsServer:
+    """
+    Serves the metrics in the Prometheus text format on a local port
+    """
+    def __init__(self, registry: "MetricsRegistry", logger, port: int, host: str = "127.0.0.1"):
+        """
+        :param registry: the metrics registry
+        :param logger: logger
+        :param port: the port to listen on
+        :param host: the address to listen on - only local by default
+        """
+        self.registry = registry
+        self.logger = logger
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def start(self) -> None:
+        """
+        Starts serving /metrics, if we're not already
+        :return: None
+        """
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Gets the shared metrics registry, creating it (and hooking it into mongo.interface) the first time it's asked for
+    :return: the MetricsRegistry
+    """
+    global _METRICS
+    if _METRICS is None:
+        _METRICS = MetricsRegistry()
+        interface.add_observer(_METRICS.observe_operation)
+    return _METRICS
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Union
+
+import discord
+
+
+class DiscordObjectResolver:
+    """
+    Resolves discord object IDs into discord objects for a single guild
+
+    Objects are looked up in the gateway cache first and only fetched via the REST API if they're not there.
+    REST fetches are done concurrently with a limit on how many can be in flight at once.
+    Everything that's resolved is memoised so it's only ever looked up once per resolver.
+    """
+    def __init__(self, client: discord.Client, guild_id: int, logger, max_concurrency: int = 5):
+        """
+        :param client: the discord client
+        :param guild_id: the guild ID to resolve objects for
+        :param logger: logger
+        :param max_concurrency: max number of REST requests to make at once
+        """
+        self.client = client
+        self.guild_id = guild_id
+        self.logger = logger
+
+        self._guild = None  # type: Optional[discord.Guild]
+        # we memoise the futures rather than the objects so concurrent lookups of the same ID share a request
+        self._channels = {}  # type: Dict[int, asyncio.Future]
+        self._emojis = {}  # type: Dict[int, asyncio.Future]
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rest_calls = 0
+
+    async def get_guild(self) -> discord.Guild:
+        """
+        Gets the guild object
+        :return: the guild
+        """
+        if self._guild is None:
+            self._guild = self.client.get_guild(self.guild_id)
+        if self._guild is None:
+            self._guild = await self._fetch(self.client.fetch_guild(self.guild_id))
+        return self._guild
+
+    async def _fetch(self, coro):
+        async with self._semaphore:
+            self.rest_calls += 1
+            return await coro
+
+    @staticmethod
+    async def _memoised(cache: Dict[int, asyncio.Future], key: int, resolve):
+        if key not in cache:
+            cache[key] = asyncio.ensure_future(resolve(key))
+        return await cache[key]
+
+    async def get_text_channels(self) -> List[discord.abc.GuildChannel]:
+        """
+        Gets all the text channels in the guild
+        :return: list of channels
+        """
+        guild = await self.get_guild()
+        channels = guild.channels if guild.channels else await self._fetch(guild.fetch_channels())
+        channels = [c for c in channels if c.type in [discord.ChannelType.text, discord.ChannelType.private]]
+        loop = asyncio.get_running_loop()
+        for channel in channels:
+            if channel.id not in self._channels:
+                self._channels[channel.id] = loop.create_future()
+                self._channels[channel.id].set_result(channel)
+        return channels
+
+    async def get_channel(self, channel_id: int) -> Union[discord.abc.GuildChannel, discord.Thread, None]:
+        """
+        Gets a channel (or thread) by ID
+        :param channel_id: the channel ID
+        :return: the channel object or None if channel_id is None
+        """
+        if channel_id is None:
+            return None
+
+        return await self._memoised(self._channels, channel_id, self._resolve_channel)
+
+    async def _resolve_channel(self, channel_id: int) -> Union[discord.abc.GuildChannel, discord.Thread]:
+        guild = await self.get_guild()
+        channel = guild.get_channel_or_thread(channel_id)
+        if channel is None:
+            # archived threads and channels not in the cache
+            channel = await self._fetch(guild.fetch_channel(channel_id))
+        return channel
+
+    async def get_emoji(self, emoji_id: int) -> Optional[discord.Emoji]:
+        """
+        Gets a guild emoji by ID
+        :param emoji_id: the emoji ID
+        :return: the emoji object or None if emoji_id is None
+        """
+        if emoji_id is None:
+            return None
+
+        return await self._memoised(self._emojis, emoji_id, self._resolve_emoji)
+
+    async def _resolve_emoji(self, emoji_id: int) -> discord.Emoji:
+        emoji = self.client.get_emoji(emoji_id)
+        if emoji is None:
+            guild = await self.get_guild()
+            emoji = await self._fetch(guild.fetch_emoji(emoji_id))
+        return emoji
+
+    async def get_channels(self, channel_ids: Iterable[int]) -> List[Union[discord.abc.GuildChannel, discord.Thread]]:
+        """
+        Resolves multiple channels concurrently
+        :param channel_ids: the channel IDs
+        :return: the channel objects, in the same order as the IDs
+        """
+        # resolve the guild up front so concurrent lookups don't all try to fetch it
+        await self.get_guild()
+        return list(await asyncio.gather(*[self.get_channel(c_id) for c_id in channel_ids]))
+
+    async def get_emojis(self, emoji_ids: Iterable[int]) -> List[discord.Emoji]:
+        """
+        Resolves multiple emojis concurrently
+        :param emoji_ids: the emoji IDs
+        :return: the emoji objects, in the same order as the IDs
+        """
+        await self.get_guild()
+        return list(await asyncio.gather(*[self.get_emoji(e_id) for e_id in emoji_ids]))
@@ -0,0 +1,272 @@
+"""
+Central scheduler for the jobs that need to run at particular times
+
+Rather than each task waking up every few minutes to check the time, jobs are registered here with a cron-like spec
+and a single loop sleeps until the next one is due. The last time each job ran is stored in the DB so that a job
+that was missed because the bot was down (or busy) can be caught up when it comes back.
+
+Specs are five space separated fields - "minute hour day month weekday" - where each field is `*`, a number, a range
+(`1-5`), a list (`1,15`) or any of those with a step (`*/15`, `0-30/10`). Weekdays go from 0 (Monday) to 6 (Sunday),
+the same as `datetime.weekday()`. Unlike cron, when both the day and the weekday are given both of them have to match.
+Times are in the bot's local time.
+
+Usage:
+    scheduler = get_scheduler(client, logger)
+    scheduler.register("daily_eddies", "30 7 * * *", self.eddie_distributer)
+"""
+
+import asyncio
+import dataclasses
+import datetime
+import time
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional
+
+import discord
+
+from discordbot.metrics import get_metrics
+from mongo.bsedataclasses import ScheduledJobs
+
+
+_SCHEDULERS: Dict[int, "Scheduler"] = {}
+
+
+class CronSpec:
+    """
+    A parsed cron-like spec
+    """
+    # the allowed values for each field
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, spec: str):
+        """
+        :param spec: the spec, "minute hour day month weekday"
+        """
+        fields = spec.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expected five fields in spec: {spec}")
+
+        self.spec = spec
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._RANGES)
+        ]
+
+    def __repr__(self) -> str:
+        return f"CronSpec({self.spec!r})"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> FrozenSet[int]:
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = [int(value) for value in part.split("-", 1)]
+            else:
+                start = end = int(part)
+
+            if not low <= start <= end <= high:
+                raise ValueError(f"{field} isn't within {low}-{high}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return frozenset(values)
+
+    def matches(self, when: datetime.datetime) -> bool:
+        """
+        Whether the spec fires at the given minute
+        :param when: the time
+        :return: whether it matches
+        """
+        return (
+            when.minute in self.minutes
+            and when.hour in self.hours
+            and when.day in self.days
+            and when.month in self.months
+            and when.weekday() in self.weekdays
+        )
+
+    def next_after(self, when: datetime.datetime) -> datetime.datetime:
+        """
+        Works out the next time the spec fires
+        :param when: the time to start from
+        :return: the first matching minute after `when`
+        """
+        current = when.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        # the 29th of February can be up to 8 years away
+        limit = current + datetime.timedelta(days=366 * 8)
+
+        while current < limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1) + datetime.timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif current.day not in self.days or current.weekday() not in self.weekdays:
+                current = current.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + datetime.timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += datetime.timedelta(minutes=1)
+            else:
+                return current
+
+        raise ValueError(f"{self.spec} never fires")
+
+
+@dataclasses.dataclass
+class ScheduledJob:
+    name: str
+    spec: CronSpec
+    callback: Callable[[], Awaitable[None]]
+    catch_up: bool = True
+    """Whether to run the job when we come back if we missed a run"""
+    grace: Optional[datetime.timedelta] = None
+    """How late a missed run can be caught up - None for no limit"""
+    last_run: Optional[datetime.datetime] = None
+    next_run: Optional[datetime.datetime] = None
+    task: Optional[asyncio.Task] = None
+    """The task for the current run of the job"""
+
+    def plan(self, now: datetime.datetime) -> None:
+        """
+        Works out when the job should next run, catching up a missed run if it should be
+        :param now: the current time
+        :return: None
+        """
+        if self.catch_up and self.last_run is not None:
+            missed = self.spec.next_after(self.last_run)
+            if missed <= now and (self.grace is None or now - missed <= self.grace):
+                self.next_run = now
+                return
+        self.next_run = self.spec.next_after(now)
+
+
+class Scheduler:
+    """
+    Runs the registered jobs when they're due
+
+    Each run of a job is its own task, so a slow job doesn't hold up the others. If a job is still running when it's
+    next due, that run is skipped. The last run is stored before the job runs so that a job that fails part way
+    through isn't repeated.
+    """
+    def __init__(self, client: discord.Client, logger, store: ScheduledJobs = None, max_sleep: float = 60):
+        """
+        :param client: the discord client
+        :param logger: logger
+        :param store: ScheduledJobs instance to use - creates one if not given
+        :param max_sleep: the longest we sleep for before checking the time again, in seconds
+        """
+        self.client = client
+        self.logger = logger
+        self.store = store if store is not None else ScheduledJobs()
+        self.max_sleep = max_sleep
+        self.metrics = get_metrics()
+
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._last_runs: Optional[Dict[str, datetime.datetime]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def register(
+        self,
+        name: str,
+        spec: str,
+        callback: Callable[[], Awaitable[None]],
+        catch_up: bool = True,
+        grace: Optional[datetime.timedelta] = None
+    ) -> ScheduledJob:
+        """
+        Registers a job. Registering a job with the same name replaces it.
+        :param name: unique name of the job - used to store its last run
+        :param spec: the cron-like spec for when the job should run
+        :param callback: async function to call when the job is due
+        :param catch_up: whether to run the job when we come back if we missed a run
+        :param grace: how late a missed run can be caught up - None for no limit
+        :return: the job
+        """
+        job = ScheduledJob(name, CronSpec(spec), callback, catch_up, grace)
+        self.jobs[name] = job
+        if self._last_runs is not None:
+            job.last_run = self._last_runs.get(name)
+            job.plan(datetime.datetime.now())
+            self._wakeup.set()
+        return job
+
+    def unregister(self, name: str) -> None:
+        """
+        Removes a job. Doesn't stop a run that's already in progress.
+        :param name: the name of the job
+        :return: None
+        """
+        self.jobs.pop(name, None)
+
+    def start(self) -> None:
+        """
+        Starts the scheduler loop if it's not already running. Needs to be called from within the event loop.
+        :return: None
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _fire(self, job: ScheduledJob, now: datetime.datetime) -> None:
+        job.next_run = job.spec.next_after(now)
+
+        if job.task is not None and not job.task.done():
+            self.logger.warning(f"{job.name} is still running - skipping this run")
+            return
+
+        job.last_run = now
+        self._last_runs[job.name] = now
+        self.store.set_last_run(job.name, now)
+        job.task = asyncio.create_task(self._run_job(job))
+
+    async def _run_job(self, job: ScheduledJob) -> None:
+        self.logger.info(f"Running scheduled job {job.name}")
+        start = time.perf_counter()
+        try:
+            await job.callback()
+        except Exception:
+            self.metrics.inc("bsebot_scheduled_job_errors_total", {"name": job.name})
+            self.logger.exception(f"Scheduled job {job.name} failed")
+        finally:
+            self.metrics.observe("bsebot_scheduled_job_seconds", {"name": job.name}, time.perf_counter() - start)
+
+    async def _run(self) -> None:
+        await self.client.wait_until_ready()
+
+        self._last_runs = self.store.get_last_runs()
+        now = datetime.datetime.now()
+        for job in self.jobs.values():
+            job.last_run = self._last_runs.get(job.name)
+            job.plan(now)
+            self.logger.info(f"Scheduled {job.name} ({job.spec.spec}) for {job.next_run}")
+
+        while True:
+            self._wakeup.clear()
+            now = datetime.datetime.now()
+            for job in list(self.jobs.values()):
+                if job.next_run <= now:
+                    self._fire(job, now)
+
+            timeout = self.max_sleep
+            if self.jobs:
+                next_run = min(job.next_run for job in self.jobs.values())
+                timeout = min(max((next_run - datetime.datetime.now()).total_seconds(), 0), self.max_sleep)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+def get_scheduler(client: discord.Client, logger) -> Scheduler:
+    """
+    Gets the shared scheduler for the client, creating it the first time it's asked for
+    :param client: the discord client
+    :param logger: logger
+    :return: the Scheduler
+    """
+    if id(client) not in _SCHEDULERS:
+        _SCHEDULERS[id(client)] = Scheduler(client, logger)
+    return _SCHEDULERS[id(client)]
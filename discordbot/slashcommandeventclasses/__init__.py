@@ -10,6 +10,7 @@ from .gift import BSEddiesGift
 from .highscore import BSEddiesHighScore
 from .king import BSEddiesKing
 from .leaderboard import BSEddiesLeaderboard
+from .metrics import BSEddiesMetrics
 from .pending import BSEddiesPending
 from .place import BSEddiesPlaceBet
 from .predict import BSEddiesPredict
@@ -6,6 +6,7 @@ import discord
 import discordbot.views as views
 from discordbot.betmanager import BetManager
 from discordbot.bot_enums import TransactionTypes, ActivityTypes
+from discordbot.dmqueue import get_dm_queue
 from discordbot.slashcommandeventclasses import BSEddies
 
 
@@ -17,6 +18,7 @@ class BSEddiesCloseBet(BSEddies):
     def __init__(self, client, guilds, logger):
         super().__init__(client, guilds, logger)
         self.bet_manager = BetManager(logger)
+        self.dm_queue = get_dm_queue(client, logger)
 
     async def create_bet_view(
             self,
@@ -124,15 +126,10 @@ class BSEddiesCloseBet(BSEddies):
                         "comment": "User won their own bet when no-one else entered."
                     }
                 )
-                if not author.dm_channel:
-                    await author.create_dm()
-                try:
-                    msg = ("Looks like you were the only person to bet on your bet and you _happened_ to win it. "
-                           "As such, you have won **nothing**. However, you have been refunded the eddies that you "
-                           "originally bet.")
-                    await author.send(content=msg)
-                except discord.errors.Forbidden:
-                    pass
+                msg = ("Looks like you were the only person to bet on your bet and you _happened_ to win it. "
+                       "As such, you have won **nothing**. However, you have been refunded the eddies that you "
+                       "originally bet.")
+                self.dm_queue.enqueue(guild.id, author.id, msg)
 
                 desc = (f"**{bet['title']}**\n\nThere were no winners on this bet. {author.mention} just _happened_ "
                         f"to win a bet they created and they were the only entry. They were refunded the amount of "
@@ -158,34 +155,23 @@ class BSEddiesCloseBet(BSEddies):
         author = guild.get_member(ctx.user.id)
 
         # message the losers to tell them the bad news
+        # these are sent in the background by the DM queue so we don't hold up closing the bet
         for loser in ret_dict["losers"]:
-            mem = guild.get_member(int(loser))
-            if not mem.dm_channel:
-                await mem.create_dm()
-            try:
-                points_bet = ret_dict["losers"][loser]
-                msg = (f"**{author.name}** just closed bet "
-                       f"`[{bet_id}] - {bet['title']}` and the result was {emoji} "
-                       f"(`{ret_dict['outcome_name']['val']})`.\n"
-                       f"As this wasn't what you voted for - you have lost. You bet **{points_bet}** eddies.")
-                await mem.send(content=msg)
-            except discord.errors.Forbidden:
-                pass
+            points_bet = ret_dict["losers"][loser]
+            msg = (f"**{author.name}** just closed bet "
+                   f"`[{bet_id}] - {bet['title']}` and the result was {emoji} "
+                   f"(`{ret_dict['outcome_name']['val']})`.\n"
+                   f"As this wasn't what you voted for - you have lost. You bet **{points_bet}** eddies.")
+            self.dm_queue.enqueue(guild.id, int(loser), msg)
 
         # message the winners to tell them the good news
         for winner in ret_dict["winners"]:
-            mem = guild.get_member(int(winner))
-            if not mem.dm_channel:
-                await mem.create_dm()
-            try:
-                msg = (f"**{author.name}** just closed bet "
-                       f"`[{bet_id}] - {bet['title']}` and the result was {emoji} "
-                       f"(`{ret_dict['outcome_name']['val']})`.\n"
-                       f"**This means you won!!** "
-                       f"You have won `{ret_dict['winners'][winner]}` BSEDDIES!!")
-                await mem.send(content=msg)
-            except discord.errors.Forbidden:
-                pass
+            msg = (f"**{author.name}** just closed bet "
+                   f"`[{bet_id}] - {bet['title']}` and the result was {emoji} "
+                   f"(`{ret_dict['outcome_name']['val']})`.\n"
+                   f"**This means you won!!** "
+                   f"You have won `{ret_dict['winners'][winner]}` BSEDDIES!!")
+            self.dm_queue.enqueue(guild.id, int(winner), msg)
 
         # update the message to reflect that it's closed
         channel = guild.get_channel(bet["channel_id"])
@@ -159,7 +159,7 @@ class BSEddiesCreateBet(BSEddies):
 
         self.user_bets.update(
             {"_id": bet["_id"]},
-            {"$set": {"message_id": message.id, "channel_id": message.channel.id}}
+            {"$set": {"message_id": message.id, "channel_id": message.channel.id, "persistent_view": True}}
         )
 
         await ctx.followup.send(content="Created bet for you.", ephemeral=True)
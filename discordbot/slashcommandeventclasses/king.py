@@ -5,6 +5,7 @@ import discord
 from discordbot.bot_enums import ActivityTypes
 from discordbot.constants import BSEDDIES_KING_ROLES
 from discordbot.slashcommandeventclasses import BSEddies
+from mongo.bsepoints import KingTenures
 
 
 class BSEddiesKing(BSEddies):
@@ -14,6 +15,7 @@ class BSEddiesKing(BSEddies):
 
     def __init__(self, client, guilds, logger):
         super().__init__(client, guilds, logger)
+        self.king_tenures = KingTenures()
 
     async def king_data(self, ctx: discord.ApplicationContext) -> None:
         """
@@ -29,7 +31,7 @@ class BSEddiesKing(BSEddies):
         guild_id = ctx.guild.id
 
         king_user = self.user_points.get_current_king(guild_id)
-        data = self.user_points.get_king_info(king_user)
+        data = self.king_tenures.get_king_info(king_user["uid"], guild_id)
 
         role_id = BSEDDIES_KING_ROLES[guild_id]
         role = ctx.guild.get_role(role_id)
@@ -27,4 +27,8 @@ class BSEddiesLeaderboard(BSEddies):
 
         leaderboard_view = views.LeaderBoardView(self.embed_manager)
         msg = self.embed_manager.get_leaderboard_embed(ctx.guild, 5, ctx.author.display_name)
+
+        leaderboard = self.embed_manager.leaderboards.get(ctx.guild_id)
+        if (rank := leaderboard.rank(ctx.author.id)) is not None:
+            msg += f"\n_{ctx.author.display_name}_ is **{rank})** with `{leaderboard.score(ctx.author.id)}` eddies."
         await ctx.respond(content=msg, view=leaderboard_view)
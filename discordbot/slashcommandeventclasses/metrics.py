@@ -0,0 +1,53 @@
+import discord
+
+from discordbot.metrics import get_metrics
+from discordbot.slashcommandeventclasses import BSEddies
+
+
+class BSEddiesMetrics(BSEddies):
+    """
+    Class for handling `/metrics` commands
+    """
+
+    def __init__(self, client, guilds, logger):
+        super().__init__(client, guilds, logger)
+        self.metrics = get_metrics()
+
+    def _section(self, title: str, name: str, top: int) -> str:
+        lines = [f"{title} (count / p50 / p95 / p99 / total)"]
+        for label, histogram in self.metrics.summary(name, top):
+            lines.append(
+                f"  {label[:32]:<32} {histogram.count:>6} "
+                f"{histogram.percentile(50) * 1000:>7.1f}ms {histogram.percentile(95) * 1000:>7.1f}ms "
+                f"{histogram.percentile(99) * 1000:>7.1f}ms {histogram.sum:>7.1f}s"
+            )
+        if len(lines) == 1:
+            lines.append("  nothing recorded yet")
+        return "\n".join(lines)
+
+    async def metrics_summary(self, ctx: discord.ApplicationContext) -> None:
+        """
+        Sends a summary of where the bot's been spending its time. Only the creator can use this.
+        :param ctx:
+        :return:
+        """
+        if not await self._handle_validation(ctx, admin=True):
+            return
+
+        sections = [
+            self._section("Commands", "bsebot_command_seconds", 5),
+            self._section("Events", "bsebot_event_seconds", 5),
+            self._section("Mongo", "bsebot_mongo_operation_seconds", 5),
+            self._section("Jobs", "bsebot_scheduled_job_seconds", 3),
+            self._section("Event loop lag", "bsebot_event_loop_lag_seconds", 1),
+            self._section("DMs queued to sent", "bsebot_dm_latency_seconds", 1),
+        ]
+
+        message = "```\n"
+        for section in sections:
+            # stay under discord's message limit
+            if len(message) + len(section) > 1900:
+                break
+            message += section + "\n\n"
+        message = message.rstrip() + "\n```"
+        await ctx.respond(content=message, ephemeral=True)
@@ -1,5 +1,7 @@
 
+import asyncio
 import os
+import tempfile
 from typing import Union
 
 import discord
@@ -9,6 +11,12 @@ from discordbot.bot_enums import TransactionTypes, ActivityTypes
 from discordbot.slashcommandeventclasses import BSEddies
 
 
+# the number of items shown in the recent history
+RECENT_TRANSACTIONS = 10
+# the number of items read from the DB at once when exporting the full history
+EXPORT_BATCH_SIZE = 1000
+
+
 class BSEddiesTransactionHistory(BSEddies):
     """
     Class for handling `/bseddies transactions` command
@@ -26,11 +34,9 @@ class BSEddiesTransactionHistory(BSEddies):
         :param transaction_history:
         :return:
         """
-        recent_history = transaction_history[-10:]
-
         message = "This is your recent transaction history.\n"
 
-        for item in recent_history:
+        for item in transaction_history:
             message += (
                 f"\n"
                 f"**Timestamp**: {item['timestamp'].strftime('%d %b %y %H:%M:%S')}\n"
@@ -51,62 +57,85 @@ class BSEddiesTransactionHistory(BSEddies):
 
         await ctx.respond(content=message, ephemeral=True)
 
-    @staticmethod
-    async def _handle_full_trans(ctx: discord.ApplicationContext, transaction_history: list) -> None:
+    def _write_full_trans(self, user_id: int, guild_id: int, full_name: str) -> int:
         """
-        Method for handling out "full transaction history" command
-
-        This mostly just builds an XLSX file that we can send to the user. We use the XLSXWRITER library to do the
-        heavy lifting here.
-
-        Once we've created the file, we send it to the user in a DM and send an ephemeral message to let the user know.
-        Ephemeral messages don't support file attachments yet.
-        :param ctx:
-        :param transaction_history:
-        :return:
+        Writes the user's full transaction history to an XLSX file. This blocks, so it's run in a worker thread.
+
+        The history is read from the DB in batches and written out a row at a time - the workbook is in
+        "constant_memory" mode so rows are flushed to disk as we go rather than kept in memory.
+        :param user_id:
+        :param guild_id:
+        :param full_name: the path to write to
+        :return: the number of transactions written
         """
-        path = os.path.join(os.path.expanduser("~"), "trans_files")
-        f_name = f"full_trans_{ctx.author.id}.xlsx"
-
-        if not os.path.exists(path):
-            os.makedirs(path)
+        workbook = xlsxwriter.Workbook(full_name, {"constant_memory": True})
+        worksheet = workbook.add_worksheet("Transaction History")
 
-        full_name = os.path.join(path, f_name)
+        center_format = workbook.add_format()
+        center_format.set_align('center')
+        center_format.set_align('vcenter')
 
-        workbook = xlsxwriter.Workbook(full_name)
-        worksheet = workbook.add_worksheet("Transaction History")
+        worksheet.set_column("A:A", cell_format=center_format)
+        worksheet.set_column("B:B", width=18)
+        worksheet.set_column("C:D", width=20)
+        worksheet.set_column("I:I", width=50)
 
         cols = ["Item", "Type", "Timestamp", "Change amount", "Eddies", "Bet ID", "Loan ID", "User ID", "Comment"]
         worksheet.write_row(0, 0, cols, workbook.add_format({"bold": True}))
 
-        row = 1
-        for item in transaction_history:
+        row = 0
+        amount = 0
+        for item in self.user_points.iter_transaction_history(user_id, guild_id, EXPORT_BATCH_SIZE):
+            row += 1
+            amount += item["amount"]
             worksheet.write_row(
                 row, 0,
                 [row, TransactionTypes(item['type']).name, item['timestamp'].strftime('%d %b %y %H:%M:%S'),
-                 item["amount"], item["points"], item.get("bet_id", "N/A"), item.get("loan_id", "N/A"),
+                 item["amount"], amount, item.get("bet_id", "N/A"), item.get("loan_id", "N/A"),
                  item.get("user_id", "N/A"), item.get("comment", "No comment")]
             )
-            row += 1
 
-        center_format = workbook.add_format()
-        center_format.set_align('center')
-        center_format.set_align('vcenter')
+        workbook.close()
+        return row
 
-        worksheet.set_column("A:A", cell_format=center_format)
-        worksheet.set_column("B:B", width=18)
-        worksheet.set_column("C:D", width=20)
-        worksheet.set_column("I:I", width=50)
+    async def _handle_full_trans(self, ctx: discord.ApplicationContext) -> None:
+        """
+        Method for handling out "full transaction history" command
 
-        workbook.close()
+        This mostly just builds an XLSX file that we can send to the user. We use the XLSXWRITER library to do the
+        heavy lifting here. The file is built in a worker thread so we're not holding up the event loop while we do.
 
-        try:
-            await ctx.author.send(content="Here's your full transaction history:", file=discord.File(full_name, f_name))
-        except discord.Forbidden:
-            # user doesn't allow DMs
-            pass
+        Once we've created the file, we send it to the user in a DM. We let the user know it's on its way with an
+        ephemeral message first as ephemeral messages don't support file attachments yet.
+        :param ctx:
+        :return:
+        """
+        await ctx.respond(content="I'll send you a DM with your full history when it's ready.", ephemeral=True)
 
-        await ctx.respond(content="I've sent you a DM with your full history.", ephemeral=True)
+        f_name = f"full_trans_{ctx.author.id}.xlsx"
+        with tempfile.TemporaryDirectory() as path:
+            full_name = os.path.join(path, f_name)
+            try:
+                count = await asyncio.to_thread(self._write_full_trans, ctx.author.id, ctx.guild.id, full_name)
+            except Exception:
+                self.logger.exception(f"Failed to export the transaction history for {ctx.author.id}")
+                await ctx.followup.send(
+                    content="Sorry, something went wrong exporting your transaction history. Try again later.",
+                    ephemeral=True
+                )
+                return
+            self.logger.info(f"Exported {count} transactions for {ctx.author.id}")
+
+            try:
+                await ctx.author.send(
+                    content="Here's your full transaction history:", file=discord.File(full_name, f_name)
+                )
+            except discord.Forbidden:
+                # user doesn't allow DMs
+                await ctx.followup.send(
+                    content="I couldn't DM you your transaction history - check you allow DMs from server members.",
+                    ephemeral=True
+                )
 
     async def transaction_history(self, ctx: discord.ApplicationContext, full: Union[str, None]) -> None:
         """
@@ -122,19 +151,10 @@ class BSEddiesTransactionHistory(BSEddies):
             ctx.author, ctx.guild_id, ActivityTypes.BSEDDIES_TRANSACTIONS, full=full
         )
 
-        user = self.user_points.find_user(ctx.author.id, ctx.guild.id)
-        transaction_history = user["transaction_history"]
-
-        amount = 0
-        for item in transaction_history:
-            if transaction_history.index(item) == 0:
-                item["points"] = item["amount"]
-                amount = item["amount"]
-                continue
-            amount += item["amount"]
-            item["points"] = amount
-
         if full is None:
+            transaction_history = self.user_points.get_recent_transactions(
+                ctx.author.id, ctx.guild.id, RECENT_TRANSACTIONS
+            )
             await self._handle_recent_trans(ctx, transaction_history)
         else:
-            await self._handle_full_trans(ctx, transaction_history)
+            await self._handle_full_trans(ctx)
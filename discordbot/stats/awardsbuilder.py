@@ -1,11 +1,18 @@
+import asyncio
 import datetime
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import discord
 
 from discordbot.bot_enums import TransactionTypes
-from discordbot.constants import ANNUAL_AWARDS_AWARD, BSEDDIES_REVOLUTION_CHANNEL, JERK_OFF_CHAT, MONTHLY_AWARDS_PRIZE
+from discordbot.constants import (
+    ANNUAL_AWARDS_AWARD, ANNUAL_AWARDS_PARALLEL, ANNUAL_AWARDS_TIME_BUDGET, BSEDDIES_REVOLUTION_CHANNEL,
+    JERK_OFF_CHAT, MONTHLY_AWARDS_PRIZE, MONTHLY_AWARDS_TIME_BUDGET
+)
+from discordbot.objectresolver import DiscordObjectResolver
+from discordbot.stats.parallelstats import ParallelStatsJob
 from discordbot.stats.statsclasses import Stat, StatsGatherer
+from discordbot.stats.statsjob import StatsJob
 from mongo.bsedataclasses import Awards
 from mongo.bsepoints import UserPoints
 
@@ -21,6 +28,88 @@ class AwardsBuilder:
         self.awards = Awards()
         self.user_points = UserPoints()
 
+        # memoises the discord objects we need for the messages for this run
+        self.resolver = DiscordObjectResolver(bot, guild_id, logger)
+
+        self.time_budget = ANNUAL_AWARDS_TIME_BUDGET if annual else MONTHLY_AWARDS_TIME_BUDGET
+        self.job: Optional[StatsJob] = None
+
+    def cancel(self) -> None:
+        """
+        Cancels any stats computation that's currently in progress
+        :return: None
+        """
+        if self.job is not None:
+            self.job.cancel()
+
+    async def _run_job(self, name: str, steps: List[Tuple[str, tuple]]) -> Dict[str, Any]:
+        """
+        Computes the given StatsGatherer steps in a worker thread
+        The annual stats can be spread across a process pool instead if ANNUAL_AWARDS_PARALLEL is set
+
+        Args:
+            name (str): name of the job for logging
+            steps (List[Tuple[str, tuple]]): list of method name and args tuples
+
+        Returns:
+            Dict[str, Any]: dict of method name to result
+        """
+        if self.annual and ANNUAL_AWARDS_PARALLEL:
+            self.job = ParallelStatsJob(name, self.stats, steps, self.logger, self.time_budget)
+        else:
+            self.job = StatsJob(name, self.stats, steps, self.logger, self.time_budget)
+        try:
+            return await self.job.run()
+        finally:
+            self.job = None
+
+    @staticmethod
+    def _stats_steps(args: tuple, channel_ids: List[int]) -> List[Tuple[str, tuple]]:
+        """
+        The StatsGatherer methods (and their args) required for the stats message
+
+        Args:
+            args (tuple): guild_id, start and end
+            channel_ids (List[int]): the text channel IDs in the guild
+
+        Returns:
+            List[Tuple[str, tuple]]: list of method name and args tuples
+        """
+        steps = [
+            (method, args) for method in (
+                "number_of_messages", "average_message_length", "busiest_channel", "busiest_thread",
+                "busiest_day", "number_of_bets", "salary_gains", "average_wordle_victory", "bet_eddies_stats",
+                "most_unique_channel_contributers", "total_time_spent_in_vc", "vc_with_most_time_spent",
+                "vc_with_most_users", "most_popular_server_emoji", "threads_created", "number_of_threaded_messages",
+            )
+        ]
+        steps.append(("quietest_channel", (*args, channel_ids)))
+        steps.extend(
+            (method, args) for method in ("quietest_thread", "quietest_day", "emojis_created")
+        )
+        return steps
+
+    @staticmethod
+    def _awards_steps(args: tuple) -> List[Tuple[str, tuple]]:
+        """
+        The StatsGatherer methods (and their args) required for the awards message
+
+        Args:
+            args (tuple): guild_id, start and end
+
+        Returns:
+            List[Tuple[str, tuple]]: list of method name and args tuples
+        """
+        return [
+            (method, args) for method in (
+                "most_messages_sent", "least_messages_sent", "longest_message", "lowest_average_wordle_score",
+                "most_bets_created", "most_eddies_bet", "most_eddies_won", "most_time_king", "twitter_addict",
+                "jerk_off_contributor", "big_memer", "react_king", "big_gamer", "big_streamer",
+                "most_thread_messages_sent", "most_replies", "most_edited_messages", "most_swears",
+                "most_messages_to_a_single_channel", "most_messages_to_most_channels",
+            )
+        ]
+
     async def build_stats_and_message(self) -> Tuple[List[Stat], List[str]]:
         """
         Uses StatsGatherer to query for all the required stats
@@ -38,50 +127,54 @@ class AwardsBuilder:
 
         args = (self.guild_id, start, end)
 
-        guild = await self.bot.fetch_guild(self.guild_id)
-
         # get a list of channel IDs here to use
-        _channels = await guild.fetch_channels()
-        _channels = [c for c in _channels if c.type in [discord.ChannelType.text, discord.ChannelType.private]]
+        _channels = await self.resolver.get_text_channels()
         _channel_ids = [c.id for c in _channels]
 
-        number_messages = self.stats.number_of_messages(*args)
-        avg_message_chars, avg_message_words = self.stats.average_message_length(*args)
-        busiest_channel = self.stats.busiest_channel(*args)
-        busiest_thread = self.stats.busiest_thread(*args)
-        busiest_day = self.stats.busiest_day(*args)
-        num_bets = self.stats.number_of_bets(*args)
-        salary_gains = self.stats.salary_gains(*args)
-        average_wordle = self.stats.average_wordle_victory(*args)
-        eddies_placed, eddies_won = self.stats.bet_eddies_stats(*args)
-        most_popular_channel = self.stats.most_unique_channel_contributers(*args)
-        time_spent_in_vc = self.stats.total_time_spent_in_vc(*args)
-        vc_most_time_spent = self.stats.vc_with_most_time_spent(*args)
-        vc_most_users = self.stats.vc_with_most_users(*args)
-        most_used_server_emoji = self.stats.most_popular_server_emoji(*args)
-        threads_created = self.stats.threads_created(*args)
-        thread_messages = self.stats.number_of_threaded_messages(*args)
-        quietest_channel = self.stats.quietest_channel(*args, _channel_ids)
-        quietest_thread = self.stats.quietest_thread(*args)
-        quietest_day = self.stats.quietest_day(*args)
-        emojis_created = self.stats.emojis_created(*args)
-
-        busiest_thread_obj = await guild.fetch_channel(busiest_thread.value)
-        quietest_thread_obj = await guild.fetch_channel(quietest_thread.value)
+        # all the heavy lifting happens in a worker so we don't block the gateway
+        results = await self._run_job("stats", self._stats_steps(args, _channel_ids))
+
+        number_messages = results["number_of_messages"]
+        avg_message_chars, avg_message_words = results["average_message_length"]
+        busiest_channel = results["busiest_channel"]
+        busiest_thread = results["busiest_thread"]
+        busiest_day = results["busiest_day"]
+        num_bets = results["number_of_bets"]
+        salary_gains = results["salary_gains"]
+        average_wordle = results["average_wordle_victory"]
+        eddies_placed, eddies_won = results["bet_eddies_stats"]
+        most_popular_channel = results["most_unique_channel_contributers"]
+        time_spent_in_vc = results["total_time_spent_in_vc"]
+        vc_most_time_spent = results["vc_with_most_time_spent"]
+        vc_most_users = results["vc_with_most_users"]
+        most_used_server_emoji = results["most_popular_server_emoji"]
+        threads_created = results["threads_created"]
+        thread_messages = results["number_of_threaded_messages"]
+        quietest_channel = results["quietest_channel"]
+        quietest_thread = results["quietest_thread"]
+        quietest_day = results["quietest_day"]
+        emojis_created = results["emojis_created"]
+
         busiest_day_format = busiest_day.value.strftime("%a %d %b")
         quietest_day_format = quietest_day.value.strftime("%a %d %b")
-        popular_channel_obj = await guild.fetch_channel(most_popular_channel.value)
-        vc_time_obj = await guild.fetch_channel(vc_most_time_spent.value)
-        vc_users_obj = await guild.fetch_channel(vc_most_users.value)
-        emoji_obj = await guild.fetch_emoji(most_used_server_emoji.emoji_id)
-
-        thread_objects = [
-            await guild.fetch_channel(thread_id) for thread_id in threads_created.threads
-        ]
 
-        emoji_objects = [
-            await guild.fetch_emoji(emoji_id) for emoji_id in emojis_created.emoji_ids
-        ]
+        # only list the created threads if there's few enough of them to fit in the message
+        list_threads = len(threads_created.threads) < 5
+        created_thread_ids = threads_created.threads if list_threads else []
+        created_emoji_ids = emojis_created.emoji_ids if self.annual else []
+
+        channel_objects, emoji_objects = await asyncio.gather(
+            self.resolver.get_channels(
+                [
+                    busiest_thread.value, quietest_thread.value, most_popular_channel.value,
+                    vc_most_time_spent.value, vc_most_users.value, *created_thread_ids
+                ]
+            ),
+            self.resolver.get_emojis([most_used_server_emoji.emoji_id, *created_emoji_ids])
+        )
+        busiest_thread_obj, quietest_thread_obj, popular_channel_obj, vc_time_obj, vc_users_obj = channel_objects[:5]
+        thread_objects = channel_objects[5:]
+        emoji_obj, emoji_objects = emoji_objects[0], emoji_objects[1:]
 
         stats = [
             number_messages, avg_message_chars, avg_message_words, busiest_channel, busiest_day,
@@ -129,7 +222,7 @@ class AwardsBuilder:
             (f"**Most popular channel** 💌: {popular_channel_obj.mention} "
              f"(`{most_popular_channel.users}` unique users)\n"),
             (f"**Threads created** 🖇️: {threads_created.value} "
-             f"({','.join([t.mention for t in thread_objects]) if len(thread_objects) < 5 else '_too many to list_'})"
+             f"({','.join([t.mention for t in thread_objects]) if list_threads else '_too many to list_'})"
              "\n"),
             (f"**Chattiest day** 🗓️: {busiest_day_format} "
              f"(`{busiest_day.messages}` messages in `{busiest_day.channels}` "
@@ -184,29 +277,31 @@ class AwardsBuilder:
 
         args = (self.guild_id, start, end)
 
-        guild = await self.bot.fetch_guild(self.guild_id)
-
-        most_messages = self.stats.most_messages_sent(*args)
-        least_messages = self.stats.least_messages_sent(*args)
-        longest_message = self.stats.longest_message(*args)
-        best_wordle = self.stats.lowest_average_wordle_score(*args)
-        most_bets = self.stats.most_bets_created(*args)
-        most_eddies_placed = self.stats.most_eddies_bet(*args)
-        most_eddies_won = self.stats.most_eddies_won(*args)
-        longest_king = self.stats.most_time_king(*args)
-        twitter_addict = self.stats.twitter_addict(*args)
-        jerk_off_king = self.stats.jerk_off_contributor(*args)
-        big_memer = self.stats.big_memer(*args)
-        react_king = self.stats.react_king(*args)
-        big_gamer = self.stats.big_gamer(*args)
-        big_streamer = self.stats.big_streamer(*args)
-        threadiest_user = self.stats.most_thread_messages_sent(*args)
-        serial_replier, conversation_starter = self.stats.most_replies(*args)
+        guild = await self.resolver.get_guild()
+
+        results = await self._run_job("awards", self._awards_steps(args))
+
+        most_messages = results["most_messages_sent"]
+        least_messages = results["least_messages_sent"]
+        longest_message = results["longest_message"]
+        best_wordle = results["lowest_average_wordle_score"]
+        most_bets = results["most_bets_created"]
+        most_eddies_placed = results["most_eddies_bet"]
+        most_eddies_won = results["most_eddies_won"]
+        longest_king = results["most_time_king"]
+        twitter_addict = results["twitter_addict"]
+        jerk_off_king = results["jerk_off_contributor"]
+        big_memer = results["big_memer"]
+        react_king = results["react_king"]
+        big_gamer = results["big_gamer"]
+        big_streamer = results["big_streamer"]
+        threadiest_user = results["most_thread_messages_sent"]
+        serial_replier, conversation_starter = results["most_replies"]
         owner_award = self.stats.server_owner(guild, start)
-        fattest_fingers = self.stats.most_edited_messages(*args)
-        most_swears = self.stats.most_swears(*args)
-        single_minded = self.stats.most_messages_to_a_single_channel(*args)
-        diverse_portfolio = self.stats.most_messages_to_most_channels(*args)
+        fattest_fingers = results["most_edited_messages"]
+        most_swears = results["most_swears"]
+        single_minded = results["most_messages_to_a_single_channel"]
+        diverse_portfolio = results["most_messages_to_most_channels"]
 
         awards = [
             most_messages, least_messages, longest_message, best_wordle, most_bets,
@@ -0,0 +1,205 @@
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from discordbot.stats.statsclasses import StatsGatherer
+from discordbot.stats.statsdatacache import StatsDataCache
+from discordbot.stats.statsjob import StatsJob
+
+
+# the StatsDataCache dataset each StatsGatherer method reads
+# stats that share a dataset are computed by the same worker so that each dataset is only loaded once
+STAT_DATASETS = {
+    "messages": (
+        "number_of_messages", "average_message_length", "busiest_channel", "busiest_day",
+        "most_unique_channel_contributers", "quietest_channel", "quietest_day", "most_messages_sent",
+        "least_messages_sent", "longest_message", "twitter_addict", "jerk_off_contributor", "most_swears",
+        "most_messages_to_a_single_channel", "most_messages_to_most_channels", "busiest_thread", "quietest_thread",
+        "number_of_threaded_messages", "most_thread_messages_sent", "most_popular_server_emoji",
+    ),
+    "vc": (
+        "total_time_spent_in_vc", "vc_with_most_time_spent", "vc_with_most_users", "big_gamer", "big_streamer",
+    ),
+    "users": (
+        "salary_gains", "bet_eddies_stats", "most_eddies_bet", "most_eddies_won",
+    ),
+    "kings": ("most_time_king", ),
+    "wordles": ("average_wordle_victory", "lowest_average_wordle_score"),
+    "bets": ("number_of_bets", "most_bets_created"),
+    "reactions": ("big_memer", "react_king"),
+    "replies": ("most_replies", ),
+    "edits": ("most_edited_messages", ),
+}
+
+_METHOD_DATASETS = {method: dataset for dataset, methods in STAT_DATASETS.items() for method in methods}
+
+
+def partition_steps(steps: List[Tuple[str, tuple]]) -> List[List[Tuple[str, tuple]]]:
+    """Splits the given steps into partitions that can be computed independently
+
+    Steps are grouped by the dataset they read. Groups aren't split up any further as every worker that computes
+    part of a group would have to load the whole dataset again.
+    Partitions are returned largest first so the slowest work gets started first.
+
+    Args:
+        steps (List[Tuple[str, tuple]]): list of method name and args tuples
+
+    Returns:
+        List[List[Tuple[str, tuple]]]: the partitioned steps
+    """
+    groups = {}  # type: Dict[str, List[Tuple[str, tuple]]]
+    for step in steps:
+        dataset = _METHOD_DATASETS.get(step[0], "misc")
+        groups.setdefault(dataset, []).append(step)
+
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def _init_worker(log_queue: multiprocessing.Queue, level: int) -> None:
+    """Sends the worker's logging back to the parent process - a spawned process has no logging configured
+
+    Args:
+        log_queue (multiprocessing.Queue): the queue the parent reads the log records from
+        level (int): the level to log at
+    """
+    logger = logging.getLogger("bsebot")
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def compute_partition(
+    annual: bool,
+    steps: List[Tuple[str, tuple]],
+    cache_factory: Optional[Callable[[bool], StatsDataCache]] = None
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Computes a partition of stats - this is what gets executed in the worker processes
+
+    Each worker creates its own StatsGatherer (and therefore its own DB connections).
+
+    Args:
+        annual (bool): whether we're doing the annual stats
+        steps (List[Tuple[str, tuple]]): list of method name and args tuples
+        cache_factory (Optional[Callable[[bool], StatsDataCache]]): optional callable that creates the cache to use
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, float]]: the results and the timings of each method
+    """
+    logger = logging.getLogger("bsebot")
+    gatherer = StatsGatherer(logger, annual)
+    if cache_factory is not None:
+        gatherer.cache = cache_factory(annual)
+
+    results = {}
+    timings = {}
+    for method_name, args in steps:
+        start = time.monotonic()
+        results[method_name] = getattr(gatherer, method_name)(*args)
+        timings[method_name] = time.monotonic() - start
+        logger.info(f"[worker {os.getpid()}] {method_name} took {timings[method_name]:.2f}s")
+    return results, timings
+
+
+class ParallelStatsJob(StatsJob):
+    """
+    A StatsJob that spreads the stats across a process pool
+
+    Steps are partitioned by the dataset they read (see `partition_steps`) and each partition is computed in
+    a separate process. The results are merged back into one dict that's identical to the serial StatsJob output.
+    All the step arguments and the results must be picklable. The workers' logging is passed back to our logger and
+    the workers are terminated if the job is cancelled or runs out of time.
+    """
+    def __init__(
+        self,
+        name: str,
+        gatherer: StatsGatherer,
+        steps: List[Tuple[str, tuple]],
+        logger,
+        time_budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        cache_factory: Optional[Callable[[bool], StatsDataCache]] = None
+    ):
+        """
+        :param name: name of the job, used for logging
+        :param gatherer: the StatsGatherer - only used for the annual flag
+        :param steps: list of (method name, args) tuples to compute
+        :param logger: logger
+        :param time_budget: the max number of seconds the job is allowed to take, or None for no limit
+        :param max_workers: the number of worker processes to use, defaults to the CPU count
+        :param cache_factory: optional picklable callable to create each worker's StatsDataCache
+        """
+        super().__init__(name, gatherer, steps, logger, time_budget)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_factory = cache_factory
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Computes all the partitions across the process pool and merges the results.
+        :return: dict of method name to the result of that method
+        """
+        if self.time_budget is not None:
+            self._deadline = time.monotonic() + self.time_budget
+
+        job_start = time.monotonic()
+        partitions = partition_steps(self.steps)
+        workers = min(self.max_workers, len(partitions))
+        total = len(self.steps)
+
+        self.logger.info(f"Stats job '{self.name}' split {total} stats into {len(partitions)} partitions")
+
+        # spawn rather than fork - we're forking from a worker thread of a process with a running event loop
+        # and open MongoClients, neither of which survive a fork
+        context = multiprocessing.get_context("spawn")
+        log_queue = context.Queue()
+        finished = queue.Queue()  # type: queue.Queue[Tuple[bool, Any]]
+        pool = context.Pool(
+            processes=workers, initializer=_init_worker, initargs=(log_queue, self.logger.getEffectiveLevel())
+        )
+        for partition in partitions:
+            pool.apply_async(
+                compute_partition,
+                (self.gatherer.annual, partition, self.cache_factory),
+                callback=lambda result: finished.put((True, result)),
+                error_callback=lambda error: finished.put((False, error)),
+            )
+
+        remaining = len(partitions)
+        try:
+            while remaining:
+                self._check()
+                self._forward_logs(log_queue)
+                try:
+                    ok, result = finished.get(timeout=1)
+                except queue.Empty:
+                    continue
+                remaining -= 1
+                if not ok:
+                    raise result
+                results, timings = result
+                self.results.update(results)
+                self.timings.update(timings)
+                self.logger.info(f"[{self.name}] {len(self.results)}/{total} - finished {', '.join(results)}")
+            pool.close()
+        finally:
+            if remaining:
+                # don't leave partitions running past the budget if we've been cancelled or one failed
+                pool.terminate()
+            pool.join()
+            self._forward_logs(log_queue)
+
+        # keep the same ordering as the serial path
+        self.results = {method_name: self.results[method_name] for method_name, _ in self.steps}
+        self.logger.info(f"Stats job '{self.name}' computed {total} stats in {time.monotonic() - job_start:.2f}s")
+        return self.results
+
+    def _forward_logs(self, log_queue: multiprocessing.Queue) -> None:
+        while True:
+            try:
+                record = log_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.logger.handle(record)
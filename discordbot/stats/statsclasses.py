@@ -6,7 +6,7 @@ from typing import Tuple
 
 import discord
 
-from discordbot.bot_enums import ActivityTypes, AwardsTypes, StatTypes, TransactionTypes
+from discordbot.bot_enums import AwardsTypes, StatTypes, TransactionTypes
 from discordbot.constants import ANNUAL_AWARDS_AWARD, BSE_BOT_ID, JERK_OFF_CHAT, MONTHLY_AWARDS_PRIZE
 from discordbot.stats.statsdatacache import StatsDataCache
 from discordbot.stats.statsdataclasses import Stat
@@ -535,20 +535,15 @@ class StatsGatherer:
         Returns:
             Stat: average wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m["message_type"]]
+        wordle_results = self.cache.get_wordle_results(guild_id, start, end)
 
         wordle_count = []
-        for wordle in wordle_messages:
+        for wordle in wordle_results:
             if wordle["user_id"] == BSE_BOT_ID:
                 continue
 
-            result = re.search(r"[\dX]/\d", wordle["content"]).group()
-            guesses = result.split("/")[0]
-
-            if guesses == "X":
-                guesses = "10"
-            guesses = int(guesses)
+            # failures count as 10
+            guesses = wordle["guesses"] if wordle["solved"] else 10
             wordle_count.append(guesses)
 
         average_wordle = round((sum(wordle_count) / len(wordle_count)), 2)
@@ -1149,28 +1144,22 @@ class StatsGatherer:
         Returns:
             Stat: the wordle stat
         """
-        messages = self.cache.get_messages(guild_id, start, end)
-        wordle_messages = [m for m in messages if "wordle" in m["message_type"]]
+        wordle_results = self.cache.get_wordle_results(guild_id, start, end)
 
         # number of days in the time period
         days = (end - start).days
         threshold = round(days / 2)
 
         wordle_count = {}
-        for wordle in wordle_messages:
+        for wordle in wordle_results:
             uid = wordle["user_id"]
             if uid == BSE_BOT_ID:
                 continue
             if uid not in wordle_count:
                 wordle_count[uid] = []
 
-            result = re.search(r"[\dX]/\d", wordle["content"]).group()
-            guesses = result.split("/")[0]
-
-            if guesses == "X":
-                guesses = "7"
-            guesses = int(guesses)
-
+            # failures count as 7
+            guesses = wordle["guesses"] if wordle["solved"] else 7
             wordle_count[uid].append(guesses)
 
         if len(wordle_count) > 1:
@@ -1814,41 +1803,8 @@ class StatsGatherer:
             Stat: longest King stat
         """
 
-        activity_history = self.cache.get_activities(guild_id, start, end)
-        king_events = sorted(
-            [a for a in activity_history if a["type"] in [ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS]],
-            key=lambda x: x["timestamp"]
-        )
-
-        kings = {}
-        previous_time = start
-
-        for event in king_events:
-            if event["type"] == ActivityTypes.KING_LOSS:
-                uid = event["uid"]
-
-                timestamp = event["timestamp"]  # type: datetime.datetime
-                time_king = (timestamp - previous_time).total_seconds()
-
-                if uid not in kings:
-                    kings[uid] = 0
-                kings[uid] += time_king
-                previous_time = None
-
-            elif event["type"] == ActivityTypes.KING_GAIN:
-                previous_time = event["timestamp"]
-
-        if king_events[-1] == event and event["type"] == ActivityTypes.KING_GAIN:
-            # last thing someone did was become KING
-            uid = event["uid"]
-            end_time = datetime.datetime.now()
-            if end_time > end:
-                end_time = end
-            timestamp = event["timestamp"]  # type: datetime.datetime
-            time_king = (end_time - timestamp).total_seconds()
-            if uid not in kings:
-                kings[uid] = 0
-            kings[uid] += time_king
+        tenures = self.cache.get_king_tenures(guild_id, start, end)
+        kings = self.cache.king_tenures.time_in_range(tenures, start, end)
 
         longest_king = sorted(kings, key=lambda x: kings[x], reverse=True)[0]
 
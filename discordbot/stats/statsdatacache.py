@@ -4,9 +4,11 @@ import datetime
 from typing import List, Optional  # noqa: F401
 
 from discordbot.constants import BOT_IDS
-from mongo.bsedataclasses import SpoilerThreads
-from mongo.bsepoints import ServerEmojis, UserBets, UserInteractions, UserPoints
-from mongo.datatypes import Activity, Bet, Emoji, Message, Transaction, User, VCInteraction
+from mongo.bsedataclasses import SpoilerThreads, WordleResults
+from mongo.bsepoints import KingTenures, ServerEmojis, UserBets, UserInteractions, UserPoints
+from mongo.datatypes import (
+    Activity, Bet, Emoji, KingTenure, Message, Transaction, User, VCInteraction, WordleResult
+)
 
 
 class StatsDataCache:
@@ -16,6 +18,8 @@ class StatsDataCache:
         self.user_points = UserPoints()
         self.server_emojis = ServerEmojis()
         self.threads = SpoilerThreads()
+        self.king_tenures = KingTenures()
+        self.wordle_results = WordleResults()
 
         self.annual = annual
 
@@ -53,6 +57,38 @@ class StatsDataCache:
         self.__edit_cache = []  # type: List[Message]
         self.__edit_cache_time = None  # type: Optional[datetime.datetime]
 
+        self.__tenure_cache = []  # type: List[KingTenure]
+        self.__tenure_cache_time = None  # type: Optional[datetime.datetime]
+
+        self.__wordle_cache = []  # type: List[WordleResult]
+        self.__wordle_cache_time = None  # type: Optional[datetime.datetime]
+
+    def __reset_on_new_range(self, start: datetime.datetime, end: datetime.datetime) -> None:
+        """Clears all the caches if we're being asked about a different time period to the cached one
+
+        Args:
+            start (datetime.datetime): start of timestamp query
+            end (datetime.datetime): end of timestamp query
+        """
+        if start == self.__start_cache and end == self.__end_cache:
+            return
+
+        self.__message_cache = []
+        self.__vc_cache = []
+        self.__bet_cache = []
+        self.__user_cache = []
+        self.__transaction_cache = []
+        self.__activity_cache = []
+        self.__reactions_cache = []
+        self.__emoji_cache = []
+        self.__reply_cache = []
+        self.__edit_cache = []
+        self.__tenure_cache = []
+        self.__wordle_cache = []
+
+        self.__start_cache = start
+        self.__end_cache = end
+
     # caching functions
     def get_messages(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
         """Internal method to query for messages between a certain date
@@ -68,8 +104,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__message_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__message_cache and (now - self.__message_cache_time).total_seconds() < 3600:
             return self.__message_cache
@@ -103,8 +138,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__edit_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__edit_cache and (now - self.__edit_cache_time).total_seconds() < 3600:
             return self.__edit_cache
@@ -144,8 +178,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__vc_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__vc_cache and (now - self.__vc_cache_time).total_seconds() < 3600:
             return self.__vc_cache
@@ -178,8 +211,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__bet_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__bet_cache and (now - self.__bet_cache_time).total_seconds() < 3600:
             return self.__bet_cache
@@ -206,8 +238,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__user_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__user_cache and (now - self.__user_cache_time).total_seconds() < 3600:
             return self.__user_cache
@@ -230,8 +261,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__transaction_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__transaction_cache and (now - self.__transaction_cache_time).total_seconds() < 3600:
             return self.__transaction_cache
@@ -263,8 +293,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__activity_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__activity_cache and (now - self.__activity_cache_time).total_seconds() < 3600:
             return self.__activity_cache
@@ -280,6 +309,60 @@ class StatsDataCache:
         self.__activity_cache_time = now
         return self.__activity_cache
 
+    def get_king_tenures(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[KingTenure]:
+        """Internal method to query for KING tenures that overlap a certain date range
+        Will cache the tenures on first parse and return the cache if cache was set less than an hour ago
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the beginning of time period
+            end (datetime.datetime): the end of the time period
+
+        Returns:
+            List[KingTenure]: a list of tenures
+        """
+        now = datetime.datetime.now()
+
+        self.__reset_on_new_range(start, end)
+
+        if self.__tenure_cache and (now - self.__tenure_cache_time).total_seconds() < 3600:
+            return self.__tenure_cache
+
+        self.__tenure_cache = self.king_tenures.get_tenures_in_range(guild_id, start, end)
+        self.__tenure_cache_time = now
+        return self.__tenure_cache
+
+    def get_wordle_results(
+        self,
+        guild_id: int,
+        start: datetime.datetime,
+        end: datetime.datetime
+    ) -> List[WordleResult]:
+        """Internal method to query for wordle results posted between a certain date
+        Will cache the results on first parse and return the cache if cache was set less than an hour ago
+
+        Args:
+            guild_id (int): the guild ID
+            start (datetime.datetime): the beginning of time period
+            end (datetime.datetime): the end of the time period
+
+        Returns:
+            List[WordleResult]: a list of results
+        """
+        now = datetime.datetime.now()
+
+        self.__reset_on_new_range(start, end)
+
+        if self.__wordle_cache and (now - self.__wordle_cache_time).total_seconds() < 3600:
+            return self.__wordle_cache
+
+        self.__wordle_cache = [
+            r for r in self.wordle_results.get_results(guild_id, start, end, self.__user_id_cache)
+            if r["user_id"] not in BOT_IDS
+        ]
+        self.__wordle_cache_time = now
+        return self.__wordle_cache
+
     def get_reactions(self, guild_id: int, start: datetime.datetime, end: datetime.datetime) -> List[Message]:
         """Internal method to query for messages between a certain date
         Will cache the messages on first parse and return the cache if cache was set less than an hour ago
@@ -294,8 +377,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__reactions_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__reactions_cache and (now - self.__reactions_cache_time).total_seconds() < 3600:
             return self.__reactions_cache
@@ -324,8 +406,7 @@ class StatsDataCache:
         """
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__emoji_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__emoji_cache and (now - self.__emoji_cache_time).total_seconds() < 3600:
             return self.__emoji_cache
@@ -364,8 +445,7 @@ class StatsDataCache:
 
         now = datetime.datetime.now()
 
-        if start != self.__start_cache or end != self.__end_cache:
-            self.__reply_cache = []
+        self.__reset_on_new_range(start, end)
 
         if self.__reply_cache and (now - self.__reply_cache_time).total_seconds() < 3600:
             return self.__reply_cache
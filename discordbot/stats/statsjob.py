@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from discordbot.stats.statsclasses import StatsGatherer
+
+
+class StatsJobCancelled(Exception):
+    """Raised inside the worker when a job has been cancelled or has run out of time"""
+
+
+class StatsJob:
+    """
+    Handle for computing a batch of StatsGatherer methods away from the event loop
+
+    Each step is a tuple of the StatsGatherer method name and the arguments to call it with.
+    The steps are executed sequentially in a worker thread so that the gateway heartbeat is never starved.
+    Callers `await job.run()` to get a dict of method name to result; `job.cancel()` stops the job
+    before the next stat is started.
+    """
+    def __init__(
+        self,
+        name: str,
+        gatherer: StatsGatherer,
+        steps: List[Tuple[str, tuple]],
+        logger,
+        time_budget: Optional[float] = None
+    ):
+        """
+        :param name: name of the job, used for logging
+        :param gatherer: the StatsGatherer to call the methods on
+        :param steps: list of (method name, args) tuples to compute
+        :param logger: logger
+        :param time_budget: the max number of seconds the job is allowed to take, or None for no limit
+        """
+        self.name = name
+        self.gatherer = gatherer
+        self.steps = steps
+        self.logger = logger
+        self.time_budget = time_budget
+
+        self.results = {}  # type: Dict[str, Any]
+        self.timings = {}  # type: Dict[str, float]
+        self._cancelled = threading.Event()
+        self._deadline = None  # type: Optional[float]
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """
+        :return: tuple of completed steps and total steps
+        """
+        return len(self.results), len(self.steps)
+
+    def cancel(self) -> None:
+        """
+        Flags the job as cancelled. The worker will stop before starting the next stat.
+        :return: None
+        """
+        if not self._cancelled.is_set():
+            self.logger.info(f"Cancelling stats job '{self.name}' at {self.progress}")
+        self._cancelled.set()
+
+    def _check(self) -> None:
+        if self._cancelled.is_set():
+            raise StatsJobCancelled(f"Stats job '{self.name}' was cancelled")
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self._cancelled.set()
+            raise StatsJobCancelled(f"Stats job '{self.name}' exceeded its time budget of {self.time_budget}s")
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Synchronously computes all the steps. This is what gets executed in the worker.
+        :return: dict of method name to the result of that method
+        """
+        if self.time_budget is not None:
+            self._deadline = time.monotonic() + self.time_budget
+
+        job_start = time.monotonic()
+        total = len(self.steps)
+        for method_name, args in self.steps:
+            self._check()
+            start = time.monotonic()
+            self.results[method_name] = getattr(self.gatherer, method_name)(*args)
+            self.timings[method_name] = time.monotonic() - start
+            self.logger.info(
+                f"[{self.name}] {len(self.results)}/{total} {method_name} took {self.timings[method_name]:.2f}s"
+            )
+
+        self.logger.info(f"Stats job '{self.name}' computed {total} stats in {time.monotonic() - job_start:.2f}s")
+        return self.results
+
+    async def run(self, executor=None) -> Dict[str, Any]:
+        """
+        Runs the job in a worker and waits for it to finish.
+        If the awaiting task is cancelled, or the time budget is hit, the job is cancelled too.
+
+        :param executor: optional executor to use, defaults to the loop's default thread pool
+        :return: dict of method name to the result of that method
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, self.compute)
+        try:
+            # give the worker a little grace so the deadline check inside it wins the race
+            timeout = self.time_budget + 5 if self.time_budget is not None else None
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.cancel()
+            raise StatsJobCancelled(f"Stats job '{self.name}' exceeded its time budget of {self.time_budget}s")
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
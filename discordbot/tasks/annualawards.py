@@ -1,9 +1,10 @@
 import datetime
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_SERVER_ID
+from discordbot.scheduler import get_scheduler
 from discordbot.stats.awardsbuilder import AwardsBuilder
 
 
@@ -13,24 +14,23 @@ class AnnualBSEddiesAwards(commands.Cog):
         self.logger = logger
         self.guilds = guilds
 
-        self.annual_bseddies_awards.start()
+        # we only want to trigger on the first of each YEAR
+        # and also trigger at 2pm
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register(
+            "annual_bseddies_awards", "0 14 1 1 *", self.annual_bseddies_awards, grace=datetime.timedelta(hours=9)
+        )
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.annual_bseddies_awards.cancel()
+        self.scheduler.unregister("annual_bseddies_awards")
 
-    @tasks.loop(minutes=60)
     async def annual_bseddies_awards(self):
         now = datetime.datetime.now()
 
-        if not now.day == 1 or not now.hour == 14 or not now.month == 1:
-            # we only want to trigger on the first of each YEAR
-            # and also trigger at 2pm
-            return
-
         if BSE_SERVER_ID not in self.guilds:
             # does not support other servers yet
             return
@@ -51,11 +51,3 @@ class AnnualBSEddiesAwards(commands.Cog):
         )
 
         self.logger.info("Sent messages! Until next year!")
-
-    @annual_bseddies_awards.before_loop
-    async def before_thread_mute(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
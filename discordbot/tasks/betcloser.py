@@ -3,7 +3,9 @@ import datetime
 import discord
 from discord.ext import tasks, commands
 
+from discordbot.dmqueue import get_dm_queue
 from discordbot.embedmanager import EmbedManager
+from discordbot.guildrunner import GuildRunner
 from discordbot.views import BetView
 from mongo.bsepoints import UserBets
 
@@ -15,6 +17,8 @@ class BetCloser(commands.Cog):
         self.user_bets = UserBets()
         self.logger = logger
         self.embed_manager = EmbedManager(self.logger)
+        self.dm_queue = get_dm_queue(bot, logger)
+        self.runner = GuildRunner("bet_closer", logger)
         self.bet_closer.start()
 
         self.place = place
@@ -34,36 +38,37 @@ class BetCloser(commands.Cog):
         If they have expired - they get closed.
         :return:
         """
+        await self.runner.run(self.guilds, self.close_expired_bets)
+
+    async def close_expired_bets(self, guild: int):
+        """
+        Closes the guild's active bets that have expired
+        :param guild: the guild ID
+        :return:
+        """
         now = datetime.datetime.now()
-        for guild in self.guilds:
-            guild_obj = self.bot.get_guild(guild)  # type: discord.Guild
-            active = self.user_bets.get_all_active_bets(guild)
-            for bet in active:
-                if timeout := bet.get("timeout"):
-                    if timeout > now:
-                        continue
-                    # set the bet to no longer active ??
-                    self.user_bets.update({"_id": bet["_id"]}, {"$set": {"active": False}})
-                    member = guild_obj.get_member(bet["user"])
-                    channel = await guild_obj.fetch_channel(bet["channel_id"])
-                    message = await channel.fetch_message(bet["message_id"])  # type: discord.Message
-                    bet["active"] = False
+        guild_obj = self.bot.get_guild(guild)  # type: discord.Guild
+        active = self.user_bets.get_all_active_bets(guild)
+        for bet in active:
+            if timeout := bet.get("timeout"):
+                if timeout > now:
+                    continue
+                # set the bet to no longer active ??
+                self.user_bets.update({"_id": bet["_id"]}, {"$set": {"active": False}})
+                channel = await guild_obj.fetch_channel(bet["channel_id"])
+                message = await channel.fetch_message(bet["message_id"])  # type: discord.Message
+                bet["active"] = False
 
-                    embed = self.embed_manager.get_bet_embed(guild_obj, bet["bet_id"], bet)
-                    bet_view = BetView(bet, self.place, self.close)
+                embed = self.embed_manager.get_bet_embed(guild_obj, bet["bet_id"], bet)
+                bet_view = BetView(bet, self.place, self.close)
 
-                    # disable bet button
-                    bet_view.children[0].disabled = True
+                # disable bet button
+                bet_view.children[0].disabled = True
 
-                    await message.edit(embed=embed, view=bet_view)
-                    msg = (f"Your bet `{bet['bet_id']} - {bet['title']}` (<{message.jump_url}>) "
-                           f"is now closed for bets and is waiting a result from you.")
-                    if not member.dm_channel:
-                        await member.create_dm()
-                    try:
-                        await member.send(content=msg)
-                    except discord.errors.Forbidden:
-                        pass
+                await message.edit(embed=embed, view=bet_view)
+                msg = (f"Your bet `{bet['bet_id']} - {bet['title']}` (<{message.jump_url}>) "
+                       f"is now closed for bets and is waiting a result from you.")
+                self.dm_queue.enqueue(guild, bet["user"], msg)
 
     @bet_closer.before_loop
     async def before_bet_closer(self):
@@ -3,6 +3,7 @@ import datetime
 import discord
 from discord.ext import tasks, commands
 
+from discordbot.guildrunner import GuildRunner
 from mongo.bsepoints import UserBets
 
 
@@ -12,6 +13,7 @@ class BetReminder(commands.Cog):
         self.guilds = guilds
         self.user_bets = UserBets()
         self.logger = logger
+        self.runner = GuildRunner("bet_reminder", logger)
         self.bet_reminder.start()
 
     def cog_unload(self):
@@ -27,34 +29,41 @@ class BetReminder(commands.Cog):
         Loop that takes all our active bets and sends a reminder message
         :return:
         """
+        await self.runner.run(self.guilds, self.remind_bets)
+
+    async def remind_bets(self, guild: int):
+        """
+        Sends a reminder for the guild's long running bets that have about a day left
+        :param guild: the guild ID
+        :return:
+        """
         now = datetime.datetime.now()
-        for guild in self.guilds:
-            guild_obj = self.bot.get_guild(guild)  # type: discord.Guild
-            active = self.user_bets.get_all_active_bets(guild)
-            for bet in active:
-                timeout = bet["timeout"]
-                created = bet["created"]
-                if (timeout - created).total_seconds() <= 172800:
-                    continue
+        guild_obj = self.bot.get_guild(guild)  # type: discord.Guild
+        active = self.user_bets.get_all_active_bets(guild)
+        for bet in active:
+            timeout = bet["timeout"]
+            created = bet["created"]
+            if (timeout - created).total_seconds() <= 172800:
+                continue
 
-                if now > timeout:
-                    continue
+            if now > timeout:
+                continue
 
-                diff = timeout - now
-                if 82800 <= diff.total_seconds() <= 86400:
-                    # ~ 24 hours to go!
-                    # send reminder here
-                    channel = await guild_obj.fetch_channel(bet["channel_id"])
-                    message = await channel.fetch_message(bet["message_id"])
+            diff = timeout - now
+            if 82800 <= diff.total_seconds() <= 86400:
+                # ~ 24 hours to go!
+                # send reminder here
+                channel = await guild_obj.fetch_channel(bet["channel_id"])
+                message = await channel.fetch_message(bet["message_id"])
 
-                    num_betters = len(bet["betters"].keys())
-                    eddies_bet = self.user_bets.count_eddies_for_bet(bet)
+                num_betters = len(bet["betters"].keys())
+                eddies_bet = self.user_bets.count_eddies_for_bet(bet)
 
-                    msg = (
-                        "Only roughly twenty four hours to get in on this bet!\n"
-                        f"Current there's `{eddies_bet}` eddies on the line from **{num_betters}** betters."
-                    )
-                    await message.reply(content=msg)
+                msg = (
+                    "Only roughly twenty four hours to get in on this bet!\n"
+                    f"Current there's `{eddies_bet}` eddies on the line from **{num_betters}** betters."
+                )
+                await message.reply(content=msg)
 
     @bet_reminder.before_loop
     async def before_bet_reminder(self):
@@ -1,9 +1,10 @@
 import datetime
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_SERVER_ID, BSEDDIES_REVOLUTION_CHANNEL
+from discordbot.scheduler import get_scheduler
 
 
 class Celebrations(commands.Cog):
@@ -11,61 +12,49 @@ class Celebrations(commands.Cog):
         self.bot = bot
         self.logger = logger
         self.guilds = guilds
-        self.celebrations.start()
+
+        # the messages are only worth sending on the day itself
+        self.scheduler = get_scheduler(bot, logger)
+        self.jobs = {
+            "celebration_christmas": ("15 8 25 12 *", self.christmas, datetime.timedelta(hours=15)),
+            "celebration_new_year": ("0 0 1 1 *", self.new_year, datetime.timedelta(hours=23)),
+            "celebration_birthday": ("0 10 11 2 *", self.birthday, datetime.timedelta(hours=13)),
+        }
+        for name, (spec, callback, grace) in self.jobs.items():
+            self.scheduler.register(name, spec, callback, grace=grace)
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled jobs.
         :return:
         """
-        self.celebrations.cancel()
+        for name in self.jobs:
+            self.scheduler.unregister(name)
 
-    @tasks.loop(minutes=15)
-    async def celebrations(self):
+    async def _send(self, msg: str) -> None:
         """
         Send celebration message
+        :param msg:
         :return:
         """
-        now = datetime.datetime.now()
-
         if BSE_SERVER_ID not in self.guilds:
             return
 
-        if now.month == 12 and now.day == 25:
-            # christmas day!!
-            if now.hour != 8 or not (15 <= now.minute < 30):
-                # already in christmas day - can exit func safely
-                return
-            # now we can send message!
-            msg = "Merry Christmas to my favourite server ❤️🎄"
-            channel = await self.bot.fetch_channel(BSEDDIES_REVOLUTION_CHANNEL)
-            await channel.send(content=msg)
+        channel = await self.bot.fetch_channel(BSEDDIES_REVOLUTION_CHANNEL)
+        await channel.send(content=msg)
 
-        if now.month == 1 and now.day == 1:
-            # new years day!!
-            if now.hour != 0 or not (0 <= now.minute < 15):
-                # already in NY so we can exit func safely
-                return
-            # now we can send message!
-            msg = f"Happy New Year! May you be blessed with many eddies in {now.year}! 🎆🎉💋"
-            channel = await self.bot.fetch_channel(BSEDDIES_REVOLUTION_CHANNEL)
-            await channel.send(content=msg)
+    async def christmas(self):
+        # christmas day!!
+        await self._send("Merry Christmas to my favourite server ❤️🎄")
 
-        if now.month == 2 and now.day == 11:
-            # my birthday!!
-            if now.hour != 10 or not (0 <= now.minute < 15):
-                # already in birthday so can exit func safely
-                return
-            birth_year = self.bot.user.created_at.year
-            age = now.year - birth_year
-            msg = f"It's my birthday today and I am `{age}` years old! 🍰🧁"
-            channel = await self.bot.fetch_channel(BSEDDIES_REVOLUTION_CHANNEL)
-            await channel.send(content=msg)
+    async def new_year(self):
+        # new years day!!
+        now = datetime.datetime.now()
+        await self._send(f"Happy New Year! May you be blessed with many eddies in {now.year}! 🎆🎉💋")
 
-    @celebrations.before_loop
-    async def before_celebrations(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
+    async def birthday(self):
+        # my birthday!!
+        now = datetime.datetime.now()
+        birth_year = self.bot.user.created_at.year
+        age = now.year - birth_year
+        await self._send(f"It's my birthday today and I am `{age}` years old! 🍰🧁")
@@ -1,10 +1,10 @@
-import datetime
 import random
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import VALORANT_CHAT, VALORANT_ROLE, BSE_SERVER_ID
+from discordbot.scheduler import get_scheduler
 
 
 class AfterWorkVally(commands.Cog):
@@ -12,7 +12,10 @@ class AfterWorkVally(commands.Cog):
         self.bot = bot
         self.logger = logger
         self.guilds = guilds
-        self.vally_message.start()
+
+        # weekdays at quarter to four - no point sending it late
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register("vally_message", "45 15 * * 0-4", self.vally_message, catch_up=False)
 
         self.messages = [
             "Anyone playing after-work {role} today?",
@@ -26,25 +29,16 @@ class AfterWorkVally(commands.Cog):
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.vally_message.cancel()
+        self.scheduler.unregister("vally_message")
 
-    @tasks.loop(minutes=10)
     async def vally_message(self):
         """
-        Loop that makes sure the King is assigned correctly
+        Sends the after-work vally message
         :return:
         """
-        now = datetime.datetime.now()
-
-        if now.weekday() not in [0, 1, 2, 3, 4]:
-            return
-
-        if now.hour != 15 or not (45 <= now.minute <= 54):
-            return
-
         self.logger.info("Time to send vally message!")
 
         if BSE_SERVER_ID not in self.guilds:
@@ -59,11 +53,3 @@ class AfterWorkVally(commands.Cog):
 
         self.logger.info(f"Sending daily vally message: {message}")
         await channel.send(content=message)
-
-    @vally_message.before_loop
-    async def before_vally_message(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
@@ -1,15 +1,17 @@
 import datetime
 import math
-import re
 from collections import Counter
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.bot_enums import TransactionTypes
 from discordbot.constants import CREATOR, MESSAGE_TYPES, MESSAGE_VALUES, WORDLE_VALUES, HUMAN_MESSAGE_TYPES
 from discordbot.constants import GENERAL_CHAT
-from mongo.bsedataclasses import TaxRate
+from discordbot.dmqueue import get_dm_queue
+from discordbot.guildrunner import GuildRunner
+from discordbot.scheduler import get_scheduler
+from mongo.bsedataclasses import TaxRate, WordleResults
 from mongo.bsepoints import ServerEmojis, UserPoints, UserInteractions
 
 
@@ -28,96 +30,91 @@ class EddieGainMessager(commands.Cog):
         self.user_points = UserPoints()
 
         self.eddie_manager = BSEddiesManager(self.bot, self.logger)
+        self.dm_queue = get_dm_queue(bot, logger)
+        self.runner = GuildRunner("eddie_distributer", logger)
 
-        self.eddie_distributer.start()
+        # if we missed it, still give out the eddies as long as it's the same day
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register(
+            "eddie_distributer", "30 7 * * *", self.eddie_distributer, grace=datetime.timedelta(hours=12)
+        )
 
     def cog_unload(self):
         """
         Stop task method
         :return:
         """
-        self.eddie_distributer.cancel()
+        self.scheduler.unregister("eddie_distributer")
 
-    @tasks.loop(minutes=1)
     async def eddie_distributer(self):
         """
         Opens up our json file of user IDS and loops over them.
         If the user IDs is in the 'The Boys' group - we message them to tell them of their
         daily BSEddies gain.
+        Runs at 7:30 every day.
         :return:
         """
-        now = datetime.datetime.now()
+        await self.runner.run(self.guilds, self.distribute_guild)
 
-        if now.hour != 7 or now.minute != 30:
-            return
-
-        for guild_id in self.guilds:
-            eddie_dict = self.eddie_manager.give_out_eddies(guild_id, real=True)
+    async def distribute_guild(self, guild_id: int):
+        """
+        Gives out the eddies for the guild and messages everyone their daily gain
+        :param guild_id: the guild ID
+        :return:
+        """
+        eddie_dict = self.eddie_manager.give_out_eddies(guild_id, real=True)
 
-            guild = await self.bot.fetch_guild(guild_id)  # type: discord.Guild
+        # use the cached guild so we can look the members up in the cache
+        guild = self.bot.get_guild(guild_id)  # type: discord.Guild
+        if guild is None:
+            guild = await self.bot.fetch_guild(guild_id)
 
-            current_king_id = self.user_points.get_current_king(guild_id)["uid"]
+        current_king_id = self.user_points.get_current_king(guild_id)["uid"]
 
-            msg = "Eddie gain summary:\n"
-            for user_id in eddie_dict:
+        msg = "Eddie gain summary:\n"
+        for user_id in eddie_dict:
 
-                value = eddie_dict[user_id][0]
-                breakdown = eddie_dict[user_id][1]
-                tax = eddie_dict[user_id][2]
+            value = eddie_dict[user_id][0]
+            breakdown = eddie_dict[user_id][1]
+            tax = eddie_dict[user_id][2]
 
-                if value == 0:
-                    continue
+            if value == 0:
+                continue
 
+            user = guild.get_member(int(user_id))  # type: discord.Member
+            if user is None:
                 try:
-                    user = await guild.fetch_member(int(user_id))  # type: discord.Member
+                    user = await guild.fetch_member(int(user_id))
                 except discord.NotFound:
                     msg += f"\n- `{user_id}` :  **{value}** (tax: _{tax}_)"
                     continue
 
-                msg += f"\n- `{user_id}` {user.display_name} :  **{value}** (tax: _{tax}_)"
-                text = f"Your daily salary of BSEDDIES is `{value}` (after tax).\n"
-
-                if user_id == current_king_id:
-                    text += f"You gained an additional `{tax}` from tax gains\n"
-                else:
-                    text += f"You were taxed `{tax}` by the KING.\n"
+            msg += f"\n- `{user_id}` {user.display_name} :  **{value}** (tax: _{tax}_)"
+            text = f"Your daily salary of BSEDDIES is `{value}` (after tax).\n"
 
-                text += "\nThis is based on the following amount of interactivity yesterday:"
-
-                for key in sorted(breakdown):
-                    text += f"\n - `{HUMAN_MESSAGE_TYPES[key]}`  :  **{breakdown[key]}**"
+            if user_id == current_king_id:
+                text += f"You gained an additional `{tax}` from tax gains\n"
+            else:
+                text += f"You were taxed `{tax}` by the KING.\n"
 
-                    if key in ["vc_joined", "vc_streaming"]:
-                        text += " seconds"
+            text += "\nThis is based on the following amount of interactivity yesterday:"
 
-                self.logger.info(f"{user.display_name} is gaining `{value} eddies`")
+            for key in sorted(breakdown):
+                text += f"\n - `{HUMAN_MESSAGE_TYPES[key]}`  :  **{breakdown[key]}**"
 
-                user_dict = self.user_points.find_user(int(user_id), guild.id)
+                if key in ["vc_joined", "vc_streaming"]:
+                    text += " seconds"
 
-                if user_dict.get("daily_eddies"):
-                    self.logger.info(f"Sending message to {user.display_name} for {value}")
-                    try:
-                        await user.send(content=text)
-                    except discord.Forbidden:
-                        continue
+            self.logger.info(f"{user.display_name} is gaining `{value} eddies`")
 
-            user = await guild.fetch_member(CREATOR)  # type: discord.Member
-            try:
-                await user.send(content=msg)
-            except discord.Forbidden:
-                # can't send DM messages to this user
-                self.logger.info(f"{user.display_name} - {msg}")
+            user_dict = self.user_points.find_user(int(user_id), guild.id)
 
-        # next_exec = now.replace(hour=6, minute=0, second=0, microsecond=0).replace(day=now.day + 1)
-        # self.eddie_distributer.change_interval(time=next_exec)
+            if user_dict.get("daily_eddies"):
+                self.logger.info(f"Sending message to {user.display_name} for {value}")
+                self.dm_queue.enqueue(guild.id, user.id, text)
 
-    @eddie_distributer.before_loop
-    async def before_eddie_distributer(self):
-        """
-        We want to make sure the websocket is connected before we start sending requests via it
-        :return:
-        """
-        await self.bot.wait_until_ready()
+        # if the creator doesn't accept DMs the queue logs the summary instead
+        self.dm_queue.enqueue(guild.id, CREATOR, msg)
 
 
 class BSEddiesManager(object):
@@ -129,6 +126,7 @@ class BSEddiesManager(object):
         self.user_points = UserPoints()
         self.server_emojis = ServerEmojis()
         self.tax_rate = TaxRate()
+        self.wordle_results = WordleResults()
         self.bot = bot
         self.logger = logger
 
@@ -325,6 +323,12 @@ class BSEddiesManager(object):
         user_ids = [u["uid"] for u in users]
         user_dict = {u["uid"]: u for u in users}
 
+        # each user's first wordle result yesterday
+        wordle_results = self.wordle_results.get_results(guild_id, start, end)
+        user_wordles = {}
+        for wordle_result in wordle_results:
+            user_wordles.setdefault(wordle_result["user_id"], wordle_result)
+
         eddie_gain_dict = {}
         wordle_messages = []
 
@@ -350,13 +354,8 @@ class BSEddiesManager(object):
                 real
             )
 
-            try:
-                wordle_message = [w for w in user_results if "wordle" in w["message_type"]][0]
-                result = re.search(r"[\dX]/\d", wordle_message["content"]).group()
-                guesses = result.split("/")[0]
-
-                if guesses != "X":
-                    guesses = int(guesses)
+            if wordle_result := user_wordles.get(user):
+                guesses = wordle_result["guesses"] if wordle_result["solved"] else "X"
 
                 wordle_value = WORDLE_VALUES[guesses]
                 eddies_gained += wordle_value
@@ -369,35 +368,19 @@ class BSEddiesManager(object):
                 if guesses != "X":
                     wordle_messages.append((user, guesses))
 
-            except IndexError:
-                # just means we had an error with this
-                pass
-
             if eddies_gained == 0:
                 continue
 
             eddie_gain_dict[user] = [eddies_gained, breakdown]
 
-        # grab the bot's wordle message here
-        results = self.user_interactions.query(
-            {
-                "guild_id": guild_id,
-                "timestamp": {"$gt": start, "$lt": end},
-                "user_id": self.bot.user.id,
-                "channel_id": GENERAL_CHAT,
-                "message_type": "wordle"
-            }
-        )
+        # grab the bot's wordle result here
+        bot_results = [
+            r for r in wordle_results if r["user_id"] == self.bot.user.id and r["channel_id"] == GENERAL_CHAT
+        ]
 
         bot_guesses = 100  # arbitrarily high number
-        if results:
-            bot_message = results[0]
-            bot_result = re.search(r"[\dX]/\d", bot_message["content"]).group()
-            bot_guesses = bot_result.split("/")[0]
-            if bot_guesses != "X":
-                bot_guesses = int(bot_guesses)
-            else:
-                bot_guesses = 100
+        if bot_results and bot_results[0]["solved"]:
+            bot_guesses = bot_results[0]["guesses"]
 
         # do wordle here
         if wordle_messages:
@@ -1,23 +1,47 @@
+import asyncio
+import collections
 import datetime
+from typing import Optional
 
 import discord
 from discord.ext import tasks, commands
 
 from discordbot.bot_enums import ActivityTypes
 from discordbot.constants import BSE_SERVER_ID, BSEDDIES_KING_ROLES, BSEDDIES_REVOLUTION_CHANNEL
-from mongo.bsepoints import UserPoints
+from discordbot.dmqueue import get_dm_queue
+from discordbot.guildrunner import GuildRunner
+from mongo.bsepoints import KingTenures, UserPoints
 from mongo.bseticketedevents import RevolutionEvent
 
 
 class BSEddiesKingTask(commands.Cog):
+    """
+    Makes sure the user with the most eddies is the KING.
+
+    The check is triggered by a change to someone's points (see UserPoints.add_points_listener) and only needs the
+    top of the leaderboard, which comes from an indexed query. There's also a slower loop that checks every guild
+    regardless, as a safety net.
+    """
     def __init__(self, bot: discord.Client, guilds, logger):
         self.bot = bot
         self.user_points = UserPoints()
+        self.king_tenures = KingTenures()
         self.logger = logger
         self.guilds = guilds
         self.events = RevolutionEvent()
+        self.dm_queue = get_dm_queue(bot, logger)
+        self.runner = GuildRunner("king_checker", logger)
+        # the last revolution event for each guild
+        self.recent_events = {}  # type: dict[int, dict]
+
+        self._changed_guilds = set()  # type: set[int]
+        # the King's ID and points for each guild as of the last check
+        self._kings = {}  # type: dict[int, tuple[int, int]]
+        self._locks = collections.defaultdict(asyncio.Lock)  # type: dict[int, asyncio.Lock]
+        UserPoints.add_points_listener(self._points_changed)
+
         self.king_checker.start()
-        self.event = None
+        self.king_trigger.start()
 
     def cog_unload(self):
         """
@@ -25,32 +49,86 @@ class BSEddiesKingTask(commands.Cog):
         :return:
         """
         self.king_checker.cancel()
+        self.king_trigger.cancel()
+        UserPoints.remove_points_listener(self._points_changed)
+
+    def _points_changed(self, guild_id: int, user_id: Optional[int]) -> None:
+        if guild_id not in self.guilds or guild_id in self._changed_guilds:
+            return
+        if user_id is not None and (king := self._kings.get(guild_id)) is not None and user_id != king[0]:
+            # someone other than the King - it only matters if they've got more points than the King now
+            user = self.user_points.find_user(user_id, guild_id, projection={"points": True})
+            if user is None or user["points"] <= king[1]:
+                return
+        self._changed_guilds.add(guild_id)
+
+    @tasks.loop(seconds=5)
+    async def king_trigger(self):
+        """
+        Loop that checks the King for the guilds where someone's points have changed since the last run
+        :return:
+        """
+        guild_ids, self._changed_guilds = self._changed_guilds, set()
+        results = await self.runner.run(guild_ids, self.check_king)
+        for guild_id, checked in results.items():
+            if checked is False:
+                # couldn't check it right now - try again next time
+                self._changed_guilds.add(guild_id)
 
     @tasks.loop(minutes=1)
     async def king_checker(self):
         """
-        Loop that makes sure the King is assigned correctly
+        Loop that makes sure the King is assigned correctly, in case we missed a change
         :return:
         """
-        for guild_id in self.guilds:
+        await self.runner.run(self.guilds, self.check_king)
 
+    def _get_top_user(self, guild: discord.Guild, current_king: Optional[int] = None) -> Optional[dict]:
+        """
+        Gets the user with the most points that's still in the guild. If the current King is tied for the most points,
+        they keep the crown.
+        :param guild: the guild
+        :param current_king: the ID of the current King, if there is one
+        :return: the user dict or None if there isn't one
+        """
+        top_user = None
+        # the top few are almost always still members - only get everyone if they're not
+        for limit in (10, 0):
+            for user in self.user_points.get_top_users(guild.id, limit, projection={"uid": True, "points": True}):
+                if guild.get_member(user["uid"]):
+                    top_user = user
+                    break
+            if top_user is not None:
+                break
+
+        if top_user is not None and current_king is not None and top_user["uid"] != current_king:
+            king = self.user_points.find_user(current_king, guild.id, projection={"uid": True, "points": True})
+            if king is not None and king["points"] >= top_user["points"]:
+                return king
+        return top_user
+
+    async def check_king(self, guild_id: int) -> bool:
+        """
+        Makes sure the King is assigned correctly for the guild
+        :param guild_id: the guild ID
+        :return: whether the check happened (it's skipped during and just after a revolution event)
+        """
+        async with self._locks[guild_id]:
             if events := self.events.get_open_events(guild_id):
                 # ongoing revolution event - not changing the King now
-                self.event = events[0]
-                continue
-            elif self.event is not None:
+                self.recent_events[guild_id] = events[0]
+                return False
+            elif (event := self.recent_events.get(guild_id)) is not None:
                 # there was a recent event
                 now = datetime.datetime.now()
-                expiry_time = self.event["expired"]  # type: datetime.datetime
+                expiry_time = event["expired"]  # type: datetime.datetime
                 if (now - expiry_time).total_seconds() < 120:
                     # only been two minutes since the event - wait
-                    self.logger.info(f"The recent event {self.event} only finished {expiry_time} - waiting...")
-                    continue
-                self.event = None
+                    self.logger.info(f"The recent event {event} only finished {expiry_time} - waiting...")
+                    return False
+                del self.recent_events[guild_id]
 
-            guild_obj = await self.bot.fetch_guild(guild_id)  # type: discord.Guild
-            guild = self.bot.get_guild(guild_id)
-            member_ids = [member.id for member in guild.members]
+            guild = self.bot.get_guild(guild_id)  # type: discord.Guild
 
             role_id = BSEDDIES_KING_ROLES[guild_id]
 
@@ -64,19 +142,21 @@ class BSEddiesKingTask(commands.Cog):
             elif len(role.members) == 1:
                 current_king = role.members[0].id
 
-            users = self.user_points.get_all_users_for_guild(guild_id)
-            users = [u for u in users if not u.get("inactive") and u["uid"] in member_ids]
-            top_user = sorted(users, key=lambda x: x["points"], reverse=True)[0]
+            top_user = self._get_top_user(guild, current_king)
+            if top_user is None:
+                self._kings.pop(guild_id, None)
+                return True
 
+            self._kings[guild_id] = (top_user["uid"], top_user["points"])
             if current_king is not None and top_user["uid"] == current_king:
                 # current king is fine
-                return
+                return True
 
-            new = await guild_obj.fetch_member(top_user["uid"])  # type: discord.Member
+            new = guild.get_member(top_user["uid"])  # type: discord.Member
 
             if current_king is not None and top_user["uid"] != current_king:
                 prev_king_id = current_king
-                current = await guild_obj.fetch_member(current_king)  # type: discord.Member
+                current = guild.get_member(current_king)  # type: discord.Member
                 self.logger.info(f"Removing a king: {current.display_name}")
 
                 await current.remove_roles(role, reason="User is not longer King!")
@@ -84,8 +164,8 @@ class BSEddiesKingTask(commands.Cog):
                 self.user_points.set_king_flag(current_king, guild_id, False)
 
                 message = (f"You have been **DETHRONED** - {new.display_name} is now the "
-                           f"KING of {guild_obj.name}! :crown:")
-                await current.send(content=message)
+                           f"KING of {guild.name}! :crown:")
+                self.dm_queue.enqueue(guild_id, current_king, message)
 
                 activity = {
                     "type": ActivityTypes.KING_LOSS,
@@ -94,6 +174,7 @@ class BSEddiesKingTask(commands.Cog):
                 }
 
                 self.user_points.append_to_activity_history(current_king, guild_id, activity)
+                self.king_tenures.end_tenure(current_king, guild_id, activity["timestamp"])
                 current_king = None
 
             if current_king is None:
@@ -106,18 +187,29 @@ class BSEddiesKingTask(commands.Cog):
                 }
 
                 self.user_points.append_to_activity_history(top_user['uid'], guild_id, activity)
+                self.king_tenures.start_tenure(top_user['uid'], guild_id, activity["timestamp"])
                 await new.add_roles(role, reason="User is now KING!")
 
                 self.user_points.set_king_flag(top_user['uid'], guild_id, True)
 
-                message = f"You are now the KING of {guild_obj.name}! :crown:"
-                await new.send(content=message)
+                message = f"You are now the KING of {guild.name}! :crown:"
+                self.dm_queue.enqueue(guild_id, top_user["uid"], message)
 
                 if guild_id == BSE_SERVER_ID:
                     channel = guild.get_channel(BSEDDIES_REVOLUTION_CHANNEL)
                     msg = f"{new.mention} is now the {role.mention}! 👑"
                     await channel.send(content=msg)
 
+            return True
+
+    @king_trigger.before_loop
+    async def before_king_trigger(self):
+        """
+        Make sure that websocket is open before we starting querying via it.
+        :return:
+        """
+        await self.bot.wait_until_ready()
+
     @king_checker.before_loop
     async def before_king_checker(self):
         """
@@ -1,9 +1,10 @@
 import datetime
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_SERVER_ID
+from discordbot.scheduler import get_scheduler
 from discordbot.stats.awardsbuilder import AwardsBuilder
 
 
@@ -12,24 +13,24 @@ class MonthlyBSEddiesAwards(commands.Cog):
         self.bot = bot
         self.logger = logger
         self.guilds = guilds
-        self.bseddies_awards.start()
+
+        # we only want to trigger on the first of each month
+        # and also trigger at 11am
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register(
+            "monthly_bseddies_awards", "0 11 1 * *", self.bseddies_awards, grace=datetime.timedelta(hours=12)
+        )
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.bseddies_awards.cancel()
+        self.scheduler.unregister("monthly_bseddies_awards")
 
-    @tasks.loop(minutes=60)
     async def bseddies_awards(self):
         now = datetime.datetime.now()
 
-        if not now.day == 1 or not now.hour == 11:
-            # we only want to trigger on the first of each month
-            # and also trigger at 11am
-            return
-
         if BSE_SERVER_ID not in self.guilds:
             # does not support other servers yet
             return
@@ -50,11 +51,3 @@ class MonthlyBSEddiesAwards(commands.Cog):
         )
 
         self.logger.info("Sent messages! Until next month!")
-
-    @bseddies_awards.before_loop
-    async def before_thread_mute(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
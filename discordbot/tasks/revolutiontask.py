@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import functools
 import math
 import random
 
@@ -9,6 +11,8 @@ from apis.giphyapi import GiphyAPI
 from discordbot.bot_enums import TransactionTypes
 from discordbot.constants import BSEDDIES_KING_ROLES, BSEDDIES_REVOLUTION_CHANNEL
 from discordbot.embedmanager import EmbedManager
+from discordbot.guildrunner import GuildRunner
+from discordbot.scheduler import get_scheduler
 from discordbot.views import RevolutionView
 from mongo.bsepoints import UserPoints
 from mongo.bseticketedevents import RevolutionEvent
@@ -16,20 +20,31 @@ from mongo.datatypes import RevolutionEvent as RevolutionEventType
 
 
 class BSEddiesRevolutionTask(commands.Cog):
-    def __init__(self, bot: discord.Client, guilds, logger, giphy_token):
+    def __init__(self, bot: discord.Client, guilds, logger, giphy_api: GiphyAPI):
         self.bot = bot
         self.user_points = UserPoints()
         self.revolutions = RevolutionEvent()
         self.embed_manager = EmbedManager(logger)
         self.logger = logger
         self.guilds = guilds
-        self.giphy_api = GiphyAPI(giphy_token)
-        self.rev_started = False
+        self.giphy_api = giphy_api
+        # the tags of the GIFs we send
+        self.gif_tags = ["celebrate", "revolution", "disappointed"]
+        # the guilds with an event in progress
+        self.started_guilds = set()  # type: set[int]
+        self.runner = GuildRunner("revolution", logger)
+        self._lock = asyncio.Lock()
         self.revolution.start()
 
+        # the event starts at 4pm every Sunday - the loop takes it from there
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register(
+            "start_revolution", "0 16 * * 6", self.start_revolution, grace=datetime.timedelta(minutes=30)
+        )
+
         for guild_id in guilds:
             if _ := self.revolutions.get_open_events(guild_id):
-                self.rev_started = True
+                self.started_guilds.add(guild_id)
 
     def cog_unload(self):
         """
@@ -37,6 +52,14 @@ class BSEddiesRevolutionTask(commands.Cog):
         :return:
         """
         self.revolution.cancel()
+        self.scheduler.unregister("start_revolution")
+
+    async def start_revolution(self):
+        """
+        Starts the weekly revolution event
+        :return:
+        """
+        await self.check_events(start=True)
 
     @tasks.loop(minutes=1)
     async def revolution(self):
@@ -44,55 +67,77 @@ class BSEddiesRevolutionTask(commands.Cog):
         Constantly checks to make sure that all events have been closed properly or raised correctly
         :return:
         """
-        now = datetime.datetime.now()
+        await self.check_events()
 
-        if not self.rev_started and (now.weekday() != 6 or now.hour != 16 or now.minute != 0):
-            return
+    async def check_events(self, start: bool = False):
+        """
+        Creates, updates and resolves the events
+        :param start: whether to start a new event if there isn't one
+        :return:
+        """
+        async with self._lock:
+            await self._check_events(start)
 
-        for guild_id in self.guilds:
+    async def _check_events(self, start: bool):
+        if start:
+            guild_ids = self.guilds
+        else:
+            guild_ids = [guild_id for guild_id in self.guilds if guild_id in self.started_guilds]
 
-            king_user = self.user_points.get_current_king(guild_id)
+        if not guild_ids:
+            return
 
-            user_points = king_user["points"]
+        now = datetime.datetime.now()
+        await self.runner.run(guild_ids, functools.partial(self.check_guild_event, now=now))
 
-            if not self.rev_started:
-                event = self.revolutions.create_event(
-                    guild_id,
-                    datetime.datetime.now(),
-                    datetime.datetime.now() + datetime.timedelta(hours=3, minutes=30),
-                    king_user["uid"],
-                    user_points,
-                    BSEDDIES_REVOLUTION_CHANNEL
-                )
-            else:
-                event = self.revolutions.get_open_events(guild_id)[0]
+    async def check_guild_event(self, guild_id: int, now: datetime.datetime):
+        """
+        Creates, updates or resolves the event for the guild
+        :param guild_id: the guild ID
+        :param now: the time of the check
+        :return:
+        """
+        king_user = self.user_points.get_current_king(guild_id)
+
+        user_points = king_user["points"]
+
+        if guild_id not in self.started_guilds:
+            event = self.revolutions.create_event(
+                guild_id,
+                datetime.datetime.now(),
+                datetime.datetime.now() + datetime.timedelta(hours=3, minutes=30),
+                king_user["uid"],
+                user_points,
+                BSEDDIES_REVOLUTION_CHANNEL
+            )
+        else:
+            event = self.revolutions.get_open_events(guild_id)[0]
 
-            self.rev_started = True
+        self.started_guilds.add(guild_id)
 
-            message = event.get("message_id")
-            if message is None:
-                await self.create_event(guild_id, event)
-                continue
+        message = event.get("message_id")
+        if message is None:
+            await self.create_event(guild_id, event)
+            return
 
-            if now > event["expired"]:
-                await self.handle_resolving_bet(guild_id, event)
-                self.logger.info("Changing revolution task interval to 30 minutes.")
-                continue
+        if now > event["expired"]:
+            await self.handle_resolving_bet(guild_id, event)
+            return
 
-            # if (event["expired"] - now).total_seconds() < 10800 and not event.get("three_hours"):
-            #    await self.send_excited_gif(guild_id, event, "Three hours", "three_hours")
+        # if (event["expired"] - now).total_seconds() < 10800 and not event.get("three_hours"):
+        #    await self.send_excited_gif(guild_id, event, "Three hours", "three_hours")
 
-            # elif now.hour == 17 and now.minute == 30 and not event.get("two_hours"):
-            #     await self.send_excited_gif(guild_id, event, "Two hours", "two_hours")
+        # elif now.hour == 17 and now.minute == 30 and not event.get("two_hours"):
+        #     await self.send_excited_gif(guild_id, event, "Two hours", "two_hours")
 
-            elif now.hour == 18 and now.minute == 30 and not event.get("one_hour"):
-                await self.send_excited_gif(guild_id, event, "One hour", "one_hour")
+        elif now.hour == 18 and now.minute == 30 and not event.get("one_hour"):
+            await self.send_excited_gif(guild_id, event, "One hour", "one_hour")
 
-            # elif now.hour == 19 and now.minute == 0 and not event.get("half_hour"):
-            #     await self.send_excited_gif(guild_id, event, "HALF AN HOUR", "half_hour")
+        # elif now.hour == 19 and now.minute == 0 and not event.get("half_hour"):
+        #     await self.send_excited_gif(guild_id, event, "HALF AN HOUR", "half_hour")
 
-            elif now.hour == 19 and now.minute == 15 and not event.get("quarter_house"):
-                await self.send_excited_gif(guild_id, event, "15 MINUTES", "quarter_hour")
+        elif now.hour == 19 and now.minute == 15 and not event.get("quarter_house"):
+            await self.send_excited_gif(guild_id, event, "15 MINUTES", "quarter_hour")
 
     async def send_excited_gif(self, guild_id: int, event: RevolutionEventType, hours_string: str, key: str):
         """
@@ -162,7 +207,7 @@ class BSEddiesRevolutionTask(commands.Cog):
         channels = await guild_obj.fetch_channels()
         channel = [c for c in channels if c.id == channel_id][0]
 
-        self.rev_started = False
+        self.started_guilds.discard(guild_id)
 
         if len(_users) == 0:
             message = "No-one supported or overthrew the King - nothing happens."
@@ -260,3 +305,4 @@ class BSEddiesRevolutionTask(commands.Cog):
         :return:
         """
         await self.bot.wait_until_ready()
+        self.giphy_api.prefetch(self.gif_tags)
@@ -1,9 +1,10 @@
 import datetime
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_SERVER_ID, GENERAL_CHAT
+from discordbot.scheduler import get_scheduler
 from mongo.bsedataclasses import SpoilerThreads
 
 
@@ -14,24 +15,23 @@ class ThreadSpoilerTask(commands.Cog):
         self.guilds = guilds
         self.spoilers = SpoilerThreads()
 
-        self.thread_mute.start()
+        # every morning at 8 - it's still worth sending if we're a bit late
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register("thread_mute", "0 8 * * *", self.thread_mute, grace=datetime.timedelta(hours=4))
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.thread_mute.cancel()
+        self.scheduler.unregister("thread_mute")
 
-    @tasks.loop(minutes=15)
     async def thread_mute(self):
         """
-        Loop that makes sure the King is assigned correctly
+        Sends the mute reminder to the spoiler threads for shows that have a new episode today
         :return:
         """
         now = datetime.datetime.now()
-        if now.hour != 8 or not (0 <= now.minute < 15):
-            return
 
         if BSE_SERVER_ID not in self.guilds:
             return
@@ -73,11 +73,3 @@ class ThreadSpoilerTask(commands.Cog):
             message = "New episode today - remember to mute cuties @everyone xoxo"
             await thread.send(content=message, allowed_mentions=discord.AllowedMentions(everyone=True))
             self.logger.info(f"Sent message to {thread.id}, {thread.name}: {message}")
-
-    @thread_mute.before_loop
-    async def before_thread_mute(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
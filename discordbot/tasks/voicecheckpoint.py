@@ -0,0 +1,42 @@
+import discord
+from discord.ext import tasks, commands
+
+from discordbot.voicesessions import VoiceSessionTable
+
+
+class VoiceSessionCheckpoint(commands.Cog):
+    """
+    Periodically writes the in-progress voice sessions to the DB so not much is lost if we go down
+    """
+    def __init__(self, bot: discord.Client, guilds, logger, sessions: VoiceSessionTable):
+        self.bot = bot
+        self.guilds = guilds
+        self.logger = logger
+        self.sessions = sessions
+        self.voice_checkpoint.start()
+
+    def cog_unload(self):
+        """
+        Method for cancelling the loop.
+        :return:
+        """
+        self.voice_checkpoint.cancel()
+
+    @tasks.loop(minutes=5)
+    async def voice_checkpoint(self):
+        """
+        Loop that checkpoints all the active voice sessions
+        :return:
+        """
+        if not len(self.sessions):
+            return
+        written = self.sessions.checkpoint()
+        self.logger.debug(f"Checkpointed {written} voice sessions")
+
+    @voice_checkpoint.before_loop
+    async def before_voice_checkpoint(self):
+        """
+        Make sure that websocket is open before we start checkpointing
+        :return:
+        """
+        await self.bot.wait_until_ready()
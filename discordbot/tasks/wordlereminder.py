@@ -1,10 +1,11 @@
 import datetime
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_BOT_ID, BSE_SERVER_ID, GENERAL_CHAT
-from mongo.bsepoints import UserInteractions
+from discordbot.scheduler import get_scheduler
+from mongo.bsedataclasses import WordleResults
 
 
 class WordleReminder(commands.Cog):
@@ -12,27 +13,28 @@ class WordleReminder(commands.Cog):
         self.bot = bot
         self.logger = logger
         self.guilds = guilds
-        self.user_interactions = UserInteractions()
-        self.wordle_reminder.start()
+        self.wordle_results = WordleResults()
+
+        # every evening at 7 - still worth reminding people if we're late, as long as it's the same day
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register(
+            "wordle_reminder", "0 19 * * *", self.wordle_reminder, grace=datetime.timedelta(hours=4)
+        )
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.wordle_reminder.cancel()
+        self.scheduler.unregister("wordle_reminder")
 
-    @tasks.loop(minutes=60)
     async def wordle_reminder(self):
         """
-        Loop that makes sure the King is assigned correctly
+        Reminds the people that did yesterday's wordle but haven't done today's
         :return:
         """
         now = datetime.datetime.now()
 
-        if now.hour != 19:
-            return
-
         if BSE_SERVER_ID not in self.guilds:
             return
 
@@ -40,22 +42,12 @@ class WordleReminder(commands.Cog):
         start = start.replace(hour=0, minute=0, second=0, microsecond=1)
         end = start.replace(hour=23, minute=59, second=59)
 
-        wordles_yesterday = self.user_interactions.query(
-            {
-                "message_type": "wordle",
-                "timestamp": {"$gte": start, "$lte": end}
-            }
-        )
+        wordles_yesterday = self.wordle_results.get_results(BSE_SERVER_ID, start, end)
 
         _start = start + datetime.timedelta(days=1)
         _end = end + datetime.timedelta(days=1)
 
-        wordles_today = self.user_interactions.query(
-            {
-                "message_type": "wordle",
-                "timestamp": {"$gte": _start, "$lte": _end}
-            }
-        )
+        wordles_today = self.wordle_results.get_results(BSE_SERVER_ID, _start, _end)
 
         today_ids = [m["user_id"] for m in wordles_today]
 
@@ -94,11 +86,3 @@ class WordleReminder(commands.Cog):
 
             self.logger.info(msg)
             await y_message.reply(content=msg)
-
-    @wordle_reminder.before_loop
-    async def before_wordle_reminder(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
@@ -1,10 +1,12 @@
+import asyncio
 import datetime
 import random
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
 from discordbot.constants import BSE_SERVER_ID, GENERAL_CHAT
+from discordbot.scheduler import get_scheduler
 from discordbot.wordle.wordlesolver import WordleSolver
 from mongo.bsedataclasses import WordleAttempts
 
@@ -14,75 +16,54 @@ class WordleTask(commands.Cog):
         self.bot = bot
         self.logger = logger
         self.guilds = guilds
-        self.wordle_message.start()
         self.wordles = WordleAttempts()
-        self.set_wordle_activity = False
-        self.sent_wordle = False
-        self.wait_iters = None
+
+        # every morning at 8 - we then wait a random amount of time before actually doing it
+        self.scheduler = get_scheduler(bot, logger)
+        self.scheduler.register("wordle_message", "0 8 * * *", self.wordle_message, grace=datetime.timedelta(hours=1))
 
     def cog_unload(self):
         """
-        Method for cancelling the loop.
+        Method for removing the scheduled job.
         :return:
         """
-        self.wordle_message.cancel()
+        self.scheduler.unregister("wordle_message")
+
+    async def _reset_activity(self) -> None:
+        self.logger.info("Setting activity back to default")
+        listening_activity = discord.Activity(
+            name="conversations",
+            state="Listening",
+            type=discord.ActivityType.listening,
+            details="Waiting for commands!"
+        )
+        await self.bot.change_presence(activity=listening_activity, status=discord.Status.online)
 
-    @tasks.loop(minutes=10)
     async def wordle_message(self):
         """
-        Loop that makes sure the King is assigned correctly
+        Does today's wordle and sends the result to the general chat
+        :return:
+        """
+        self.logger.info("Setting wordle activity")
+        game = discord.Game("Wordle")
+        await self.bot.change_presence(status=discord.Status.online, activity=game)
+
+        try:
+            wait = random.randint(1, 6) * 10
+            self.logger.info(f"Waiting {wait} minutes before doing the wordle")
+            await asyncio.sleep(wait * 60)
+
+            await self._solve_and_send()
+        finally:
+            await self._reset_activity()
+
+    async def _solve_and_send(self):
+        """
+        Solves the wordle and sends the share text, with the answer as a spoiler
         :return:
         """
-        now = datetime.datetime.now()
-
-        if now.hour < 8:
-            self.wait_iters = None
-            self.sent_wordle = False
-            self.set_wordle_activity = False
-            return
-
-        if self.sent_wordle and not self.set_wordle_activity:
-            return
-
-        if now.hour >= 10:
-            if self.set_wordle_activity:
-                self.logger.info("Setting activity back to default")
-                listening_activity = discord.Activity(
-                    name="conversations",
-                    state="Listening",
-                    type=discord.ActivityType.listening,
-                    details="Waiting for commands!"
-                )
-                await self.bot.change_presence(activity=listening_activity, status=discord.Status.online)
-                self.set_wordle_activity = False
-
-            return
-
-        if self.sent_wordle:
-            return
-
-        if not self.set_wordle_activity:
-            self.logger.info("Setting wordle activity")
-            game = discord.Game("Wordle")
-            await self.bot.change_presence(status=discord.Status.online, activity=game)
-            self.set_wordle_activity = True
-
-        if self.wait_iters is None:
-            self.wait_iters = random.randint(0, 5)
-            self.logger.info(f"Setting iterations to {self.wait_iters}")
-            return
-
-        if self.wait_iters != 0:
-            self.logger.info("Decrementing countdown...")
-            self.wait_iters -= 1
-            return
-
-        # wait iters is 0
-        assert self.wait_iters == 0
-
-        # actually do wordle now
-
-        wordle_solver = WordleSolver(self.logger)
+        # the first solver can have to build the pattern matrix - keep that off the event loop
+        wordle_solver = await asyncio.to_thread(WordleSolver, self.logger)
         await wordle_solver.get_driver()
 
         self.logger.debug("Solving wordle...")
@@ -92,7 +73,7 @@ class WordleTask(commands.Cog):
         while not solved_wordle.solved and attempts < 5:
             # if we fail - try again as there's some randomness to it
             self.logger.debug(f"Failed wordle - attempting again: {attempts}")
-            wordle_solver = WordleSolver(self.logger)
+            wordle_solver = await asyncio.to_thread(WordleSolver, self.logger)
             await wordle_solver.get_driver()
             solved_wordle = await wordle_solver.solve()
             attempts += 1
@@ -113,23 +94,3 @@ class WordleTask(commands.Cog):
             await sent_message.reply(content=spoiler_message)
 
         self.wordles.document_wordle(BSE_SERVER_ID, solved_wordle)
-
-        self.sent_wordle = True
-
-        self.logger.info("Setting activity back to default")
-        listening_activity = discord.Activity(
-            name="conversations",
-            state="Listening",
-            type=discord.ActivityType.listening,
-            details="Waiting for commands!"
-        )
-        await self.bot.change_presence(activity=listening_activity, status=discord.Status.online)
-        self.set_wordle_activity = False
-
-    @wordle_message.before_loop
-    async def before_wordle_message(self):
-        """
-        Make sure that websocket is open before we starting querying via it.
-        :return:
-        """
-        await self.bot.wait_until_ready()
@@ -3,6 +3,12 @@ import discord
 
 
 class BetView(discord.ui.View):
+    """
+    The buttons on a bet message.
+
+    The buttons have fixed custom IDs so the view can be registered against the bet's message with
+    `client.add_view(view, message_id=...)` on startup, without having to edit the message.
+    """
     def __init__(
         self,
         bet: dict,
@@ -14,14 +20,16 @@ class BetView(discord.ui.View):
         self.place = bseddies_place
         self.close = bseddies_close
 
-    @discord.ui.button(label="Place a bet", style=discord.ButtonStyle.blurple, emoji="💰")
+    @discord.ui.button(
+        label="Place a bet", style=discord.ButtonStyle.blurple, emoji="💰", custom_id="bet_place_button"
+    )
     async def place_callback(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
         await self.place.create_bet_view(interaction, [self.bet, ])
 
-    @discord.ui.button(label="Close this bet", style=discord.ButtonStyle.gray)
+    @discord.ui.button(label="Close this bet", style=discord.ButtonStyle.gray, custom_id="bet_close_button")
     async def close_callback(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
         await self.close.create_bet_view(interaction, [self.bet, ])
 
-    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.red, emoji="✖️")
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.red, emoji="✖️", custom_id="bet_cancel_button")
     async def cancel_ballback(self, button: discord.ui.Button, interaction: discord.Interaction) -> None:
         await self.close.cancel_bet(interaction, self.bet["bet_id"])
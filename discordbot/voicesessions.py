@@ -0,0 +1,255 @@
+import dataclasses
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from mongo.bsepoints import UserInteractions
+from mongo.datatypes import VCInteraction
+
+
+# (guild ID, user ID, channel ID)
+VoiceKey = Tuple[int, int, int]
+
+# the statuses we time, mapped to the names of their events
+_STATUSES = {
+    "muted": ("muted", "unmuted"),
+    "deafened": ("deafened", "undeafened"),
+    "streaming": ("streaming", "unstreaming"),
+}
+
+
+@dataclasses.dataclass
+class VoiceSession:
+    """
+    A user's time in a voice channel
+
+    The running timers live here rather than in the DB - `since` holds when each status that's currently on was
+    turned on and `totals` the seconds from the periods that have finished.
+    """
+    doc_id: ObjectId
+    joined: datetime.datetime
+    since: Dict[str, Optional[datetime.datetime]] = dataclasses.field(
+        default_factory=lambda: {status: None for status in _STATUSES}
+    )
+    totals: Dict[str, float] = dataclasses.field(default_factory=lambda: {status: 0.0 for status in _STATUSES})
+    streamed: bool = False
+    pending_events: List[dict] = dataclasses.field(default_factory=list)
+    """Events that haven't been written to the DB yet"""
+
+    @classmethod
+    def from_doc(cls, doc: VCInteraction) -> "VoiceSession":
+        session = cls(doc["_id"], doc["timestamp"], streamed="vc_streaming" in doc["message_type"])
+        for status in _STATUSES:
+            session.since[status] = doc[f"{status}_time"] if doc[status] else None
+            session.totals[status] = doc[f"time_{status}"]
+        return session
+
+    def set_status(self, status: str, value: bool, now: datetime.datetime) -> bool:
+        """
+        Turns one of the statuses on or off
+        :param status: "muted", "deafened" or "streaming"
+        :param value: whether the status is now on
+        :param now: when it changed
+        :return: whether the status actually changed
+        """
+        if value == (self.since[status] is not None):
+            return False
+
+        if value:
+            self.since[status] = now
+        else:
+            self.totals[status] += (now - self.since[status]).total_seconds()
+            self.since[status] = None
+
+        if status == "streaming":
+            self.streamed = True
+        self.pending_events.append({"timestamp": now, "event": _STATUSES[status][0 if value else 1]})
+        return True
+
+    def checkpoint_update(self, now: datetime.datetime) -> dict:
+        """
+        The update that writes everything that's changed since the last checkpoint to the DB.
+        The pending events are kept until `flushed` is called, in case the write fails.
+        :param now: the time of the checkpoint
+        :return: the update dict
+        """
+        update = {"$set": {"checkpoint": now}}
+        for status in _STATUSES:
+            update["$set"][status] = self.since[status] is not None
+            update["$set"][f"{status}_time"] = self.since[status]
+            update["$set"][f"time_{status}"] = self.totals[status]
+
+        if self.pending_events:
+            update["$push"] = {"events": {"$each": list(self.pending_events)}}
+        if self.streamed:
+            update["$addToSet"] = {"message_type": "vc_streaming"}
+        return update
+
+    def flushed(self, events: int) -> None:
+        """
+        Drops the pending events that have been written to the DB
+        :param events: the number of events that were written
+        :return: None
+        """
+        del self.pending_events[:events]
+
+    def close(self, now: datetime.datetime) -> dict:
+        """
+        Ends the session, stopping all the timers
+        :param now: when the user left
+        :return: the update that closes the session's DB document
+        """
+        for status in _STATUSES:
+            if self.since[status] is not None:
+                self.totals[status] += (now - self.since[status]).total_seconds()
+        self.pending_events.append({"timestamp": now, "event": "left"})
+
+        update = self.checkpoint_update(now)
+        update["$set"].update({"active": False, "left": now, "time_in_vc": (now - self.joined).total_seconds()})
+        return update
+
+
+class VoiceSessionTable:
+    """
+    The voice sessions that are in progress, keyed by (guild, user, channel)
+
+    A document is created in userinteractions when a user joins a voice channel and closed off when they leave.
+    Muting, deafening and streaming only change the session in memory - those changes are written to the DB by
+    `checkpoint`, which should be called periodically, and when the session ends.
+
+    If the bot goes down the sessions are rebuilt from the active documents and the guilds' voice states by `restore`.
+    """
+    def __init__(self, logger, user_interactions: UserInteractions = None):
+        """
+        :param logger: logger
+        :param user_interactions: UserInteractions instance to use - creates one if not given
+        """
+        self.logger = logger
+        self.user_interactions = user_interactions if user_interactions is not None else UserInteractions()
+        self.sessions: Dict[VoiceKey, VoiceSession] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def join(self, key: VoiceKey, state: discord.VoiceState, now: datetime.datetime) -> VoiceSession:
+        """
+        Starts a new session
+        :param key: the session key
+        :param state: the user's voice state
+        :param now: when they joined
+        :return: the session
+        """
+        guild_id, user_id, channel_id = key
+        doc_id = self.user_interactions.add_voice_state_entry(
+            guild_id, user_id, channel_id, now, state.self_mute, state.self_deaf, state.self_stream
+        )[0]
+        session = VoiceSession(doc_id, now)
+        session.since.update({
+            "muted": now if state.self_mute else None,
+            "deafened": now if state.self_deaf else None,
+            "streaming": now if state.self_stream else None,
+        })
+        self.sessions[key] = session
+        return session
+
+    def get(self, key: VoiceKey) -> Optional[VoiceSession]:
+        """
+        Gets the session for the key, falling back to the active document in the DB if we don't have it in memory
+        :param key: the session key
+        :return: the session or None if there isn't one
+        """
+        if session := self.sessions.get(key):
+            return session
+
+        guild_id, user_id, channel_id = key
+        if doc := self.user_interactions.find_active_voice_state(guild_id, user_id, channel_id, None):
+            self.sessions[key] = VoiceSession.from_doc(doc)
+            return self.sessions[key]
+        return None
+
+    def toggle(self, key: VoiceKey, state: discord.VoiceState, now: datetime.datetime) -> List[str]:
+        """
+        Brings the session's statuses in line with the voice state
+        :param key: the session key
+        :param state: the user's new voice state
+        :param now: when the state changed
+        :return: the statuses that changed
+        """
+        if not (session := self.get(key)):
+            self.logger.info(f"Couldn't find a voice session for {key}")
+            return []
+
+        values = {"muted": state.self_mute, "deafened": state.self_deaf, "streaming": state.self_stream}
+        return [status for status, value in values.items() if session.set_status(status, value, now)]
+
+    def leave(self, key: VoiceKey, now: datetime.datetime) -> Optional[VoiceSession]:
+        """
+        Ends the session and closes its DB document
+        :param key: the session key
+        :param now: when they left
+        :return: the session or None if there wasn't one
+        """
+        if not (session := self.get(key)):
+            return None
+
+        del self.sessions[key]
+        self.user_interactions.update({"_id": session.doc_id}, session.close(now))
+        return session
+
+    def checkpoint(self, now: datetime.datetime = None) -> int:
+        """
+        Writes the state of all the sessions to the DB in one bulk write
+        :param now: the time of the checkpoint
+        :return: the number of sessions written
+        """
+        now = now or datetime.datetime.now()
+        sessions = [(session, len(session.pending_events)) for session in self.sessions.values()]
+        operations = [UpdateOne({"_id": session.doc_id}, session.checkpoint_update(now)) for session, _ in sessions]
+        self.user_interactions.bulk_write(operations)
+        # only forget the events once they've been written - they'll go with the next checkpoint if the write failed
+        for session, events in sessions:
+            session.flushed(events)
+        return len(operations)
+
+    def restore(self, guild: discord.Guild, now: datetime.datetime = None) -> Dict[str, int]:
+        """
+        Rebuilds the sessions for a guild from its active documents and the current voice states.
+
+        Documents for users that are still in the channel are picked back up, documents for users that left while we
+        weren't listening are closed off at their last checkpoint, and users that joined while we weren't listening
+        get a new session.
+        :param guild: the guild
+        :param now: the current time
+        :return: dict of the number of sessions resumed, closed and started
+        """
+        now = now or datetime.datetime.now()
+        counts = {"resumed": 0, "closed": 0, "started": 0}
+
+        states: Dict[VoiceKey, discord.VoiceState] = {}
+        for channel in guild.voice_channels + guild.stage_channels:
+            for user_id, state in channel.voice_states.items():
+                states[(guild.id, user_id, channel.id)] = state
+
+        for doc in self.user_interactions.get_active_voice_states(guild.id):
+            key = (guild.id, doc["user_id"], doc["channel_id"])
+            if key not in states:
+                self.sessions.pop(key, None)
+                left = doc.get("checkpoint") or doc["timestamp"]
+                self.user_interactions.update({"_id": doc["_id"]}, VoiceSession.from_doc(doc).close(left))
+                counts["closed"] += 1
+                continue
+
+            if key not in self.sessions:
+                self.sessions[key] = VoiceSession.from_doc(doc)
+                counts["resumed"] += 1
+            self.toggle(key, states[key], now)
+
+        for key, state in states.items():
+            if key not in self.sessions:
+                self.join(key, state, now)
+                counts["started"] += 1
+
+        return counts
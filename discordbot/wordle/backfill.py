@@ -0,0 +1,37 @@
+"""
+Rebuilds the 'wordleresults' collection for a guild from the wordle messages in 'userinteractions'.
+OnReadyEvent does this automatically if a guild has no results; this is for re-running it by hand.
+
+Usage:
+    python -m discordbot.wordle.backfill <guild_id> [<guild_id> ...]
+"""
+
+import argparse
+import logging
+import sys
+
+from mongo.bsedataclasses import WordleResults
+from mongo.bsepoints import UserInteractions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("guild_ids", type=int, nargs="+", help="the guilds to backfill")
+    parsed = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("bsebot.backfill")
+
+    user_interactions = UserInteractions()
+    wordle_results = WordleResults()
+    wordle_results.create_indexes()
+
+    for guild_id in parsed.guild_ids:
+        messages = user_interactions.get_all_wordle_messages_for_server(guild_id)
+        created = wordle_results.backfill_from_messages(guild_id, messages)
+        logger.info(f"Backfilled {created} wordle results from {len(messages)} messages for {guild_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
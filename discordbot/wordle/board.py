@@ -0,0 +1,255 @@
+import abc
+import asyncio
+from typing import List, Tuple
+
+from selenium import webdriver
+from selenium.webdriver import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import ElementNotInteractableException, StaleElementReferenceException
+from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as FirefoxService
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from discordbot.wordle.constants import WORDLE_GDPR_ACCEPT_ID, WORDLE_TUTORIAL_CLOSE_CLASS_NAME
+from discordbot.wordle.constants import WORDLE_BOARD_CLASS_NAME, WORDLE_ROWS_CLASS_NAME, WORDLE_URL, WORDLE_FOOTNOTE
+from discordbot.wordle.constants import WORDLE_SETTINGS_BUTTON, WORDLE_GAME_CONTAINER_CLASS_NAME
+from discordbot.wordle.constants import WORDLE_POLL_FREQUENCY, WORDLE_WAIT_TIMEOUT
+
+
+TILE_STATES = ("absent", "present", "correct")
+
+
+def score_guess(guess: str, answer: str) -> List[str]:
+    """Scores a guess against the answer the same way Wordle does
+
+    Args:
+        guess (str): the guessed word
+        answer (str): the answer
+
+    Returns:
+        List[str]: the tile state ("absent", "present" or "correct") of each letter of the guess
+    """
+    states = ["absent"] * len(guess)
+    remaining = {}
+    for idx, letter in enumerate(guess):
+        if answer[idx] == letter:
+            states[idx] = "correct"
+        else:
+            remaining[answer[idx]] = remaining.get(answer[idx], 0) + 1
+
+    for idx, letter in enumerate(guess):
+        if states[idx] != "correct" and remaining.get(letter, 0) > 0:
+            states[idx] = "present"
+            remaining[letter] -= 1
+    return states
+
+
+class WordleBoard(abc.ABC):
+    """
+    The board the WordleSolver plays on
+
+    Subclasses need to implement all of the methods - they can't be created until they do.
+    """
+    @abc.abstractmethod
+    async def open(self) -> None:
+        """Gets the board ready to take guesses"""
+
+    @abc.abstractmethod
+    async def get_wordle_number(self) -> int:
+        """
+        Returns:
+            int: the number of today's wordle
+        """
+
+    @abc.abstractmethod
+    async def submit_word(self, word: str) -> List[str]:
+        """Submits a guess
+
+        Args:
+            word (str): the word to guess
+
+        Returns:
+            List[str]: the tile state ("absent", "present" or "correct") of each letter of the guess
+        """
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Cleans up the board"""
+
+
+class SimulatedWordleBoard(WordleBoard):
+    """
+    A board that scores guesses against a known answer without a browser
+    """
+    def __init__(self, answer: str, wordle_number: int = 0) -> None:
+        self.answer = answer
+        self.wordle_number = wordle_number
+        self.guesses = []  # type: List[str]
+
+    async def open(self) -> None:
+        self.guesses = []
+
+    async def get_wordle_number(self) -> int:
+        return self.wordle_number
+
+    async def submit_word(self, word: str) -> List[str]:
+        self.guesses.append(word)
+        return score_guess(word, self.answer)
+
+    async def close(self) -> None:
+        pass
+
+
+class SeleniumWordleBoard(WordleBoard):
+    """
+    The NYT Wordle page, driven by a headless Chrome
+
+    All the selenium calls are blocking so they're run in a worker thread. Rather than sleeping for a fixed
+    amount of time we wait on the page getting into the state we need (modals closed, tiles revealed).
+    """
+    def __init__(self, logger, url: str = WORDLE_URL) -> None:
+        """
+        :param logger: logger
+        :param url: the page to open - only needs changing to test against a local copy of the page
+        """
+        self.logger = logger
+        self.url = url
+        self.chrome_opts = Options()
+        self.chrome_opts.headless = True
+        self.chrome_opts.add_argument("--no-sandbox")
+        self.driver = None
+        self.action_chain = None
+        self.rows = []  # type: List[WebElement]
+        self.row = 0
+
+    def _wait(self, timeout: float = WORDLE_WAIT_TIMEOUT) -> WebDriverWait:
+        return WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=WORDLE_POLL_FREQUENCY,
+            ignored_exceptions=[StaleElementReferenceException]
+        )
+
+    def _dismiss(self, locator: Tuple[str, str]) -> None:
+        """Clicks the given element if it shows up and waits for it to go away"""
+        try:
+            self._wait(WORDLE_WAIT_TIMEOUT / 2).until(ec.element_to_be_clickable(locator)).click()
+            self._wait().until(ec.invisibility_of_element_located(locator))
+        except TimeoutException:
+            self.logger.debug(f"{locator} didn't show up - carrying on")
+        except (ElementNotInteractableException, StaleElementReferenceException):
+            pass
+
+    def _open(self) -> None:
+        driver = webdriver.Chrome(
+            service=FirefoxService(ChromeDriverManager().install()),
+            options=self.chrome_opts
+        )
+        self.driver = driver
+        driver.get(self.url)
+
+        self._dismiss((By.ID, WORDLE_GDPR_ACCEPT_ID))
+        self._dismiss((By.CLASS_NAME, WORDLE_TUTORIAL_CLOSE_CLASS_NAME))
+
+        self.action_chain = ActionChains(self.driver)
+        self._wait().until(ec.visibility_of_element_located((By.CLASS_NAME, WORDLE_BOARD_CLASS_NAME)))
+
+    async def open(self) -> None:
+        """
+        Gets the necessary driver using the driver manager (downloads and installs if necessary)
+        Creates a WebDriver object
+        Navigates to wordle web page
+        Clears GDPR and tutorial
+        """
+        await asyncio.to_thread(self._open)
+
+    @staticmethod
+    def _get_rows(board: WebElement) -> list[WebElement]:
+        rows = board.find_elements(By.CLASS_NAME, WORDLE_ROWS_CLASS_NAME)
+        return rows
+
+    @staticmethod
+    def _get_row_state(row: WebElement) -> list[str]:
+        children = row.find_elements(By.XPATH, ".//*")
+        responses = []
+        for child in children:
+            ds = child.get_attribute("data-state")
+            if ds is not None:
+                responses.append(ds)
+        return responses
+
+    @staticmethod
+    def _row_revealed(row: WebElement) -> bool:
+        """Whether all the tiles in the row have been flipped over"""
+        tiles = [child for child in row.find_elements(By.XPATH, ".//*") if child.get_attribute("data-state")]
+        return bool(tiles) and all(
+            tile.get_attribute("data-state") in TILE_STATES
+            and tile.get_attribute("data-animation") in (None, "idle")
+            for tile in tiles
+        )
+
+    def _get_board(self) -> WebElement:
+        board = self.driver.find_element(By.CLASS_NAME, WORDLE_BOARD_CLASS_NAME)
+        return board
+
+    def _get_wordle_number(self) -> int:
+        footnote_locator = (By.CLASS_NAME, WORDLE_FOOTNOTE)
+        self.driver.find_element(By.ID, WORDLE_SETTINGS_BUTTON).click()
+        footnote = self._wait().until(ec.visibility_of_element_located(footnote_locator))
+        # the number is rendered after the modal opens
+        number_div = self._wait().until(
+            lambda _: len(divs := footnote.find_elements(By.TAG_NAME, "div")) > 1 and divs[1].text.strip() and divs[1]
+        )
+        wordle_number = number_div.text.strip().strip("#")
+        self.action_chain.send_keys(Keys.ESCAPE).perform()
+        self._wait().until(ec.invisibility_of_element_located(footnote_locator))
+        return int(wordle_number)
+
+    async def get_wordle_number(self) -> int:
+        """Gets the wordle number from the footnote
+
+        Returns:
+            int: the wordle number
+        """
+        return await asyncio.to_thread(self._get_wordle_number)
+
+    def _focus(self) -> None:
+        board = self._get_board()
+        self.rows = self._get_rows(board)
+        # doing a click to focus the stuff
+        try:
+            board.click()
+        except ElementClickInterceptedException:
+            self.logger.debug("Failed to press board - clicking container instead")
+            container = self.driver.find_element(By.CLASS_NAME, WORDLE_GAME_CONTAINER_CLASS_NAME)
+            container.click()
+
+    def _submit_word(self, word: str) -> List[str]:
+        if not self.rows:
+            self._focus()
+        row = self.rows[self.row]
+        self.action_chain.send_keys(word).perform()
+        self.action_chain.send_keys(Keys.ENTER).perform()
+        try:
+            # wait for the animations
+            self._wait().until(lambda _: self._row_revealed(row))
+        except TimeoutException:
+            self.logger.warning(f"Row {self.row} wasn't revealed after guessing {word}")
+        state = self._get_row_state(row)
+        self.row += 1
+        return state
+
+    async def submit_word(self, word: str) -> List[str]:
+        return await asyncio.to_thread(self._submit_word, word)
+
+    def _close(self) -> None:
+        self.driver.close()
+        self.driver = None
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
@@ -1,3 +1,5 @@
+import os
+
 WORDLE_URL = "https://www.nytimes.com/games/wordle/index.html"
 
 WORDLE_GDPR_ACCEPT_ID = "pz-gdpr-btn-accept"
@@ -6,6 +8,19 @@ WORDLE_FOOTNOTE = "Settings-module_footnote__UtMtH"
 WORDLE_SETTINGS_BUTTON = "settings-button"
 WORDLE_BOARD_CLASS_NAME = "Board-module_board__lbzlf"
 WORDLE_ROWS_CLASS_NAME = "Row-module_row__dEHfN"
+WORDLE_GAME_CONTAINER_CLASS_NAME = "App-module_gameContainer__EvHiJ"
+
+# how long (in seconds) to wait for the page to get into the state we want and how often to check
+WORDLE_WAIT_TIMEOUT = 10
+WORDLE_POLL_FREQUENCY = 0.1
+
+WORDLE_WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle_guesses")
+# ~220MB so it's not in the repo or the docker image - it's built the first time it's needed if it's missing
+# (about a minute) or up front with `python -m discordbot.wordle.entropy`
+# the docker image points this at a volume so it's only built once rather than on every deploy
+WORDLE_PATTERNS_FILE = os.environ.get(
+    "WORDLE_PATTERNS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle_patterns.npy")
+)
 
 WORDLE_STARTING_WORDS = [
     "adieu",
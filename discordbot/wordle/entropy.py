@@ -0,0 +1,237 @@
+"""
+Entropy based Wordle solving engine
+
+The engine works off a precomputed guesses x answers matrix of feedback patterns.
+Each pattern is the tile states of a guess against an answer encoded in base 3 (absent = 0, present = 1,
+correct = 2 with the first letter as the least significant digit) so all 3^5 patterns fit in a uint8.
+Every word in `wordle_guesses` is both a possible guess and a possible answer so the matrix is square.
+
+The matrix is too big to keep in the repo so it's built when the docker image is built with:
+    python -m discordbot.wordle.entropy
+
+and memory-mapped when the solver is created. If it's missing (or was built from a different word list) it's built
+and saved the first time it's needed, which takes a while - so create the solver off the event loop.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from discordbot.wordle.constants import WORDLE_PATTERNS_FILE
+
+
+PATTERN_COUNT = 3 ** 5
+SOLVED_PATTERN = PATTERN_COUNT - 1
+
+TILE_VALUES = {"absent": 0, "present": 1, "correct": 2}
+
+# max number of (guess, candidate) pairs to score at once - keeps memory use down on the first guesses
+_CHUNK_PAIRS = 4_000_000
+
+_PATTERNS: Dict[str, np.ndarray] = {}
+_DECISIONS: Dict[tuple, str] = {}
+
+
+def encode_states(states: Iterable[str]) -> int:
+    """Encodes a row of tile states ("absent", "present", "correct") as a pattern
+
+    Args:
+        states (Iterable[str]): the tile states in the order of the letters
+
+    Returns:
+        int: the pattern
+    """
+    return sum(TILE_VALUES[state] * 3 ** idx for idx, state in enumerate(states))
+
+
+def _encode_words(words: List[str]) -> np.ndarray:
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), 5) - ord("a")
+
+
+def compute_patterns(guesses: List[str], answers: List[str]) -> np.ndarray:
+    """Computes the feedback pattern of every guess against every answer
+
+    Repeated letters are scored the same way Wordle does - a letter is only "present" as many times as it appears
+    in the answer outside of the "correct" tiles, from left to right.
+
+    Args:
+        guesses (List[str]): the guesses
+        answers (List[str]): the answers
+
+    Returns:
+        np.ndarray: uint8 array of shape (len(guesses), len(answers))
+    """
+    answer_codes = _encode_words(answers)
+    patterns = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+
+    for row, guess in enumerate(_encode_words(guesses)):
+        correct = answer_codes == guess
+        unmatched = ~correct
+        pattern = (correct * 2).astype(np.uint8) @ (3 ** np.arange(5, dtype=np.uint8))
+        for idx in range(5):
+            letter = guess[idx]
+            # occurrences of this letter in the answer that aren't already matched by a correct tile
+            available = ((answer_codes == letter) & unmatched).sum(axis=1)
+            # occurrences of this letter earlier in the guess that have already been scored as present
+            used = sum(unmatched[:, prev].astype(np.int64) for prev in range(idx) if guess[prev] == letter)
+            present = ~correct[:, idx] & (available > used)
+            pattern += present.astype(np.uint8) * np.uint8(3 ** idx)
+        patterns[row] = pattern
+    return patterns
+
+
+def build_patterns(words: List[str], path: str = WORDLE_PATTERNS_FILE) -> np.ndarray:
+    """Builds the full pattern matrix for the word list and saves it
+
+    The matrix is written to a temporary file first so a half written matrix is never left at `path`.
+
+    Args:
+        words (List[str]): the word list, in the order the solver will use
+        path (str): where to save the matrix
+
+    Returns:
+        np.ndarray: the matrix
+    """
+    patterns = compute_patterns(words, words)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as tmp_file:
+            np.save(tmp_file, patterns)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # we can still use it - it'll just be built again next time
+        logging.getLogger("bsebot").warning(f"Couldn't save the wordle pattern matrix to {path}: {e!r}")
+    return patterns
+
+
+def load_patterns(words: List[str], path: str = WORDLE_PATTERNS_FILE) -> np.ndarray:
+    """Memory-maps the pattern matrix, or builds it if there isn't one for this word list.
+    The matrix is only loaded once per process.
+
+    Args:
+        words (List[str]): the word list the matrix should be for
+        path (str): the path to the matrix
+
+    Returns:
+        np.ndarray: the matrix
+    """
+    if path not in _PATTERNS:
+        patterns = np.load(path, mmap_mode="r") if os.path.exists(path) else None
+        if patterns is None or patterns.shape != (len(words), len(words)):
+            logging.getLogger("bsebot").info(f"Building the wordle pattern matrix for {len(words)} words")
+            patterns = build_patterns(words, path)
+            # map the saved copy rather than keeping the whole matrix in memory
+            saved = np.load(path, mmap_mode="r") if os.path.exists(path) else None
+            if saved is not None and saved.shape == patterns.shape:
+                patterns = saved
+        _PATTERNS[path] = patterns
+    return _PATTERNS[path]
+
+
+class EntropySolver:
+    """
+    Picks guesses that maximise the expected information gained about the answer
+
+    `best_guess` scores every word by the entropy of the distribution of patterns it would produce over the
+    remaining candidates and `update` filters the candidates down to those consistent with the feedback we got.
+    """
+    def __init__(self, words: List[str], patterns: np.ndarray) -> None:
+        """
+        :param words: the word list - must be in the same order as the rows and columns of patterns
+        :param patterns: the guesses x answers pattern matrix
+        """
+        self.words = words
+        self.patterns = patterns
+        self._index = {word: idx for idx, word in enumerate(words)}
+        self._candidates = np.arange(len(words))
+        self._history: List[Tuple[str, int]] = []
+
+    @property
+    def candidates(self) -> List[str]:
+        return [self.words[idx] for idx in self._candidates]
+
+    def reset(self) -> None:
+        self._candidates = np.arange(len(self.words))
+        self._history = []
+
+    def _entropies(self) -> np.ndarray:
+        count = len(self._candidates)
+        entropies = np.empty(len(self.words))
+        # n * log2(n) for every count a pattern can have
+        counts_table = np.arange(count + 1, dtype=np.float64)
+        counts_table[1:] *= np.log2(counts_table[1:])
+
+        chunk = max(1, _CHUNK_PAIRS // count)
+        for start in range(0, len(self.words), chunk):
+            # slicing the rows is a view on the memory-map so only the candidate columns get read
+            patterns = self.patterns[start:start + chunk][:, self._candidates].astype(np.intp)
+            rows = len(patterns)
+            patterns += (np.arange(rows, dtype=np.intp) * PATTERN_COUNT)[:, None]
+            counts = np.bincount(patterns.ravel(), minlength=rows * PATTERN_COUNT).reshape(rows, PATTERN_COUNT)
+            entropies[start:start + rows] = np.log2(count) - counts_table[counts].sum(axis=1) / count
+        return entropies
+
+    def best_guess(self) -> str:
+        """Picks the guess with the highest expected information gain
+
+        Guesses that could be the answer get a bonus of their chance of being it.
+        The decision only depends on the guesses and feedback so far so it's memoised for the process.
+
+        Returns:
+            str: the guess
+        """
+        if len(self._candidates) == 0:
+            raise ValueError("No candidate words left - the feedback was inconsistent with the word list")
+        if len(self._candidates) <= 2:
+            return self.words[self._candidates[0]]
+
+        key = (len(self.words), tuple(self._history))
+        if key not in _DECISIONS:
+            scores = self._entropies()
+            scores[self._candidates] += 1 / len(self._candidates)
+            _DECISIONS[key] = self.words[int(np.argmax(scores))]
+        return _DECISIONS[key]
+
+    def update(self, guess: str, pattern: int) -> int:
+        """Filters the candidates down to the ones that would have given us the pattern for the guess
+
+        Args:
+            guess (str): the word that was guessed
+            pattern (int): the feedback pattern
+
+        Returns:
+            int: the number of candidates left
+        """
+        if guess in self._index:
+            row = self.patterns[self._index[guess], self._candidates]
+        else:
+            row = compute_patterns([guess], self.candidates)[0]
+        self._candidates = self._candidates[row == pattern]
+        self._history.append((guess, pattern))
+        return len(self._candidates)
+
+
+def get_entropy_solver(words: List[str]) -> EntropySolver:
+    """Creates an EntropySolver for the word list, building the pattern matrix if it hasn't been built
+
+    Args:
+        words (List[str]): the word list
+
+    Returns:
+        EntropySolver: the solver
+    """
+    return EntropySolver(words, load_patterns(words))
+
+
+if __name__ == "__main__":
+    from discordbot.wordle.wordlesolver import WordleSolver
+
+    logging.basicConfig(level=logging.INFO)
+    _words = WordleSolver._get_words()
+    _start = time.perf_counter()
+    _matrix = build_patterns(_words)
+    logging.info(f"Built {_matrix.shape} pattern matrix in {time.perf_counter() - _start:.2f}s: {WORDLE_PATTERNS_FILE}")
@@ -0,0 +1,32 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+# same as WORDLE_REGEX but captures the wordle number and the guesses
+WORDLE_RESULT_REGEX = r"Wordle (\d?\d\d\d) ([\dX])/\d\n\n"
+_WORDLE_RESULT_PATTERN = re.compile(WORDLE_RESULT_REGEX)
+
+
+@dataclass
+class ParsedWordle:
+    wordle_num: int
+    guesses: Optional[int]
+    solved: bool
+
+
+def parse_wordle_message(content: str) -> Optional[ParsedWordle]:
+    """Parses a shared wordle result
+
+    Args:
+        content (str): the message content
+
+    Returns:
+        Optional[ParsedWordle]: the result or None if the message isn't a wordle result
+    """
+    if not (match := _WORDLE_RESULT_PATTERN.match(content)):
+        return None
+
+    number, guesses = match.groups()
+    solved = guesses != "X"
+    return ParsedWordle(int(number), int(guesses) if solved else None, solved)
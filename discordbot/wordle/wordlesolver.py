@@ -1,25 +1,14 @@
-import asyncio
-import copy
 import datetime
-import os
 import random
-import re
 from dataclasses import dataclass
 
-from selenium import webdriver
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import ElementNotInteractableException, StaleElementReferenceException
-from selenium.common.exceptions import ElementClickInterceptedException
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as FirefoxService
-from selenium.webdriver.remote.webelement import WebElement
-from webdriver_manager.chrome import ChromeDriverManager
+from discordbot.wordle.board import SeleniumWordleBoard, WordleBoard
+from discordbot.wordle.entropy import encode_states, get_entropy_solver
+from discordbot.wordle.constants import WORDLE_STARTING_WORDS, WORDLE_WORDS_FILE
 
-from discordbot.wordle.constants import WORDLE_GDPR_ACCEPT_ID, WORDLE_TUTORIAL_CLOSE_CLASS_NAME
-from discordbot.wordle.constants import WORDLE_BOARD_CLASS_NAME, WORDLE_ROWS_CLASS_NAME, WORDLE_URL, WORDLE_FOOTNOTE
-from discordbot.wordle.constants import WORDLE_STARTING_WORDS, WORDLE_SETTINGS_BUTTON
+
+# the sorted word list - only read once per process
+_WORDS = []  # type: list[str]
 
 
 @dataclass
@@ -37,45 +26,19 @@ class WordleSolve:
 
 class WordleSolver():
     def __init__(self, logger) -> None:
-        self.firefox_opts = Options()
-        self.firefox_opts.headless = True
-        self.firefox_opts.add_argument("--no-sandbox")
         self.words = self._get_words()
-        self.driver = None
-        self.action_chain = None
+        # builds the pattern matrix the first time if it hasn't been built
+        self.engine = get_entropy_solver(self.words)
+        self.board = None  # type: WordleBoard
         self.possible_words = []
         self.logger = logger
 
     async def get_driver(self) -> None:
         """
-        Gets the necessary driver using the driver manager (downloads and installs if necessary)
-        Creates a WebDriver object
-        Navigates to wordle web page
-        Clears GDPR and tutorial
-
-        Returns:
-            webdriver.Firefox: the instantiated driver
+        Opens the NYT wordle page in a headless browser to solve on
         """
-        driver = webdriver.Chrome(
-            service=FirefoxService(ChromeDriverManager().install()),
-            options=self.firefox_opts
-        )
-        driver.get(WORDLE_URL)
-        await asyncio.sleep(2)
-        try:
-            accept_button = driver.find_element(By.ID, WORDLE_GDPR_ACCEPT_ID)
-            accept_button.click()
-        except (ElementNotInteractableException, StaleElementReferenceException):
-            pass
-
-        try:
-            close_button = driver.find_element(By.CLASS_NAME, WORDLE_TUTORIAL_CLOSE_CLASS_NAME)
-            close_button.click()
-        except (ElementNotInteractableException, StaleElementReferenceException):
-            pass
-
-        self.driver = driver
-        self.action_chain = ActionChains(self.driver)
+        self.board = SeleniumWordleBoard(self.logger)
+        await self.board.open()
 
     @staticmethod
     def _get_words() -> list[str]:
@@ -85,11 +48,10 @@ class WordleSolver():
         Returns:
             _type_: Returns the list of possible words we can guess
         """
-        fp = os.path.abspath(__file__)
-        path = os.path.join(os.path.dirname(fp), "wordle_guesses")
-        with open(path) as f:
-            words = [line.rstrip() for line in f]
-        return sorted(words)
+        if not _WORDS:
+            with open(WORDLE_WORDS_FILE) as f:
+                _WORDS.extend(sorted(line.rstrip() for line in f))
+        return _WORDS
 
     @staticmethod
     def _pick_starting_word() -> str:
@@ -103,100 +65,30 @@ class WordleSolver():
         return starting_worde
 
     def _pick_word_from_list(self) -> str:
-        """Picks a word at random from the word list
+        """Picks the guess with the most expected information
 
         Returns:
             str: _description_
         """
-        word = random.choice(self.possible_words)
-        return word
+        return self.engine.best_guess()
 
-    def _filter_word_list(self, game_state: dict, present_letters: list, correct_letters: list) -> None:
-        """Filters the possible word list based on our current game state
+    async def solve(self) -> WordleSolve:
+        """Solves today's wordle on the board opened by `get_driver`
 
-        Args:
-            game_state (dict): the current game state
+        Returns:
+            WordleSolve: the result
         """
-        new_possible_words = []
-
-        answer_regex = "[{letter}]"
-        not_letters = "[^{letters}]"
-
-        if not self.possible_words:
-            _word_list = copy.deepcopy(self.words)
-        else:
-            _word_list = copy.deepcopy(self.possible_words)
+        return await self.solve_board(self.board)
 
-        regex_search = []
-        for index in game_state:
-            if game_state[index]["answer"]:
-                letter_regex = answer_regex.format(letter=game_state[index]["answer"])
-            else:
-                cannot = game_state[index]["cannot"]
-                _letters = "".join(cannot)
-                letter_regex = not_letters.format(letters=_letters)
-            regex_search.append(letter_regex)
-        pattern = "".join(regex_search)
-
-        for word in _word_list:
-            if re.match(pattern, word):
-                # still need to filter to match 'present' letters
-                for letter in present_letters:
-                    if not word.count(letter) >= (present_letters.count(letter) + correct_letters.count(letter)):
-                        break
-                else:
-                    new_possible_words.append(word)
-        self.possible_words = new_possible_words
-
-    @staticmethod
-    def _get_rows(board: WebElement) -> list[WebElement]:
-        rows = board.find_elements(By.CLASS_NAME, WORDLE_ROWS_CLASS_NAME)
-        return rows
+    async def solve_board(self, board: WordleBoard) -> WordleSolve:
+        """Solves the wordle on the given board and closes it
 
-    @staticmethod
-    def _get_row_state(row: WebElement) -> list[str]:
-        children = row.find_elements(By.XPATH, ".//*")
-        responses = []
-        for child in children:
-            ds = child.get_attribute("data-state")
-            if ds is not None:
-                responses.append(ds)
-        return responses
-
-    def _terminate(self) -> None:
-        self.driver.close()
-        self.driver = None
-
-    def _get_board(self) -> WebElement:
-        board = self.driver.find_element(By.CLASS_NAME, WORDLE_BOARD_CLASS_NAME)
-        return board
-
-    async def _get_wordle_number(self) -> str:
-        """Gets the wordle number from the footnote
+        Args:
+            board (WordleBoard): an opened board
 
         Returns:
-            str: the wordle number
+            WordleSolve: the result
         """
-        settings_button = self.driver.find_element(By.ID, WORDLE_SETTINGS_BUTTON)
-        settings_button.click()
-        await asyncio.sleep(1)
-        footnote = self.driver.find_element(By.CLASS_NAME, WORDLE_FOOTNOTE)
-        div_children = footnote.find_elements(By.TAG_NAME, "div")
-        number_div = div_children[1]
-        wordle_number = number_div.text.strip().strip("#")
-        self.action_chain.send_keys(Keys.ESCAPE).perform()
-        await asyncio.sleep(1)
-        return wordle_number
-
-    async def _submit_word(self, word: str) -> None:
-        self.action_chain.send_keys(word).perform()
-        self.action_chain.send_keys(Keys.ENTER).perform()
-        # wait for animations
-        await asyncio.sleep(3)
-
-    async def solve(self) -> WordleSolve:
-        # wait to load
-        await asyncio.sleep(2)
         solved = False
         row = 0
         actual_word = ["", "", "", "", ""]
@@ -209,17 +101,10 @@ class WordleSolver():
         }
         guesses = []
         emoji_str = ""
-        wordle_number = await self._get_wordle_number()
-
-        board = self._get_board()
-        rows = self._get_rows(board)
-        # doing a click to focus the stuff
-        try:
-            board.click()
-        except ElementClickInterceptedException:
-            self.logger.debug("Failed to press board - clicking container instead")
-            container = self.driver.find_element(By.CLASS_NAME, "App-module_gameContainer__EvHiJ")
-            container.click()
+        wordle_number = await board.get_wordle_number()
+
+        self.possible_words = []
+        self.engine.reset()
 
         while not solved:
             self.logger.info(f"Guess number: {row + 1}")
@@ -234,12 +119,10 @@ class WordleSolver():
 
             self.logger.info(f"Selected {word}")
 
-            await self._submit_word(word)
-            state = self._get_row_state(rows[row])
+            state = await board.submit_word(word)
             idx = 0
             possible_denies = []
             present_letters = []
-            correct_letters = []
             for tile in state:
                 letter = word[idx]
                 if tile == "absent":
@@ -250,7 +133,6 @@ class WordleSolver():
                     # we found a letter!
                     actual_word[idx] = letter
                     game_state[idx]["answer"] = letter
-                    correct_letters.append(letter)
                     emoji_str += "🟩"
                 elif tile == "present":
                     # present somewhere but not where we are
@@ -275,7 +157,8 @@ class WordleSolver():
                 solved = True
                 continue
 
-            self._filter_word_list(game_state, present_letters, correct_letters)
+            self.engine.update(word, encode_states(state))
+            self.possible_words = self.engine.candidates
             self.logger.debug(f"After: {word} - there are {len(self.possible_words)} possible words remaining")
 
             if row == 5:
@@ -284,7 +167,6 @@ class WordleSolver():
                 break
             row += 1
 
-        await asyncio.sleep(1)
         guess_num = "X" if not solved else len(guesses)
         share_text = (
             f"Wordle {wordle_number} {guess_num}/6\n\n"
@@ -292,7 +174,7 @@ class WordleSolver():
         )
 
         self.logger.info(f"Got share text to be: {share_text}")
-        self._terminate()
+        await board.close()
 
         data_class = WordleSolve(
             solved,
@@ -303,7 +185,7 @@ class WordleSolver():
             game_state,
             datetime.datetime.now(),
             share_text,
-            int(wordle_number)
+            wordle_number
         )
 
         return data_class
@@ -2,8 +2,9 @@ from typing import Union
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
+from pymongo.command_cursor import CommandCursor
 from pymongo.cursor import Cursor
-from pymongo.results import UpdateResult
+from pymongo.results import BulkWriteResult, UpdateResult
 
 from mongo import interface
 
@@ -70,6 +71,18 @@ class BaseClass(object):
         rets = interface.update(self.vault, parameters, updated_vals)
         return rets
 
+    def bulk_write(self, operations: list) -> Union[BulkWriteResult, None]:
+        """
+        Applies a list of write operations (InsertOne, UpdateOne, etc) to this class' Collection in one batch.
+        :param operations: list of pymongo write operations
+        :return: BulkWriteResult object or None if there were no operations
+        """
+        if self.vault is None:
+            raise NoVaultError("No vault instantiated.")
+        if not operations:
+            return None
+        return interface.bulk_write(self.vault, operations)
+
     def delete(self, parameters: dict, many: bool = True) -> int:
         """
         Deletes documents based on the given parameters. If many=False, only deletes one else it deletes all matches.
@@ -88,7 +101,8 @@ class BaseClass(object):
             limit: int = 1000,
             projection: dict = None,
             as_gen: bool = False,
-            skip: int = None
+            skip: int = None,
+            sort: list = None
     ) -> Union[list, Cursor]:
         """
         Searches a collection for documents based on given parameters.
@@ -109,11 +123,23 @@ class BaseClass(object):
             projection : dict of keys to return for each result
             as_gen : True returns generator (mongoDB cursor obj) and false returns list of results
             skip: number of items to skip at the start of the result set
+            sort: list of (key, direction) pairs to sort the results by
         Returns a generator (cursor obj) if as_gen else returns a list of results
         """
         if self.vault is None:
             raise NoVaultError("No vault instantiated.")
-        return interface.query(self.vault, parameters, limit, projection, as_gen, skip=skip)
+        return interface.query(self.vault, parameters, limit, projection, as_gen, skip=skip, sort=sort)
+
+    def aggregate(self, pipeline: list, as_gen: bool = False) -> Union[list, CommandCursor]:
+        """
+        Runs an aggregation pipeline on the current collection
+        :param pipeline: list of pipeline stages
+        :param as_gen: True returns generator (mongoDB cursor obj) and false returns list of results
+        :return: the results
+        """
+        if self.vault is None:
+            raise NoVaultError("No vault instantiated.")
+        return interface.aggregate(self.vault, pipeline, as_gen)
 
     def get_collection_names(self) -> Union[None, list]:
         """
@@ -11,10 +11,13 @@ import datetime
 import random
 from typing import Optional, Union
 
+from pymongo import ASCENDING
+
 from discordbot.bot_enums import AwardsTypes, StatTypes
+from discordbot.wordle.parser import ParsedWordle, parse_wordle_message
 from discordbot.wordle.wordlesolver import WordleSolve
 from mongo import interface
-from mongo.datatypes import Thread
+from mongo.datatypes import Message, Thread, WordleResult
 from mongo.db_classes import BestSummerEverPointsDB
 
 
@@ -198,6 +201,37 @@ class CommitHash(BestSummerEverPointsDB):
             return ret[0]
 
 
+class ScheduledJobs(BestSummerEverPointsDB):
+    """
+    Class for interacting with the 'scheduledjobs' MongoDB collection in the 'bestsummereverpoints' DB
+
+    Each document is the last time one of the scheduler's jobs, or one of the one-off jobs like the backfills, ran.
+    """
+    def __init__(self):
+        """
+        Constructor method that initialises the vault object
+        """
+        super().__init__()
+        self._vault = interface.get_collection(self.database, "scheduledjobs")
+
+    def get_last_runs(self) -> dict[str, datetime.datetime]:
+        """
+        Gets the last time each job ran
+        :return: dict of job name to the time it last ran
+        """
+        ret = self.query({}, projection={"_id": False, "name": True, "last_run": True})
+        return {job["name"]: job["last_run"] for job in ret}
+
+    def set_last_run(self, name: str, timestamp: datetime.datetime) -> None:
+        """
+        Records the time a job ran
+        :param name: the name of the job
+        :param timestamp: when it ran
+        :return: None
+        """
+        interface.update(self.vault, {"name": name}, {"$set": {"last_run": timestamp}}, many=False, upsert=True)
+
+
 class Awards(BestSummerEverPointsDB):
     def __init__(self):
         super().__init__()
@@ -298,3 +332,119 @@ class WordleAttempts(BestSummerEverPointsDB):
         doc["timestamp"] = doc["timestamp"].strftime("%Y-%m-%d")
 
         return self.insert(doc)
+
+
+class WordleResults(BestSummerEverPointsDB):
+    """
+    Class for interacting with the 'wordleresults' MongoDB collection in the 'bestsummereverpoints' DB
+
+    Each document is a wordle result somebody posted, parsed once when the message is ingested.
+    """
+    def __init__(self):
+        """
+        Constructor method that initialises the vault object
+        """
+        super().__init__()
+        self._vault = interface.get_collection(self.database, "wordleresults")
+
+    def create_indexes(self) -> None:
+        """
+        Creates the indexes for the date range queries
+        :return: None
+        """
+        self.create_index(
+            [
+                [("guild_id", ASCENDING), ("timestamp", ASCENDING)],
+                [("guild_id", ASCENDING), ("user_id", ASCENDING), ("timestamp", ASCENDING)],
+                "message_id",
+            ]
+        )
+
+    def record_result(
+            self,
+            guild_id: int,
+            user_id: int,
+            message_id: int,
+            channel_id: int,
+            timestamp: datetime.datetime,
+            result: ParsedWordle
+    ) -> None:
+        """
+        Records a wordle result. Recording the same message again just updates it.
+
+        :param guild_id: the guild ID
+        :param user_id: the user who posted the result
+        :param message_id: the message ID of the result
+        :param channel_id: the channel the result was posted in
+        :param timestamp: when the result was posted
+        :param result: the parsed result
+        :return: None
+        """
+        doc = {
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "message_id": message_id,
+            "channel_id": channel_id,
+            "wordle_num": result.wordle_num,
+            "timestamp": timestamp,
+            "guesses": result.guesses,
+            "solved": result.solved,
+        }
+        interface.update(self.vault, {"message_id": message_id}, {"$set": doc}, many=False, upsert=True)
+
+    def get_results(
+            self,
+            guild_id: int,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            user_id: Optional[int] = None
+    ) -> list[WordleResult]:
+        """
+        Gets all the results posted in the given time period, including the start and the end
+
+        :param guild_id: the guild ID
+        :param start: beginning of the time period
+        :param end: end of the time period
+        :param user_id: only get results for this user
+        :return: list of results
+        """
+        params = {"guild_id": guild_id, "timestamp": {"$gte": start, "$lte": end}}
+        if user_id is not None:
+            params["user_id"] = user_id
+        return self.query(params, limit=100000)
+
+    def has_results(self, guild_id: int) -> bool:
+        """
+        :param guild_id: the guild ID
+        :return: whether we have any results for the guild
+        """
+        return bool(self.query({"guild_id": guild_id}, projection={"_id": True}, limit=1))
+
+    def backfill_from_messages(self, guild_id: int, messages: list[Message]) -> int:
+        """
+        Rebuilds the guild's results from the wordle messages in 'userinteractions'
+        Any existing results for the guild are replaced.
+
+        :param guild_id: the guild ID
+        :param messages: list of wordle messages
+        :return: number of results created
+        """
+        results = []
+        for message in messages:
+            if not (result := parse_wordle_message(message["content"])):
+                continue
+            results.append({
+                "guild_id": guild_id,
+                "user_id": message["user_id"],
+                "message_id": message["message_id"],
+                "channel_id": message["channel_id"],
+                "wordle_num": result.wordle_num,
+                "timestamp": message["timestamp"],
+                "guesses": result.guesses,
+                "solved": result.solved,
+            })
+
+        self.delete({"guild_id": guild_id})
+        if results:
+            self.insert(results)
+        return len(results)
@@ -8,20 +8,28 @@ This particular file contains Collection Classes for the 'bestsummereverpoints'
 """
 
 import datetime
-from typing import Union, Optional
+from typing import Callable, Iterable, Iterator, Union, Optional
 
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, InsertOne, UpdateOne
 from pymongo.results import UpdateResult
 
+from discordbot.bot_enums import ActivityTypes, TransactionTypes
 from mongo import interface
-from mongo.datatypes import Bet, Emoji, Message, Sticker, User
+from mongo.datatypes import Bet, Emoji, KingTenure, Message, Sticker, User, VCInteraction
 from mongo.db_classes import BestSummerEverPointsDB
 
 
 class UserPoints(BestSummerEverPointsDB):
     """
     Class for interacting with the 'userpoints' MongoDB collection in the 'bestsummereverpoints' DB
+
+    Anything that needs to know when someone's balance changes can register a listener with `add_points_listener`.
+    Listeners are shared by every instance of the class and are called with the guild ID and user ID (or None if
+    more than one user changed).
     """
+    _points_listeners = []  # type: list[Callable[[int, Optional[int]], None]]
+
     def __init__(self):
         """
         Constructor method that initialises the vault object
@@ -29,6 +37,63 @@ class UserPoints(BestSummerEverPointsDB):
         super().__init__()
         self._vault = interface.get_collection(self.database, "userpoints")
 
+    @classmethod
+    def add_points_listener(cls, listener: Callable[[int, Optional[int]], None]) -> None:
+        """
+        Registers a function to be called whenever a user's points change
+        :param listener: function that takes the guild ID and the user ID (or None if more than one user changed)
+        :return: None
+        """
+        cls._points_listeners.append(listener)
+
+    @classmethod
+    def remove_points_listener(cls, listener: Callable[[int, Optional[int]], None]) -> None:
+        """
+        Unregisters a function added with add_points_listener
+        :param listener: the function
+        :return: None
+        """
+        if listener in cls._points_listeners:
+            cls._points_listeners.remove(listener)
+
+    def _points_changed(self, guild_id: int, user_id: int) -> None:
+        for listener in self._points_listeners:
+            listener(guild_id, user_id)
+
+    def create_indexes(self) -> None:
+        """
+        Creates the indexes for the leaderboard queries
+        :return: None
+        """
+        self.create_index(
+            [
+                [("guild_id", ASCENDING), ("points", DESCENDING)],
+                [("guild_id", ASCENDING), ("high_score", DESCENDING)],
+            ]
+        )
+
+    def get_top_users(
+            self, guild_id: int, limit: int = 10, projection: Optional[dict] = None, key: str = "points"
+    ) -> list[User]:
+        """
+        Gets the active users with the most points in the guild, in descending order
+
+        :param guild_id: int - The guild ID to get users for
+        :param limit: int - The max number of users to get. 0 gets all of them
+        :param projection: the fields to return
+        :param key: str - the field to sort on, "points" or "high_score"
+        :return: list of user dictionaries
+        """
+        if projection is None:
+            projection = {"uid": True, "points": True, "high_score": True}
+
+        return self.query(
+            {"guild_id": guild_id, "inactive": {"$ne": True}},
+            limit=limit,
+            projection=projection,
+            sort=[(key, DESCENDING), ("uid", ASCENDING)]
+        )
+
     def __check_highest_eddie_count(self, user_id: int, guild_id: int):
         """
         Internal function for making sure the user always has the high score set correctly
@@ -106,6 +171,7 @@ class UserPoints(BestSummerEverPointsDB):
         """
         ret = self.update({"uid": user_id, "guild_id": guild_id}, {"$set": {"points": points}})
         self.__check_highest_eddie_count(user_id, guild_id)
+        self._points_changed(guild_id, user_id)
         return ret
 
     def set_pending_points(self, user_id: int, guild_id: int, points: int) -> UpdateResult:
@@ -153,6 +219,7 @@ class UserPoints(BestSummerEverPointsDB):
         ret = self.update({"uid": user_id, "guild_id": guild_id}, {"$inc": {"points": amount}})
         if amount > 0:
             self.__check_highest_eddie_count(user_id, guild_id)
+        self._points_changed(guild_id, user_id)
         return ret
 
     def increment_daily_minimum(self, user_id: int, guild_id: int, amount: int) -> UpdateResult:
@@ -208,19 +275,84 @@ class UserPoints(BestSummerEverPointsDB):
         :param guild_id: int - The guild ID that the user belongs in
         :return: None
         """
-        user_doc = {
+        self.insert(self._new_user_doc(user_id, guild_id, dailies))
+        self._points_changed(guild_id, user_id)
+
+    @staticmethod
+    def _new_user_doc(user_id: int, guild_id: int, dailies: bool, transaction_history: list = None) -> User:
+        return {
             "uid": user_id,
             "guild_id": guild_id,
             "points": 10,
             "pending_points": 0,
             "inactive": False,
             "daily_minimum": 5,
-            "transaction_history": [],
+            "transaction_history": transaction_history or [],
             "daily_eddies": dailies,
             "king": False,
             "high_score": 10
         }
-        self.insert(user_doc)
+
+    def reconcile_guild_members(
+            self, guild_id: int, members: dict[int, bool], bot_ids: Iterable[int] = ()
+    ) -> dict[str, int]:
+        """
+        Brings the users for a guild in line with the guild's current members.
+
+        Loads the users for the guild in one query and works out what's changed against the members:
+         - members without a user document get one created (with the USER_CREATE transaction)
+         - users without the daily eddies toggle get it set to whether they should have it
+         - active users that aren't members any more are marked as inactive (with a SERVER_LEAVE activity)
+        All the changes are then applied with a single bulk write.
+
+        :param guild_id: int - The guild ID to reconcile
+        :param members: dict of member ID to whether they should get the daily eddies messages. Shouldn't include bots
+        :param bot_ids: IDs of the bots in the guild - they don't get users but they haven't left either
+        :return: dict of the number of users created, toggled and inactivated
+        """
+        users = self.get_all_users_for_guild(
+            guild_id, projection={"_id": True, "uid": True, "daily_eddies": True, "inactive": True}
+        )
+        users = {user["uid"]: user for user in users}
+        now = datetime.datetime.now()
+
+        operations = []
+        counts = {"created": 0, "toggled": 0, "inactivated": 0}
+
+        for member_id, dailies in members.items():
+            user = users.get(member_id)
+            if not user:
+                activity = {
+                    "type": TransactionTypes.USER_CREATE,
+                    "amount": 10,
+                    "timestamp": now,
+                    "comment": "User created",
+                }
+                operations.append(InsertOne(self._new_user_doc(member_id, guild_id, dailies, [activity, ])))
+                counts["created"] += 1
+            elif not user.get("daily_eddies") and user.get("daily_eddies") != dailies:
+                operations.append(UpdateOne({"_id": user["_id"]}, {"$set": {"daily_eddies": dailies}}))
+                counts["toggled"] += 1
+
+        for uid, user in users.items():
+            if uid in members or uid in bot_ids or user.get("inactive"):
+                continue
+            operations.append(
+                UpdateOne(
+                    {"_id": user["_id"]},
+                    {
+                        "$set": {"inactive": True},
+                        "$push": {"activity_history": {"type": ActivityTypes.SERVER_LEAVE, "timestamp": now}}
+                    }
+                )
+            )
+            counts["inactivated"] += 1
+
+        self.bulk_write(operations)
+        if counts["created"] or counts["inactivated"]:
+            # the leaderboard is different now
+            self._points_changed(guild_id, None)
+        return counts
 
     def set_daily_eddies_toggle(self, user_id: int, guild_id: int, value: bool) -> None:
         """
@@ -233,6 +365,18 @@ class UserPoints(BestSummerEverPointsDB):
         """
         self.update({"uid": user_id, "guild_id": guild_id}, {"$set": {"daily_eddies": value}})
 
+    def set_inactive(self, user_id: int, guild_id: int, value: bool) -> None:
+        """
+        Sets the "inactive" flag for the given user.
+        Inactive users have left the server and don't show up on the leaderboard.
+        :param user_id: the user id to use
+        :param guild_id: the guild id
+        :param value: bool - whether the user is inactive
+        :return:
+        """
+        self.update({"uid": user_id, "guild_id": guild_id}, {"$set": {"inactive": value}})
+        self._points_changed(guild_id, user_id)
+
     def set_king_flag(self, user_id: int, guild_id: int, value: bool) -> None:
         """
         Sets the 'daily king' toggle for the given user.
@@ -275,6 +419,56 @@ class UserPoints(BestSummerEverPointsDB):
         """
         return self.update({"uid": user_id, "guild_id": guild_id}, {"$push": {"transaction_history": activity}})
 
+    def get_recent_transactions(self, user_id: int, guild_id: int, number: int = 10) -> list[dict]:
+        """
+        Gets the last few items of a user's transaction history, without loading the rest of it.
+        Each item has a "points" key added with the running eddies total after the transaction.
+
+        :param user_id: int - The ID of the user to look for
+        :param guild_id: int - The guild ID that the user belongs in
+        :param number: int - the number of items to get
+        :return: list of transaction history items, oldest first
+        """
+        ret = self.aggregate([
+            {"$match": {"uid": user_id, "guild_id": guild_id}},
+            {"$project": {
+                "_id": False,
+                "recent": {"$slice": ["$transaction_history", -number]},
+                "total": {"$sum": "$transaction_history.amount"}
+            }}
+        ])
+        if not ret:
+            return []
+
+        # work back from the total
+        transactions = ret[0]["recent"]
+        amount = ret[0]["total"]
+        for item in reversed(transactions):
+            item["points"] = amount
+            amount -= item["amount"]
+        return transactions
+
+    def iter_transaction_history(self, user_id: int, guild_id: int, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Iterates through a user's transaction history in order, reading it from the DB in batches
+
+        :param user_id: int - The ID of the user to look for
+        :param guild_id: int - The guild ID that the user belongs in
+        :param batch_size: int - the number of items to read at once
+        :return: generator of transaction history items
+        """
+        skip = 0
+        while True:
+            ret = self.query(
+                {"uid": user_id, "guild_id": guild_id},
+                projection={"_id": False, "uid": True, "transaction_history": {"$slice": [skip, batch_size]}}
+            )
+            batch = ret[0].get("transaction_history", []) if ret else []
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            skip += batch_size
+
     def append_to_activity_history(self, user_id: int, guild_id: int, activity: dict) -> None:
         """
         Add an item to a user's activity history
@@ -293,42 +487,6 @@ class UserPoints(BestSummerEverPointsDB):
         """
         self.update({"uid": user_id, "guild_id": guild_id}, {"$push": {"activity_history": activity}})
 
-    @staticmethod
-    def get_king_info(king_user: dict) -> dict:
-        """
-        Function for calculating king stats from a given user dictionary
-        :param king_user:
-        :return:
-        """
-        act_history = king_user.get("activity_history", [])
-        kingstuff = [a for a in act_history if a["type"] in [1, 2]]
-        gain = None
-        total_time = 0
-        times_king = 0
-        all_times = []
-        current_run = 0
-        for k in kingstuff:
-            if k["type"] == 1:
-                gain = k["timestamp"]
-                times_king += 1
-                if kingstuff.index(k) != (len(kingstuff) - 1):
-                    continue
-                else:
-                    now = datetime.datetime.now()
-                    t = (now - gain).total_seconds()
-                    all_times.append(t)
-                    total_time += t
-                    current_run = t
-                    continue
-
-            if gain is not None:
-                t = (k["timestamp"] - gain).total_seconds()
-                all_times.append(t)
-                total_time += t
-                gain = None
-
-        return {"times": times_king, "all_times": all_times, "total": total_time, "current": current_run}
-
 
 class UserBets(BestSummerEverPointsDB):
     """
@@ -602,6 +760,32 @@ class UserInteractions(BestSummerEverPointsDB):
         super().__init__()
         self._vault = interface.get_collection(self.database, "userinteractions")
 
+    def create_indexes(self) -> None:
+        """
+        Creates the index for looking up messages by their message ID
+        :return: None
+        """
+        self.create_index([[("message_id", ASCENDING), ("guild_id", ASCENDING)], ])
+
+    def get_message_author(self, guild_id: int, message_id: int) -> Optional[Message]:
+        """Looks up who sent a message, and where
+
+        Args:
+            guild_id (int): the server ID the message was sent in
+            message_id (int): the message ID
+
+        Returns:
+            Optional[Message]: message dict with just the user_id and channel_id, or None if we don't have it
+        """
+        ret = self.query(
+            {"message_id": message_id, "guild_id": guild_id, "message_type": "message"},
+            limit=1,
+            projection={"_id": False, "user_id": True, "channel_id": True}
+        )
+        if ret:
+            return ret[0]
+        return None
+
     def _paginated_query(self, query_dict: dict) -> list[Message]:
         """Performs a paginated query with the specified query dict
 
@@ -635,6 +819,18 @@ class UserInteractions(BestSummerEverPointsDB):
         messages = self._paginated_query({"guild_id": guild_id})
         return messages
 
+    def get_all_wordle_messages_for_server(self, guild_id: int) -> list[Message]:
+        """Gets all the wordle result messages for a given server
+
+        Args:
+            guild_id (int): the server Id to get messages for
+
+        Returns:
+            list[Message]: list of messages
+        """
+        messages = self._paginated_query({"guild_id": guild_id, "message_type": "wordle"})
+        return messages
+
     def get_all_messages_for_channel(self, guild_id: int, channel_id: int) -> list[Message]:
         """Gets all messages for a given channel and guild
 
@@ -853,6 +1049,17 @@ class UserInteractions(BestSummerEverPointsDB):
         else:
             return None
 
+    def get_active_voice_states(self, guild_id: int) -> list[VCInteraction]:
+        """Gets all the voice sessions for the guild that haven't ended
+
+        Args:
+            guild_id (int): the guild ID
+
+        Returns:
+            list[VCInteraction]: the active voice state documents
+        """
+        return self.query({"guild_id": guild_id, "message_type": "vc_joined", "active": True})
+
 
 class ServerEmojis(BestSummerEverPointsDB):
     """
@@ -877,6 +1084,18 @@ class ServerEmojis(BestSummerEverPointsDB):
         ret = self.query({"guild_id": guild_id})
         return ret
 
+    def get_emoji_ids(self, guild_id: int) -> set[int]:
+        """Gets the IDs of all the emojis we have in the database for the guild
+
+        Args:
+            guild_id (int): the guild ID of the server we want emojis for
+
+        Returns:
+            set[int]: the emoji IDs
+        """
+        ret = self.query({"guild_id": guild_id}, limit=10000, projection={"eid": True, "_id": False})
+        return {emoji["eid"] for emoji in ret}
+
     def get_emoji(self, guild_id: int, emoji_id: int) -> Union[Emoji, None]:
         """
         Gets an already created emoji document from the database.
@@ -933,6 +1152,18 @@ class ServerStickers(BestSummerEverPointsDB):
         super().__init__()
         self._vault = interface.get_collection(self.database, "serverstickers")
 
+    def get_sticker_ids(self, guild_id: int) -> set[int]:
+        """Gets the IDs of all the stickers we have in the database for the guild
+
+        Args:
+            guild_id (int): the guild ID of the server we want stickers for
+
+        Returns:
+            set[int]: the sticker IDs
+        """
+        ret = self.query({"guild_id": guild_id}, limit=10000, projection={"stid": True, "_id": False})
+        return {sticker["stid"] for sticker in ret}
+
     def get_sticker(self, guild_id: int, sticker_id: int) -> Union[Sticker, None]:
         """
         Gets an already created sticker document from the database.
@@ -976,3 +1207,178 @@ class ServerStickers(BestSummerEverPointsDB):
         }
 
         return self.insert(doc)
+
+
+class KingTenures(BestSummerEverPointsDB):
+    """
+    Class for interacting with the 'kingtenures' MongoDB collection in the 'bestsummereverpoints' DB
+
+    Each document is one continuous period of someone being KING. The current KING's tenure has an `end` of None.
+    """
+    def __init__(self):
+        """
+        Constructor method for the class. Initialises the collection object
+        """
+        super().__init__()
+        self._vault = interface.get_collection(self.database, "kingtenures")
+
+    def create_indexes(self) -> None:
+        """
+        Creates the indexes for the interval queries
+        :return: None
+        """
+        self.create_index(
+            [
+                [("guild_id", ASCENDING), ("start", ASCENDING), ("end", ASCENDING)],
+                [("guild_id", ASCENDING), ("uid", ASCENDING), ("start", ASCENDING)],
+            ]
+        )
+
+    def start_tenure(self, user_id: int, guild_id: int, start: datetime.datetime) -> list:
+        """
+        Records the start of a new KING's tenure
+
+        :param user_id: the new KING's user ID
+        :param guild_id: the guild ID
+        :param start: when the user became KING
+        :return: list of inserted IDs
+        """
+        doc = {
+            "guild_id": guild_id,
+            "uid": user_id,
+            "start": start,
+            "end": None
+        }
+        return self.insert(doc)
+
+    def end_tenure(self, user_id: int, guild_id: int, end: datetime.datetime) -> UpdateResult:
+        """
+        Records the end of a KING's tenure
+
+        :param user_id: the previous KING's user ID
+        :param guild_id: the guild ID
+        :param end: when the user stopped being KING
+        :return: UpdateResult
+        """
+        return self.update({"guild_id": guild_id, "uid": user_id, "end": None}, {"$set": {"end": end}})
+
+    def get_tenures_in_range(
+            self,
+            guild_id: int,
+            start: datetime.datetime,
+            end: datetime.datetime
+    ) -> list[KingTenure]:
+        """
+        Gets all the tenures that overlap with the given time period
+
+        :param guild_id: the guild ID
+        :param start: beginning of the time period
+        :param end: end of the time period
+        :return: list of tenures, sorted by start
+        """
+        ret = self.query(
+            {
+                "guild_id": guild_id,
+                "start": {"$lt": end},
+                "$or": [{"end": {"$gt": start}}, {"end": None}]
+            },
+            limit=10000
+        )
+        return sorted(ret, key=lambda t: t["start"])
+
+    def get_user_tenures(self, user_id: int, guild_id: int) -> list[KingTenure]:
+        """
+        Gets all the tenures for the given user
+
+        :param user_id: the user ID
+        :param guild_id: the guild ID
+        :return: list of tenures, sorted by start
+        """
+        ret = self.query({"guild_id": guild_id, "uid": user_id}, limit=10000)
+        return sorted(ret, key=lambda t: t["start"])
+
+    def has_tenures(self, guild_id: int) -> bool:
+        """
+        Whether we have any tenures recorded for the guild
+
+        :param guild_id: the guild ID
+        :return: True or False
+        """
+        return bool(self.query({"guild_id": guild_id}, limit=1, projection={"_id": True}))
+
+    @staticmethod
+    def time_in_range(
+            tenures: list[KingTenure],
+            start: datetime.datetime,
+            end: datetime.datetime
+    ) -> dict[int, float]:
+        """
+        Calculates how many seconds each user was KING for within the given time period
+
+        :param tenures: tenures overlapping the time period
+        :param start: beginning of the time period
+        :param end: end of the time period
+        :return: dict of user ID to seconds spent as KING
+        """
+        now = datetime.datetime.now()
+        kings = {}
+        for tenure in tenures:
+            t_start = max(tenure["start"], start)
+            t_end = min(tenure["end"] or now, end)
+            if t_end <= t_start:
+                continue
+            kings[tenure["uid"]] = kings.get(tenure["uid"], 0) + (t_end - t_start).total_seconds()
+        return kings
+
+    def get_king_info(self, user_id: int, guild_id: int) -> dict:
+        """
+        Function for calculating king stats for the given user
+
+        :param user_id: the user ID
+        :param guild_id: the guild ID
+        :return: dict of the number of times they've been KING, the length of each time, the total and the current run
+        """
+        now = datetime.datetime.now()
+        all_times = []
+        current_run = 0
+        for tenure in self.get_user_tenures(user_id, guild_id):
+            t = ((tenure["end"] or now) - tenure["start"]).total_seconds()
+            all_times.append(t)
+            if tenure["end"] is None:
+                current_run = t
+
+        return {"times": len(all_times), "all_times": all_times, "total": sum(all_times), "current": current_run}
+
+    def backfill_from_activity_history(self, guild_id: int, users: list[User]) -> int:
+        """
+        Rebuilds the guild's tenures from the KING_GAIN and KING_LOSS entries in the users' activity history
+        Any existing tenures for the guild are replaced.
+
+        :param guild_id: the guild ID
+        :param users: list of user dicts with their activity history
+        :return: number of tenures created
+        """
+        tenures = []
+        for user in users:
+            king_events = sorted(
+                [
+                    a for a in user.get("activity_history", [])
+                    if a["type"] in [ActivityTypes.KING_GAIN, ActivityTypes.KING_LOSS]
+                ],
+                key=lambda a: a["timestamp"]
+            )
+            gain = None
+            for event in king_events:
+                if event["type"] == ActivityTypes.KING_GAIN:
+                    gain = event["timestamp"]
+                elif gain is not None:
+                    tenures.append({"guild_id": guild_id, "uid": user["uid"], "start": gain, "end": event["timestamp"]})
+                    gain = None
+
+            if gain is not None:
+                tenures.append({"guild_id": guild_id, "uid": user["uid"], "start": gain, "end": None})
+
+        self.delete({"guild_id": guild_id})
+        if tenures:
+            self.insert(tenures)
+        return len(tenures)
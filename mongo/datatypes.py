@@ -70,6 +70,21 @@ class User(TypedDict):
     """The minimum amount of eddies the user is going to get each day"""
 
 
+class KingTenure(TypedDict):
+    """A single continuous period of a user being KING
+    """
+    _id: ObjectId
+    """The internal DB ID"""
+    guild_id: int
+    """The discord server ID"""
+    uid: int
+    """The discord user ID of the KING"""
+    start: datetime.datetime
+    """When the user became KING"""
+    end: Union[datetime.datetime, None]
+    """When the user stopped being KING - None if they're still KING"""
+
+
 class Better(TypedDict):
     user_id: int
     emoji: str
@@ -116,6 +131,8 @@ class Bet(TypedDict):
     """Whether the bet was made in a private channel"""
     closed: datetime.datetime
     """date the bet was closed"""
+    persistent_view: bool
+    """Whether the bet message has the BetView buttons with fixed custom IDs"""
 
 
 class Reaction(TypedDict):
@@ -183,6 +200,8 @@ class VCInteraction(Message):
     active: bool
     events: list[dict]
     left: datetime.datetime
+    checkpoint: datetime.datetime
+    """When the session was last written to the DB while it was still active"""
 
 
 class Emoji(TypedDict):
@@ -281,3 +300,26 @@ class Thread(TypedDict):
     """Only for SPOILER threads - the day a new ep comes out"""
     active: bool
     """Only for SPOILER threads - if we should still be posting spoiler warnings"""
+
+
+class WordleResult(TypedDict):
+    """A Wordle result someone posted, parsed when the message was ingested
+    """
+    _id: ObjectId
+    """The internal DB ID"""
+    guild_id: int
+    """The discord server ID"""
+    user_id: int
+    """The discord user ID of the user who posted the result"""
+    message_id: int
+    """The discord message ID of the result message"""
+    channel_id: int
+    """The discord channel ID the result was posted in"""
+    wordle_num: int
+    """The number of the wordle"""
+    timestamp: datetime.datetime
+    """When the result was posted"""
+    guesses: Union[int, None]
+    """The number of guesses it took - None if they failed"""
+    solved: bool
+    """Whether they got the wordle"""
@@ -7,13 +7,15 @@ MongoDB methods.
 """
 
 import sys
-from typing import Union
+import time
+from typing import Callable, List, NamedTuple, Optional, Union
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
+from pymongo.command_cursor import CommandCursor
 from pymongo.cursor import Cursor
 from pymongo.database import Database
-from pymongo.results import UpdateResult
+from pymongo.results import BulkWriteResult, UpdateResult
 
 if sys.version_info[0] < 3:
     from urllib import quote_plus
@@ -21,6 +23,124 @@ else:
     from urllib.parse import quote_plus
 
 
+class Operation(NamedTuple):
+    """
+    A completed operation - passed to the observers registered with add_observer
+    """
+    collection: Collection
+    operation: str
+    duration: float
+    documents: Optional[int]
+    """The number of documents returned or affected - None if we don't know"""
+    parameters: Optional[Union[dict, list]] = None
+    """The query parameters - or the pipeline for aggregations"""
+    projection: Optional[dict] = None
+    sort: Optional[list] = None
+
+
+_OBSERVERS: List[Callable[[Operation], None]] = []
+
+
+def add_observer(observer: Callable[[Operation], None]) -> None:
+    """
+    Registers a function to be called after every operation. Observers are called synchronously in the thread that
+    made the call so should be quick.
+    :param observer: function that takes an Operation
+    :return: None
+    """
+    _OBSERVERS.append(observer)
+
+
+def remove_observer(observer: Callable[[Operation], None]) -> None:
+    """
+    Unregisters a function added with add_observer
+    :param observer: the function
+    :return: None
+    """
+    if observer in _OBSERVERS:
+        _OBSERVERS.remove(observer)
+
+
+def _observe(
+        collection: Collection,
+        operation: str,
+        start: float,
+        documents: Optional[int],
+        parameters: Optional[Union[dict, list]] = None,
+        projection: Optional[dict] = None,
+        sort: Optional[list] = None) -> None:
+    if not _OBSERVERS:
+        return
+    record = Operation(
+        collection, operation, time.perf_counter() - start, documents, parameters, projection, sort
+    )
+    for observer in _OBSERVERS:
+        observer(record)
+
+
+class _ObservedCursor:
+    """
+    Wraps a cursor that's being returned unread so the observers get the operation once it's been read.
+    The operation is observed when the cursor is exhausted or closed - a cursor that's abandoned part way
+    through isn't observed. The duration only includes the time spent in the cursor, not in the caller's loop.
+    """
+    def __init__(
+            self,
+            cursor: Union[Cursor, CommandCursor],
+            collection: Collection,
+            operation: str,
+            start: float,
+            parameters: Optional[Union[dict, list]] = None,
+            projection: Optional[dict] = None,
+            sort: Optional[list] = None):
+        self._cursor = cursor
+        self._collection = collection
+        self._operation = operation
+        self._parameters = parameters
+        self._projection = projection
+        self._sort = sort
+        self._duration = time.perf_counter() - start
+        self._documents = 0
+        self._observed = False
+
+    def __iter__(self) -> "_ObservedCursor":
+        return self
+
+    def __next__(self) -> dict:
+        start = time.perf_counter()
+        try:
+            document = next(self._cursor)
+        except StopIteration:
+            self._duration += time.perf_counter() - start
+            self._finish()
+            raise
+        self._duration += time.perf_counter() - start
+        self._documents += 1
+        return document
+
+    def __enter__(self) -> "_ObservedCursor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def close(self) -> None:
+        self._cursor.close()
+        self._finish()
+
+    def _finish(self) -> None:
+        if not self._observed:
+            self._observed = True
+            # _observe works the duration out from when the operation started
+            _observe(
+                self._collection, self._operation, time.perf_counter() - self._duration, self._documents,
+                self._parameters, self._projection, self._sort
+            )
+
+
 def get_client(
         ip: str = "127.0.0.1",
         user_name: Union[str, None] = None,
@@ -114,7 +234,9 @@ def insert(
     :returns: list of inserted IDs
     """
     documents = [documents, ] if isinstance(documents, dict) else documents
+    start = time.perf_counter()
     results = collection.insert_many(documents, ordered=in_order)
+    _observe(collection, "insert", start, len(results.inserted_ids))
     return results.inserted_ids
 
 
@@ -133,7 +255,10 @@ def delete(
     :returns: int of deleted entries
     """
     delete_func = collection.delete_many if many else collection.delete_one
-    return delete_func(params).deleted_count
+    start = time.perf_counter()
+    deleted = delete_func(params).deleted_count
+    _observe(collection, "delete", start, deleted, params)
+    return deleted
 
 
 def update(
@@ -162,8 +287,30 @@ def update(
     Returns result object.
     """
     update_func = collection.update_many if many else collection.update_one
+    start = time.perf_counter()
     # noinspection PyArgumentList
     results = update_func(filter=parameters, update=updated_vals, upsert=upsert)
+    _observe(collection, "update", start, results.modified_count, parameters)
+    return results
+
+
+def bulk_write(
+        collection: Collection,
+        operations: list,
+        in_order: bool = False) -> BulkWriteResult:
+    """
+    Sends a list of write operations (InsertOne, UpdateOne, etc) to the server in a single batch.
+    See the following specifications for more information.
+    https://pymongo.readthedocs.io/en/stable/api/pymongo/collection.html#pymongo.collection.Collection.bulk_write
+    Args:
+        collection : mongoDB collection object
+        operations : list of pymongo write operation objects
+        in_order : if True then the operations are applied in serial and stop at the first error
+    Returns result object.
+    """
+    start = time.perf_counter()
+    results = collection.bulk_write(operations, ordered=in_order)
+    _observe(collection, "bulk_write", start, len(operations))
     return results
 
 
@@ -173,7 +320,8 @@ def query(
         lim: int = 10000,
         projection: Union[dict, None] = None,
         as_gen: bool = True,
-        skip: int = None
+        skip: int = None,
+        sort: list = None
 ) -> Union[list, Cursor]:
     """
     Searches a collection for documents based on given parameters.
@@ -194,12 +342,46 @@ def query(
         lim : max number of results to return
         projection : dict of keys to return for each result
         as_gen : True returns generator (mongoDB cursor obj) and false returns list of results
+        skip : number of items to skip at the start of the result set
+        sort : list of (key, direction) pairs to sort the results by eg [("points", DESCENDING)]
     Returns a generator (cursor obj) if as_gen else returns a list of results
     """
     if skip is None:
         skip = 0
-    results = collection.find(parameters, limit=lim, projection=projection, skip=skip)
-    return results if as_gen else list(results)
+    start = time.perf_counter()
+    results = collection.find(parameters, limit=lim, projection=projection, skip=skip, sort=sort)
+    if as_gen:
+        if _OBSERVERS:
+            # the cursor hasn't been read yet - observe it once it has
+            return _ObservedCursor(results, collection, "query", start, parameters, projection, sort)
+        return results
+    results = list(results)
+    _observe(collection, "query", start, len(results), parameters, projection, sort)
+    return results
+
+
+def aggregate(
+        collection: Collection,
+        pipeline: list,
+        as_gen: bool = True) -> Union[list, CommandCursor]:
+    """
+    Runs an aggregation pipeline on the collection.
+    Docs: https://www.mongodb.com/docs/manual/core/aggregation-pipeline/
+    Args:
+        collection : collection object to aggregate
+        pipeline : list of pipeline stages
+        as_gen : True returns generator (mongoDB cursor obj) and false returns list of results
+    Returns a generator (cursor obj) if as_gen else returns a list of results
+    """
+    start = time.perf_counter()
+    results = collection.aggregate(pipeline)
+    if as_gen:
+        if _OBSERVERS:
+            return _ObservedCursor(results, collection, "aggregate", start, pipeline)
+        return results
+    results = list(results)
+    _observe(collection, "aggregate", start, len(results), pipeline)
+    return results
 
 
 def drop_collection(
@@ -233,7 +415,7 @@ def create_index(
     :param key_or_list_of_keys_to_index:
     :return:
     """
-    if not collection:
+    if collection is None:
         return False
     if not isinstance(key_or_list_of_keys_to_index, list):
         key_or_list_of_keys_to_index = [key_or_list_of_keys_to_index, ]
@@ -249,6 +431,6 @@ def get_indexes(collection: Collection):
     :param collection:
     :return:
     """
-    if not collection:
+    if collection is None:
         return False
     return collection.index_information()
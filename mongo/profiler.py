@@ -0,0 +1,299 @@
+"""
+Opt-in profiler for the operations that go through mongo.interface
+
+Every operation is grouped by its query "shape" - the parameters with the values taken out, so
+`{"uid": 123, "guild_id": 456}` and `{"uid": 789, "guild_id": 456}` are the same shape - and the function outside of
+the mongo package that made the call. Operations that take longer than the threshold are logged and kept in a ring
+buffer, and the first slow one for each shape in each report period is explained so we can see whether it used an
+index and how many documents it had to look at. The explains run on a background thread so they don't slow down
+the code being profiled.
+
+Usage:
+    profiler = QueryProfiler(logger, threshold=0.1)
+    profiler.start()
+    ...
+    profiler.log_report()
+"""
+
+import collections
+import dataclasses
+import datetime
+import json
+import os
+import queue
+import sys
+import threading
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import PyMongoError
+
+from mongo import interface
+
+
+# the operations we can explain - the rest don't have a filter to explain
+_EXPLAINABLE = ("query", "update", "delete")
+
+# max number of operations waiting to be explained - any more than that aren't explained
+_EXPLAIN_QUEUE_SIZE = 100
+
+_MONGO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def query_shape(value: Any) -> Any:
+    """
+    Takes the values out of query parameters, leaving the keys and operators
+    :param value: query parameters or aggregation pipeline
+    :return: the shape
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for val in value:
+            # lists of values (eg for $in) are the same shape however long they are
+            if (shape := query_shape(val)) not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def find_caller() -> str:
+    """
+    Finds the function outside of the mongo package that made the current DB call
+    :return: "path/to/file.py:function:line"
+    """
+    frame = sys._getframe(1)
+    while frame is not None and os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == _MONGO_DIR:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    path = os.path.relpath(frame.f_code.co_filename, os.path.dirname(_MONGO_DIR))
+    return f"{path}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def _winning_stages(plan: dict) -> List[str]:
+    stages = []
+    while plan:
+        stage = plan.get("stage", "?")
+        if index := plan.get("indexName"):
+            stage += f"({index})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return stages[::-1]
+
+
+def summarise_explain(explain: dict) -> dict:
+    """
+    Picks the useful bits out of an explain() result
+    :param explain: the result of explain()
+    :return: dict of the winning plan's stages and the execution stats
+    """
+    winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    # the slot based engine nests the plan one level down
+    winning_plan = winning_plan.get("queryPlan", winning_plan)
+    stats = explain.get("executionStats", {})
+    return {
+        "plan": " > ".join(_winning_stages(winning_plan)),
+        "nReturned": stats.get("nReturned"),
+        "keysExamined": stats.get("totalKeysExamined"),
+        "docsExamined": stats.get("totalDocsExamined"),
+        "millis": stats.get("executionTimeMillis"),
+    }
+
+
+@dataclasses.dataclass
+class ProfiledOperation:
+    """
+    A slow operation
+    """
+    timestamp: datetime.datetime
+    collection: str
+    operation: str
+    shape: str
+    caller: str
+    duration: float
+    n_returned: Optional[int]
+    """The number of documents returned or affected - None if we don't know"""
+    explain: Optional[dict] = None
+    """Summary of explain() - only for the sampled operations, and filled in once the explain has run"""
+
+
+@dataclasses.dataclass
+class ShapeStats:
+    """
+    Totals for all the operations with the same collection, operation, shape and caller
+    """
+    count: int = 0
+    slow: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    documents: int = 0
+    explain: Optional[dict] = None
+    """The latest explain() summary for this shape"""
+
+
+class QueryProfiler:
+    """
+    Records the shape, caller and duration of the DB operations, and keeps the slow ones
+    """
+    def __init__(self, logger, threshold: float = 0.1, buffer_size: int = 500, explain: bool = True):
+        """
+        :param logger: logger
+        :param threshold: how long an operation can take before it's slow, in seconds
+        :param buffer_size: the number of slow operations to keep
+        :param explain: whether to explain the first slow operation for each shape in each report period
+        """
+        self.logger = logger
+        self.threshold = threshold
+        self.explain = explain
+
+        self.slow_operations: Deque[ProfiledOperation] = collections.deque(maxlen=buffer_size)
+        self.stats: Dict[Tuple[str, str, str, str], ShapeStats] = {}
+        self._explained: Set[Tuple[str, str, str]] = set()
+        self._lock = threading.Lock()
+        self._started = False
+
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=_EXPLAIN_QUEUE_SIZE)
+        self._explainer: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts profiling the operations that go through mongo.interface
+        :return: None
+        """
+        if not self._started:
+            if self.explain:
+                self._explainer = threading.Thread(target=self._run_explains, name="mongo-profiler", daemon=True)
+                self._explainer.start()
+            interface.add_observer(self.observe)
+            self._started = True
+
+    def stop(self) -> None:
+        interface.remove_observer(self.observe)
+        if self._explainer is not None:
+            # let the explainer finish what it's doing and exit
+            try:
+                self._explain_queue.put_nowait(None)
+            except queue.Full:
+                # it's busy - drop what's waiting so it stops after the current explain
+                self._drain_explains()
+                self._explain_queue.put_nowait(None)
+            self._explainer = None
+        self._started = False
+
+    def _drain_explains(self) -> None:
+        while True:
+            try:
+                self._explain_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _explain(operation: interface.Operation) -> Optional[dict]:
+        if operation.operation not in _EXPLAINABLE or not isinstance(operation.parameters, dict):
+            return None
+        cursor = operation.collection.find(operation.parameters, projection=operation.projection)
+        if operation.sort:
+            cursor = cursor.sort(operation.sort)
+        return summarise_explain(cursor.explain())
+
+    def _run_explains(self) -> None:
+        while (item := self._explain_queue.get()) is not None:
+            operation, stats, record = item
+            try:
+                summary = self._explain(operation)
+            except PyMongoError as e:
+                self.logger.warning(f"Couldn't explain {operation.operation} on {record.collection}: {e!r}")
+                continue
+            if summary is None:
+                continue
+
+            with self._lock:
+                stats.explain = summary
+                record.explain = summary
+                if record.n_returned is None:
+                    record.n_returned = summary["nReturned"]
+            self.logger.warning(
+                f"Plan for slow mongo {record.operation} on {record.collection} from {record.caller}: {summary}"
+            )
+
+    def observe(self, operation: interface.Operation) -> None:
+        """
+        Records an operation - registered as an observer with mongo.interface
+        :param operation: the operation
+        :return: None
+        """
+        shape = json.dumps(query_shape(operation.parameters), sort_keys=True)
+        if operation.sort:
+            # the sort can change which index gets used
+            shape += " sort " + json.dumps([list(item) for item in operation.sort])
+        caller = find_caller()
+        key = (operation.collection.name, operation.operation, shape, caller)
+        slow = operation.duration >= self.threshold
+
+        with self._lock:
+            stats = self.stats.setdefault(key, ShapeStats())
+            stats.count += 1
+            stats.total += operation.duration
+            stats.max = max(stats.max, operation.duration)
+            stats.documents += operation.documents or 0
+            if not slow:
+                return
+            stats.slow += 1
+            explain = self.explain and key[:3] not in self._explained
+            if explain:
+                self._explained.add(key[:3])
+
+        record = ProfiledOperation(
+            datetime.datetime.now(), key[0], operation.operation, shape, caller, operation.duration, operation.documents
+        )
+        self.slow_operations.append(record)
+        self.logger.warning(
+            f"Slow mongo {operation.operation} on {key[0]} from {caller}: {operation.duration * 1000:.1f}ms, "
+            f"{operation.documents} documents, shape {shape}"
+        )
+
+        if explain and self._explainer is not None:
+            # explaining runs the query again - do it on the explainer thread rather than holding up the caller
+            try:
+                self._explain_queue.put_nowait((operation, stats, record))
+            except queue.Full:
+                with self._lock:
+                    self._explained.discard(key[:3])
+
+    def report(self, top: int = 10) -> List[str]:
+        """
+        Gets the shapes that took the most total time
+        :param top: the number of shapes to include
+        :return: a line for each shape
+        """
+        with self._lock:
+            ranked = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)[:top]
+
+        lines = []
+        for (collection, operation, shape, caller), stats in ranked:
+            line = (
+                f"{stats.total * 1000:.0f}ms total, {stats.count} calls ({stats.slow} slow), "
+                f"max {stats.max * 1000:.1f}ms, {stats.documents} documents - {operation} on {collection} "
+                f"from {caller}: {shape}"
+            )
+            if explain := stats.explain:
+                line += (
+                    f" - {explain['plan']}, {explain['keysExamined']} keys and {explain['docsExamined']} docs examined"
+                )
+            lines.append(line)
+        return lines
+
+    def log_report(self, top: int = 10) -> None:
+        """
+        Logs the top shapes since the last report and starts a new report period
+        :param top: the number of shapes to include
+        :return: None
+        """
+        lines = self.report(top)
+        with self._lock:
+            self.stats.clear()
+            self._explained.clear()
+        if not lines:
+            return
+        self.logger.info("Mongo profile - top operations by total time:\n" + "\n".join(lines))
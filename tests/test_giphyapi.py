@@ -0,0 +1,99 @@
+"""
+Tests GiphyAPI against a stub of the random GIF endpoint served by aiohttp's TestServer.
+"""
+
+import asyncio
+import logging
+from typing import List, Tuple
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from apis.giphyapi import GiphyAPI
+
+
+class StubGiphy:
+    """Serves `gifs/random` with a new URL each time and records the requests"""
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.requests: List[Tuple[str, str]] = []
+        self.app = web.Application()
+        self.app.router.add_get("/v1/gifs/random", self.random)
+
+    async def random(self, request: web.Request) -> web.Response:
+        self.requests.append((request.query.get("api_key"), request.query.get("tag")))
+        if self.fail:
+            return web.json_response({"message": "rate limited"}, status=429)
+        url = f"https://giphy.test/{request.query.get('tag')}/{len(self.requests)}.gif"
+        return web.json_response({"data": {"images": {"original_still": {"url": url}}}})
+
+
+def _run(test, fail: bool = False, **kwargs) -> None:
+    async def main():
+        stub = StubGiphy(fail)
+        async with TestServer(stub.app) as server:
+            giphy = GiphyAPI("token", api_path=str(server.make_url("/v1/")), logger=logging.getLogger(), **kwargs)
+            try:
+                await test(giphy, stub)
+            finally:
+                await giphy.close()
+    asyncio.run(main())
+
+
+async def _drain_refills(giphy: GiphyAPI) -> None:
+    while giphy._refills:
+        await asyncio.gather(*giphy._refills.values())
+
+
+def test_random_gif_requests_the_tag():
+    async def test(giphy: GiphyAPI, stub: StubGiphy):
+        assert await giphy.random_gif("thanks") == "https://giphy.test/thanks/1.gif"
+        assert stub.requests[0] == ("token", "thanks")
+
+    _run(test, prefetch_size=0)
+
+
+def test_prefetched_gifs_come_from_the_buffer():
+    async def test(giphy: GiphyAPI, stub: StubGiphy):
+        giphy.prefetch(["thanks", None])
+        await _drain_refills(giphy)
+        assert len(stub.requests) == 4
+        assert stub.requests.count(("token", None)) == 2
+
+        session = giphy.session
+        first = await giphy.random_gif("thanks")
+        assert first.startswith("https://giphy.test/thanks/")
+        # served from the buffer - the refill for the one we took is the only new request
+        await _drain_refills(giphy)
+        assert len(stub.requests) == 5
+        assert len(giphy._buffers["thanks"]) == 2
+        assert giphy.session is session
+
+    _run(test, prefetch_size=2)
+
+
+def test_failed_prefetch_falls_back_to_a_request():
+    async def test(giphy: GiphyAPI, stub: StubGiphy):
+        giphy.prefetch(["rude"])
+        await _drain_refills(giphy)
+        assert not giphy._buffers["rude"]
+
+        stub.fail = False
+        assert await giphy.random_gif("rude") == "https://giphy.test/rude/2.gif"
+
+    _run(test, fail=True)
+
+
+def test_close_stops_refills_and_closes_the_session():
+    async def test(giphy: GiphyAPI, stub: StubGiphy):
+        giphy.prefetch(["thanks"])
+        refill = giphy._refills["thanks"]
+        session = giphy.session
+
+        await giphy.close()
+        await asyncio.sleep(0)
+        assert refill.cancelled() or refill.done()
+        assert not giphy._refills
+        assert session.closed
+
+    _run(test)
@@ -0,0 +1,66 @@
+"""
+Checks that the ParallelStatsJob gives exactly the same stats as the serial StatsJob.
+
+Both read a small synthetic guild through the real StatsDataCache, loaded into an in-memory mongomock database.
+Needs pytest and mongomock, which aren't bot requirements:
+    pip install pytest mongomock
+    python -m pytest tests
+"""
+
+import logging
+from typing import Dict
+
+import pytest
+from pymongo.database import Database
+
+from benchmarks.backend import get_database, rebind
+from benchmarks.parallelstats import find_differences
+from benchmarks.synthetic import SyntheticScale, get_guild
+from discordbot.stats.awardsbuilder import AwardsBuilder
+from discordbot.stats.parallelstats import ParallelStatsJob, partition_steps
+from discordbot.stats.statsclasses import StatsGatherer
+from discordbot.stats.statsdatacache import StatsDataCache
+from discordbot.stats.statsjob import StatsJob
+
+pytest.importorskip("mongomock")
+
+SCALE = SyntheticScale(users=8, messages_per_day=60, vc_sessions_per_day=4, bets_per_day=1, days=21, seed=3)
+
+# the loaded database for each scale in this process - every worker process loads its own
+_DATABASES: Dict[SyntheticScale, Database] = {}
+
+
+def _get_database(scale: SyntheticScale) -> Database:
+    if scale not in _DATABASES:
+        database = get_database("memory")
+        get_guild(scale).load_into(database)
+        _DATABASES[scale] = database
+    return _DATABASES[scale]
+
+
+class MongomockCacheFactory:
+    """Picklable factory for StatsDataCache objects that read the synthetic guild out of mongomock"""
+    def __init__(self, scale: SyntheticScale):
+        self.scale = scale
+
+    def __call__(self, annual: bool) -> StatsDataCache:
+        return rebind(StatsDataCache(annual), _get_database(self.scale))
+
+
+def test_parallel_stats_match_serial():
+    logger = logging.getLogger("bsebot.tests")
+    factory = MongomockCacheFactory(SCALE)
+    guild = get_guild(SCALE)
+
+    args = (guild.guild_id, guild.start, guild.end)
+    steps = AwardsBuilder._stats_steps(args, guild.channel_ids) + AwardsBuilder._awards_steps(args)
+    assert len(partition_steps(steps)) > 1
+
+    gatherer = StatsGatherer(logger, True)
+    gatherer.cache = factory(True)
+
+    serial = StatsJob("serial", gatherer, steps, logger).compute()
+    parallel = ParallelStatsJob("parallel", gatherer, steps, logger, max_workers=2, cache_factory=factory).compute()
+
+    assert len(serial) == len(steps)
+    assert find_differences(serial, parallel) == []